@@ -1,14 +1,10 @@
 from argparse import ArgumentParser
-from pathlib import Path
-from pyargwriter import api
-from config2class.utils.parser import setup_config2code_parser
 from config2class._core.entrypoint import Config2Code
 from config2class.utils.parser import setup_parser
 
 
 def execute(args: dict) -> bool:
     module = Config2Code()
-    _, command_parser = setup_config2code_parser(ArgumentParser())
     match args["command"]:
         case "file2code":
             module.file2code(
@@ -18,6 +14,11 @@ def execute(args: dict) -> bool:
                 resolve=args["resolve"],
                 ignore=args["ignore"],
                 verbose=args["verbose"],
+                slots=args["slots"],
+                array_threshold=args["array_threshold"],
+                profile=args["profile"],
+                profile_output=args["profile_output"],
+                validators=args["validators"],
             )
 
         case "dir2code":
@@ -30,7 +31,13 @@ def execute(args: dict) -> bool:
                 verbose=args["verbose"],
                 prefix=args["prefix"],
                 suffix=args["suffix"],
-                flatten=args["flatten"],
+                incremental=args["incremental"],
+                jobs=args["jobs"],
+                slots=args["slots"],
+                array_threshold=args["array_threshold"],
+                profile=args["profile"],
+                profile_output=args["profile_output"],
+                validators=args["validators"],
             )
 
         case "hydra2code":
@@ -40,6 +47,13 @@ def execute(args: dict) -> bool:
                 init_none=args["init_none"],
                 resolve=args["resolve"],
                 verbose=args["verbose"],
+                slots=args["slots"],
+                array_threshold=args["array_threshold"],
+                profile=args["profile"],
+                profile_output=args["profile_output"],
+                validators=args["validators"],
+                overrides=args["overrides"],
+                cache_dir=args["cache_dir"],
             )
 
         case "start-service":
@@ -48,10 +62,16 @@ def execute(args: dict) -> bool:
                 output=args["output"],
                 verbose=args["verbose"],
                 init_none=args["init_none"],
+                daemon=args["daemon"],
+                debounce=args["debounce"],
             )
 
         case "stop-service":
-            module.stop_service(pid=args["pid"])
+            module.stop_service(
+                pid=args["pid"],
+                input=args["input"],
+                output=args["output"],
+            )
 
         case "stop-all":
             module.stop_all()
@@ -62,6 +82,19 @@ def execute(args: dict) -> bool:
         case "clear-logs":
             module.clear_logs()
 
+        case "bench":
+            module.bench(
+                output=args["output"],
+                baseline=args["baseline"],
+                threshold=args["threshold"],
+                save_baseline=args["save_baseline"],
+                repeat=args["repeat"],
+                depth=args["depth"],
+                width=args["width"],
+                list_size=args["list_size"],
+                token_density=args["token_density"],
+            )
+
         case _:
             return False
 
@@ -0,0 +1,91 @@
+import random
+from typing import Any, Dict, List
+
+
+def generate_config(
+    depth: int = 3,
+    width: int = 8,
+    list_size: int = 4,
+    token_density: float = 0.0,
+    token_syntax: str = "omegaconf",
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """generate a synthetic config for benchmarks.
+
+    Every section holds `width` leaves and, above the last level, `width // 2` nested
+    sections named after their position, e.g. `s0_2`. Leaves cycle through int, float, str, bool and list values.
+
+    Args:
+        depth (int, optional): number of nested section levels. Defaults to 3.
+        width (int, optional): number of leaves per section. Defaults to 8.
+        list_size (int, optional): number of elements of list leaves. Defaults to 4.
+        token_density (float, optional): fraction of string leaves which are replaced by
+            a reference to a leaf generated before them. References never form cycles.
+            Defaults to 0.0.
+        token_syntax (str, optional): "omegaconf" for `${a.b}` interpolations or "c2c"
+            for `{{a.b}}` placeholders of `replace_tokens`. Defaults to "omegaconf".
+        seed (int, optional): seed of the random token placement. Defaults to 0.
+
+    Returns:
+        Dict[str, Any]: config with the single root key "config"
+    """
+    if token_syntax not in ("omegaconf", "c2c"):
+        raise ValueError(f"unknown token syntax: {token_syntax}")
+    rng = random.Random(seed)
+    # flat keys of all plain leaves generated so far
+    leaves: List[str] = []
+
+    def reference(path: str) -> str:
+        if token_syntax == "omegaconf":
+            return "${" + path + "}"
+        return "{{" + path + "}}"
+
+    def section(prefix: str, ident: str, level: int) -> Dict[str, Any]:
+        content = {}
+        for i in range(width):
+            key = f"k{i}"
+            path = f"{prefix}.{key}"
+            match i % 5:
+                case 0:
+                    value = i * level
+                case 1:
+                    value = i / (level + 1)
+                case 2:
+                    value = f"value_{level}_{i}"
+                    if len(leaves) > 0 and rng.random() < token_density:
+                        content[key] = reference(rng.choice(leaves))
+                        continue
+                case 3:
+                    value = i % 2 == 0
+                case _:
+                    value = list(range(list_size))
+            content[key] = value
+            leaves.append(path)
+        if level < depth:
+            for i in range(max(width // 2, 1)):
+                # leaves of all sections share their keys, so sections of one level and
+                # shape share one class like repeated blocks of real configs
+                key = f"s{ident}{i}"
+                content[key] = section(f"{prefix}.{key}", f"{ident}{i}_", level + 1)
+        return content
+
+    return {"config": section("config", "", 1)}
+
+
+def count_leaves(config: Dict[str, Any]) -> int:
+    """
+    Args:
+        config (Dict[str, Any]): nested config
+
+    Returns:
+        int: number of non dict values
+    """
+    stack = [config]
+    count = 0
+    while stack:
+        for value in stack.pop().values():
+            if isinstance(value, dict):
+                stack.append(value)
+            else:
+                count += 1
+    return count
@@ -0,0 +1,170 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from pathlib import Path
+from typing import Any, Dict, List
+
+# arguments per subcommand. {tmp} is replaced with a scratch directory holding a tiny
+# config file for every command.
+SUBCOMMANDS = {
+    "help": ["--help"],
+    "file2code": ["file2code", "--input", "{tmp}/config.json", "--output", "{tmp}/a.py"],
+    "dir2code": ["dir2code", "--input", "{tmp}/configs", "--output", "{tmp}/out"],
+    "hydra2code": [
+        "hydra2code",
+        "--input",
+        "{tmp}/hydra.yaml",
+        "--output",
+        "{tmp}/b.py",
+    ],
+}
+
+
+def _prepare_scratch_dir(tmp: Path):
+    config = {"config": {"name": "bench", "size": 1}}
+    with open(tmp.joinpath("config.json"), "w", encoding="utf-8") as file:
+        json.dump(config, file)
+    tmp.joinpath("configs").mkdir()
+    tmp.joinpath("out").mkdir()
+    with open(tmp.joinpath("configs", "config.json"), "w", encoding="utf-8") as file:
+        json.dump(config, file)
+    with open(tmp.joinpath("hydra.yaml"), "w", encoding="utf-8") as file:
+        file.write("config:\n  name: bench\n  size: 1\n")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """parse the output of `python -X importtime`
+
+    Args:
+        stderr (str): stderr of the interpreter
+
+    Returns:
+        List[Dict[str, Any]]: one entry per imported module with the nesting level, the
+            self and the cumulative import time in ms
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        modules.append(
+            {
+                "name": name.strip(),
+                "level": (len(name) - len(name.lstrip()) - 1) // 2,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    return modules
+
+
+def measure_startup(command: str, repeat: int = 3, top: int = 5) -> Dict[str, Any]:
+    """run a c2c subcommand in a fresh interpreter with `-X importtime`
+
+    Args:
+        command (str): key of SUBCOMMANDS
+        repeat (int, optional): number of runs. The fastest run is reported. Defaults to 3.
+        top (int, optional): number of most expensive top level imports to report.
+            Defaults to 5.
+
+    Returns:
+        Dict[str, Any]: wall time, total import time, number of imported modules and the
+            most expensive top level imports of the fastest run
+    """
+    env = dict(os.environ)
+    package_root = str(Path(__file__).parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, env.get("PYTHONPATH")])
+    )
+
+    best = None
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as tmp:
+            _prepare_scratch_dir(Path(tmp))
+            args = [arg.format(tmp=tmp) for arg in SUBCOMMANDS[command]]
+            start = time.perf_counter()
+            process = subprocess.run(
+                [sys.executable, "-X", "importtime", "-m", "config2class", *args],
+                capture_output=True,
+                text=True,
+                env=env,
+                cwd=tmp,
+                check=False,
+            )
+            wall_ms = (time.perf_counter() - start) * 1000
+        if process.returncode != 0:
+            errors = [
+                line for line in process.stderr.splitlines() if "import time:" not in line
+            ]
+            raise RuntimeError(f"c2c {command} failed:\n" + "\n".join(errors))
+        if best is None or wall_ms < best[0]:
+            best = (wall_ms, process.stderr)
+
+    wall_ms, stderr = best
+    modules = parse_importtime(stderr)
+    top_level = [module for module in modules if module["level"] == 0]
+    top_level.sort(key=lambda module: module["cumulative_ms"], reverse=True)
+    return {
+        "command": command,
+        "wall_ms": round(wall_ms, 2),
+        "import_ms": round(sum(module["cumulative_ms"] for module in top_level), 2),
+        "num_modules": len(modules),
+        "top_imports": [
+            [module["name"], module["cumulative_ms"]] for module in top_level[:top]
+        ],
+    }
+
+
+def run_startup_benchmark(
+    commands: List[str] = None, repeat: int = 3
+) -> List[Dict[str, Any]]:
+    """measure the startup cost of all given subcommands
+
+    Args:
+        commands (List[str], optional): keys of SUBCOMMANDS. Defaults to all.
+        repeat (int, optional): number of runs per command. Defaults to 3.
+
+    Returns:
+        List[Dict[str, Any]]: one result per command
+    """
+    commands = list(SUBCOMMANDS.keys()) if commands is None else commands
+    return [measure_startup(command, repeat) for command in commands]
+
+
+def format_results(results: List[Dict[str, Any]]) -> str:
+    lines = [f"{'command':<12} {'wall [ms]':>10} {'imports [ms]':>13} {'modules':>8}"]
+    for result in results:
+        lines.append(
+            f"{result['command']:<12} {result['wall_ms']:>10.1f} "
+            f"{result['import_ms']:>13.1f} {result['num_modules']:>8}"
+        )
+        for name, cumulative_ms in result["top_imports"]:
+            lines.append(f"{'':<12}   {cumulative_ms:>8.1f} ms  {name}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = ArgumentParser(description="Measure the startup time of c2c subcommands.")
+    parser.add_argument(
+        "commands", nargs="*", help=f"subset of {', '.join(SUBCOMMANDS.keys())}"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", dest="json_file", type=str, default=None)
+    args = parser.parse_args()
+    unknown = set(args.commands).difference(SUBCOMMANDS.keys())
+    if len(unknown) > 0:
+        parser.error(f"unknown commands: {', '.join(sorted(unknown))}")
+
+    results = run_startup_benchmark(args.commands or None, args.repeat)
+    print(format_results(results))
+    if args.json_file is not None:
+        with open(args.json_file, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
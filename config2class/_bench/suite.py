@@ -0,0 +1,276 @@
+import copy
+import importlib.util
+import json
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from config2class._bench.generator import count_leaves, generate_config
+
+DEFAULT_PARAMS = {
+    "depth": 3,
+    "width": 8,
+    "list_size": 4,
+    "token_density": 0.1,
+}
+
+
+def load_module(path: Path, name: str):
+    """import a generated python file as module `name`"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    # dataclasses look up the module of a class while it is created
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _build_cases(
+    tmp: Path, params: Dict[str, Any]
+) -> List[Tuple[str, Callable[[], Any]]]:
+    """prepare the inputs of all benchmark cases in `tmp`
+
+    Args:
+        tmp (Path): scratch directory
+        params (Dict[str, Any]): keyword arguments of `generate_config`
+
+    Returns:
+        List[Tuple[str, Callable[[], Any]]]: name and function of every case
+    """
+    from config2class._core.constructor import ConfigConstructor
+    import config2class.utils.filesystem as fs_utils
+    from config2class.utils.deconstruction import deconstruct_config
+    from config2class.utils.dict_operations import flatten_dict
+    from config2class.utils.replacement import replace_tokens
+
+    config = generate_config(**params, token_syntax="omegaconf")
+    c2c_config = generate_config(**params, token_syntax="c2c")
+    plain_config = generate_config(**{**params, "token_density": 0.0})
+
+    # every 7th leaf is removed by the ignore case
+    ignore = list(flatten_dict(plain_config).keys())[::7]
+
+    for ending in ("yaml", "json", "toml"):
+        getattr(fs_utils, f"write_{ending}")(tmp.joinpath(f"config.{ending}"), config)
+
+    constructor = ConfigConstructor()
+    constructor.construct(config)
+    constructor.write(tmp.joinpath("bench_config.py"))
+    module = load_module(tmp.joinpath("bench_config.py"), "_c2c_bench_config")
+    config_cls = module.Config
+    config_obj = config_cls.from_file(tmp.joinpath("config.yaml"))
+
+    def construct():
+        ConfigConstructor().construct(config)
+
+    def filter_ignore():
+        ConfigConstructor(ignore)._filter_ignore(plain_config)
+
+    def tokens():
+        replace_tokens(copy.deepcopy(c2c_config))
+
+    def loader(ending: str) -> Callable[[], Any]:
+        load_func = getattr(fs_utils, f"load_{ending}")
+        path = tmp.joinpath(f"config.{ending}")
+        return lambda: load_func(path)
+
+    return [
+        ("constructor.construct", construct),
+        (
+            "constructor.write",
+            lambda: constructor.write(tmp.joinpath("out.py")),
+        ),
+        ("replace_tokens", tokens),
+        ("constructor._filter_ignore", filter_ignore),
+        ("fs_utils.load_yaml", loader("yaml")),
+        ("fs_utils.load_json", loader("json")),
+        ("fs_utils.load_toml", loader("toml")),
+        (
+            "StructuredConfig.from_file",
+            lambda: config_cls.from_file(tmp.joinpath("config.yaml")),
+        ),
+        (
+            "StructuredConfig.to_file",
+            lambda: config_obj.to_file(tmp.joinpath("out.yaml")),
+        ),
+        ("deconstruct_config", lambda: deconstruct_config(config_obj)),
+    ]
+
+
+def _time_case(func: Callable[[], Any], repeat: int, number: int) -> Dict[str, float]:
+    # one warm-up call fills caches of imports and compiled regexes
+    func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) * 1000 / number)
+    return {
+        "min_ms": round(min(timings), 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "repeat": repeat,
+        "number": number,
+    }
+
+
+def run_suite(
+    params: Dict[str, Any] = None,
+    repeat: int = 5,
+    number: int = 1,
+    cases: List[str] = None,
+) -> Dict[str, Any]:
+    """run the benchmark suite on a synthetic config
+
+    Args:
+        params (Dict[str, Any], optional): keyword arguments of `generate_config`.
+            Defaults to DEFAULT_PARAMS.
+        repeat (int, optional): number of timed runs per case. Defaults to 5.
+        number (int, optional): calls per timed run. Defaults to 1.
+        cases (List[str], optional): names of the cases to run. Defaults to all.
+
+    Returns:
+        Dict[str, Any]: environment, file format backends, config parameters and the per
+            call timings of every case in ms
+    """
+    import config2class.utils.filesystem as fs_utils
+
+    params = {**DEFAULT_PARAMS, **(params or {})}
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, func in _build_cases(Path(tmp), params):
+            if cases is not None and name not in cases:
+                continue
+            results[name] = _time_case(func, repeat, number)
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": params,
+        "num_leaves": count_leaves(generate_config(**params)),
+        "backends": fs_utils.backend_info(),
+        "results": results,
+    }
+
+
+def compare_results(
+    results: Dict[str, Any], baseline: Dict[str, Any], threshold: float = 0.2
+) -> List[Dict[str, Any]]:
+    """compare the fastest runs of all cases with a baseline
+
+    Args:
+        results (Dict[str, Any]): output of `run_suite`
+        baseline (Dict[str, Any]): stored output of `run_suite`
+        threshold (float, optional): allowed relative slowdown. Defaults to 0.2.
+
+    Returns:
+        List[Dict[str, Any]]: one entry per case in both runs with the relative change
+            and a "regression" flag
+    """
+    comparison = []
+    for name, result in results["results"].items():
+        reference = baseline["results"].get(name)
+        if reference is None or reference["min_ms"] <= 0:
+            continue
+        change = result["min_ms"] / reference["min_ms"] - 1
+        comparison.append(
+            {
+                "case": name,
+                "baseline_ms": reference["min_ms"],
+                "current_ms": result["min_ms"],
+                "change": round(change, 4),
+                "regression": change > threshold,
+            }
+        )
+    return comparison
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    lines = [f"{'case':<30} {'min [ms]':>10} {'median [ms]':>12}"]
+    for name, result in results["results"].items():
+        lines.append(
+            f"{name:<30} {result['min_ms']:>10.3f} {result['median_ms']:>12.3f}"
+        )
+    return "\n".join(lines)
+
+
+def format_comparison(comparison: List[Dict[str, Any]]) -> str:
+    lines = [f"{'case':<30} {'baseline [ms]':>14} {'current [ms]':>13} {'change':>8}"]
+    for entry in comparison:
+        flag = "  REGRESSION" if entry["regression"] else ""
+        lines.append(
+            f"{entry['case']:<30} {entry['baseline_ms']:>14.3f} "
+            f"{entry['current_ms']:>13.3f} {entry['change']:>+8.1%}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def run_bench(
+    output: str = None,
+    baseline: str = None,
+    threshold: float = 0.2,
+    save_baseline: bool = False,
+    repeat: int = 5,
+    params: Dict[str, Any] = None,
+) -> bool:
+    """run the suite, print the results and compare them with a baseline
+
+    Args:
+        output (str, optional): json file for the results. Defaults to None.
+        baseline (str, optional): json file of a previous run. Defaults to None.
+        threshold (float, optional): allowed relative slowdown. Defaults to 0.2.
+        save_baseline (bool, optional): write the results to `baseline` instead of
+            comparing against it. Requires `baseline`. Defaults to False.
+        repeat (int, optional): number of timed runs per case. Defaults to 5.
+        params (Dict[str, Any], optional): keyword arguments of `generate_config`.
+            Defaults to DEFAULT_PARAMS.
+
+    Raises:
+        ValueError: if `save_baseline` is set without a `baseline` file
+
+    Returns:
+        bool: False if a case is slower than the baseline by more than `threshold`
+    """
+    if save_baseline and baseline is None:
+        # fail before the suite runs instead of silently dropping the results
+        raise ValueError("save_baseline needs a baseline file to write the results to")
+    results = run_suite(params, repeat)
+    print(f"synthetic config: {results['params']} ({results['num_leaves']} leaves)")
+    backends = ", ".join(
+        f"{fmt}: {info['load']}/{info['write']}" for fmt, info in results["backends"].items()
+    )
+    print(f"backends (load/write): {backends}")
+    print(format_results(results))
+    if output is not None:
+        with open(output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if baseline is None:
+        return True
+    if save_baseline:
+        with open(baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Saved baseline to {baseline}")
+        return True
+    if not Path(baseline).exists():
+        print(f"No baseline at {baseline}. Create one with --save-baseline.")
+        return True
+
+    with open(baseline, "r", encoding="utf-8") as file:
+        reference = json.load(file)
+    if reference["params"] != results["params"]:
+        print(
+            f"Warning: baseline was measured with {reference['params']}, "
+            "timings are not comparable."
+        )
+    comparison = compare_results(results, reference, threshold)
+    print()
+    print(format_comparison(comparison))
+    regressions = [entry["case"] for entry in comparison if entry["regression"]]
+    if len(regressions) > 0:
+        print(f"\n{len(regressions)} case(s) regressed by more than {threshold:.0%}")
+        return False
+    return True
@@ -1,5 +1,5 @@
 from types import NoneType
-from typing import Any, Dict, List, Union
+from typing import Any, Dict, List, Set, Union
 
 
 class ConfigAbstraction:
@@ -33,37 +33,70 @@ class ConfigAbstraction:
         name = prefix + name[index].upper() + name[index + 1 :]
         self.name = name
         self.fields = fields if fields is not None else {}
+        # keys which may be missing in the source dict, e.g. in some list elements
+        self.optional: Set[str] = set()
+        # emit a batched `_from_list` constructor for lists of this class
+        self.list_element = False
 
     def add_field(
-        self, key, value: Union[str, bool, float, list, tuple, int, "ConfigAbstraction"]
+        self,
+        key,
+        value: Union[
+            str,
+            bool,
+            float,
+            list,
+            tuple,
+            int,
+            "ConfigAbstraction",
+            "ListAbstraction",
+            "ArrayAbstraction",
+        ],
     ):
         """
         Adds a new field to the configuration structure.
 
         Args:
             key (str): The name of the field.
-            value (Union[str, bool, float, list, tuple, int, ConfigAbstraction]): The value
+            value (Union[str, bool, float, list, tuple, int, ConfigAbstraction, ListAbstraction, ArrayAbstraction]): The value
                 of the field. This can be a primitive type (str, bool, float, int), a
-                list, a tuple, or another ConfigAbstraction instance.
+                list, a tuple, another ConfigAbstraction instance, a ListAbstraction
+                for a list of nested configs or an ArrayAbstraction for a numeric list
+                stored as `array.array`.
         """
         self.fields[key] = value
 
-    def write_code(self, init_none: bool = False) -> List[str]:
+    def write_code(
+        self, init_none: bool = False, slots: bool = False, validators: bool = False
+    ) -> List[str]:
         """
         Generates Python code for a dataclass representing the configuration structure.
 
         Args:
             init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
+            slots (bool, optional): Emit `@dataclass(slots=True)` so instances store their fields in slots instead of a per-instance `__dict__`. Defaults to False
+            validators (bool, optional): Emit a `_validate` method which checks the types of all fields. Defaults to False
 
         Returns:
             List[str]: A list of strings representing the generated Python code.
         """
-        code = ["@dataclass\n", f"class {self.name}(StructuredConfig):\n"]
+        # keep the bounded `StructuredConfig.__repr__` instead of the generated one
+        if slots:
+            decorator = "@dataclass(repr=False, slots=True)\n"
+        else:
+            decorator = "@dataclass(repr=False)\n"
+        code = [decorator, f"class {self.name}(StructuredConfig):\n"]
         post_init = {}
         for key, item in self.fields.items():
             if isinstance(item, ConfigAbstraction):
                 typ = item.name
                 post_init[key] = item
+            elif isinstance(item, ListAbstraction):
+                typ = f"list[{item.element.name}]"
+                post_init[key] = item
+            elif isinstance(item, ArrayAbstraction):
+                typ = "array"
+                post_init[key] = item
             elif isinstance(item, NoneType):
                 typ = NoneType.__name__
             else:
@@ -76,16 +109,230 @@ class ConfigAbstraction:
             line += "\n"
             code.append(line)
 
+        code.extend(self._write_from_dict(init_none))
+        if self.list_element:
+            code.extend(self._write_from_list(init_none))
+        if validators:
+            code.extend(self._write_validate(init_none))
+
         # add post init func
         if len(post_init) == 0:
             return code
 
         code.append("\n    def __post_init__(self):\n")
         for key, value in post_init.items():
-            code.append(
-                f"        self.{key} = {value.name}(**self.{key})  #pylint: disable=E1134\n"
-            )
+            if isinstance(value, ListAbstraction):
+                code.append(
+                    f"        if isinstance(self.{key}, list) and self.{key} "
+                    f"and isinstance(self.{key}[0], dict):\n"
+                )
+                code.append(
+                    f"            self.{key} = {value.element.name}._from_list(self.{key})\n"
+                )
+                continue
+            if isinstance(value, ArrayAbstraction):
+                code.append(f"        if isinstance(self.{key}, list):\n")
+                code.append(
+                    f'            self.{key} = array("{value.typecode}", self.{key})\n'
+                )
+                continue
+            code.append(f"        if isinstance(self.{key}, dict):\n")
+            code.append(f"            self.{key} = {value.name}._from_dict(self.{key})\n")
+        return code
+
+    def _write_from_dict(self, init_none: bool = False) -> List[str]:
+        """
+        Generates a `_from_dict` classmethod which builds an instance including all nested
+        configs from a plain dict in straight-line code. The instance is created without
+        calling `__init__` and `__post_init__`, so nested configs are built exactly once
+        and no keyword arguments have to be packed and unpacked. Keys which are no field
+        raise a TypeError like the keyword arguments of `__init__` would.
+
+        Args:
+            init_none (bool, optional): Missing keys are set to None instead of raising a KeyError. Defaults to False
+
+        Returns:
+            List[str]: A list of strings representing the generated Python code.
+        """
+        code = [
+            "\n    @classmethod\n",
+            f'    def _from_dict(cls, data: dict) -> "{self.name}":\n',
+            "        if not data.keys() <= cls.__dataclass_fields__.keys():\n",
+            "            cls._reject_unknown_keys(data)\n",
+            "        instance = object.__new__(cls)\n",
+        ]
+        code.extend(self._write_assignments(init_none, "        "))
+        code.append("        return instance\n")
+        return code
+
+    def _write_from_list(self, init_none: bool = False) -> List[str]:
+        """
+        Generates a `_from_list` classmethod which builds the instances of a whole list of
+        dicts in one loop with the assignments of `_from_dict` inlined, so there is no
+        method call per element.
+
+        Args:
+            init_none (bool, optional): Missing keys are set to None instead of raising a KeyError. Defaults to False
+
+        Returns:
+            List[str]: A list of strings representing the generated Python code.
+        """
+        code = [
+            "\n    @classmethod\n",
+            f'    def _from_list(cls, items: list) -> "list[{self.name}]":\n',
+            "        new = object.__new__\n",
+            "        fields = cls.__dataclass_fields__.keys()\n",
+            "        result = []\n",
+            "        for data in items:\n",
+            "            if not data.keys() <= fields:\n",
+            "                cls._reject_unknown_keys(data)\n",
+            "            instance = new(cls)\n",
+        ]
+        code.extend(self._write_assignments(init_none, "            "))
+        code.append("            result.append(instance)\n")
+        code.append("        return result\n")
+        return code
+
+    def _write_assignments(self, init_none: bool, indent: str) -> List[str]:
+        """
+        Args:
+            init_none (bool): Missing keys are set to None instead of raising a KeyError
+            indent (str): indentation of the generated lines
+
+        Returns:
+            List[str]: assignments of all fields from `data` to `instance`
+        """
+        code = []
+        for key, item in self.fields.items():
+            optional = init_none or key in self.optional
+            value = f'data.get("{key}")' if optional else f'data["{key}"]'
+            # template of the conversion of the raw value
+            if isinstance(item, ConfigAbstraction):
+                convert = item.name + "._from_dict({})"
+            elif isinstance(item, ListAbstraction):
+                convert = item.element.name + "._from_list({})"
+            elif isinstance(item, ArrayAbstraction):
+                convert = f'array("{item.typecode}", {{}})'
+            else:
+                convert = None
+
+            if convert is not None and optional:
+                code.append(f"{indent}value = {value}\n")
+                value = "None if value is None else " + convert.format("value")
+            elif convert is not None:
+                value = convert.format(value)
+            code.append(f"{indent}instance.{key} = {value}\n")
+        return code
+
+    def _write_validate(self, init_none: bool = False) -> List[str]:
+        """
+        Generates a `_validate` method which checks every field in straight-line code.
+        The common case of a correct value costs one type check. Numbers are coerced
+        where no information is lost and nested configs are validated recursively.
+
+        Args:
+            init_none (bool, optional): Fields may be None. Defaults to False
+
+        Returns:
+            List[str]: A list of strings representing the generated Python code.
+        """
+        code = [
+            "\n    def _validate(self, path: str = \"\") -> None:\n",
+        ]
+        for key, item in self.fields.items():
+            if isinstance(item, NoneType) or type(item) is object:
+                # the type is unknown if the sampled value was None or the values disagree
+                continue
+            attr = f"self.{key}"
+            where = f'path + "{key}"'
+            if isinstance(item, ConfigAbstraction):
+                check = [
+                    f"if not isinstance({attr}, {item.name}):\n",
+                    f'    raise_type_error({where}, "{item.name}", {attr})\n',
+                    f'{attr}._validate(path + "{key}.")\n',
+                ]
+            elif isinstance(item, ListAbstraction):
+                element = item.element.name
+                check = [
+                    f"if not isinstance({attr}, list):\n",
+                    f'    raise_type_error({where}, "list", {attr})\n',
+                    f"for index, element in enumerate({attr}):\n",
+                    f"    if not isinstance(element, {element}):\n",
+                    f'        raise_type_error(f"{{path}}{key}.{{index}}", "{element}", element)\n',
+                    f'    element._validate(f"{{path}}{key}.{{index}}.")\n',
+                ]
+            elif isinstance(item, ArrayAbstraction):
+                check = [
+                    f"if not isinstance({attr}, array):\n",
+                    f'    raise_type_error({where}, "array", {attr})\n',
+                ]
+            elif isinstance(item, (int, float)) and not isinstance(item, bool):
+                typ = type(item).__name__
+                check = [
+                    f"if type({attr}) is not {typ}:\n",
+                    f"    {attr} = coerce_{typ}({attr}, {where})\n",
+                ]
+            else:
+                typ = type(item).__name__
+                check = [
+                    f"if not isinstance({attr}, {typ}):\n",
+                    f'    raise_type_error({where}, "{typ}", {attr})\n',
+                ]
+
+            if init_none or key in self.optional:
+                code.append(f"        if {attr} is not None:\n")
+                code.extend("            " + line for line in check)
+            else:
+                code.extend("        " + line for line in check)
+        if len(code) == 1:
+            code.append("        pass\n")
         return code
 
     def __repr__(self):
         return str(self.fields)
+
+
+class ListAbstraction:
+    """
+    Field of a `ConfigAbstraction` which holds a list of nested configs. All elements
+    share the class `element` which is inferred from the keys of the list items.
+
+    Attributes:
+        element (ConfigAbstraction): class of the list elements
+    """
+
+    def __init__(self, element: ConfigAbstraction):
+        """
+        Initializes a new ListAbstraction instance.
+
+        Args:
+            element (ConfigAbstraction): class of the list elements
+        """
+        self.element = element
+        element.list_element = True
+
+    def __repr__(self):
+        return f"list[{self.element.name}]"
+
+
+class ArrayAbstraction:
+    """
+    Field of a `ConfigAbstraction` which holds a homogeneous numeric list. The generated
+    code stores it as `array.array`, which keeps the numbers unboxed in one buffer and
+    can be wrapped without copy by `numpy.frombuffer` or `memoryview`.
+
+    Attributes:
+        typecode (str): `array` typecode, "q" for int and "d" for float lists
+    """
+
+    def __init__(self, typecode: str):
+        """
+        Initializes a new ArrayAbstraction instance.
+
+        Args:
+            typecode (str): `array` typecode, "q" for int and "d" for float lists
+        """
+        self.typecode = typecode
+
+    def __repr__(self):
+        return f"array({self.typecode!r})"
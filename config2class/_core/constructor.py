@@ -1,11 +1,17 @@
 import logging
+import os
+import sys
 from pathlib import Path
 from types import NoneType
-from typing import Any, Dict, List
-from config2class._core.code_abstraction import ConfigAbstraction
+from typing import Any, Dict, List, TextIO, Tuple
+from config2class._core.code_abstraction import (
+    ArrayAbstraction,
+    ConfigAbstraction,
+    ListAbstraction,
+)
+from config2class.utils.dict_operations import flatten_dict, unflatten
+from config2class.utils.profiling import NULL_PROFILER, Profiler
 from config2class.utils.replacement import replace_tokens
-from flatten_dict import flatten, unflatten
-import pyaml
 
 
 class ConfigConstructor:
@@ -17,22 +23,36 @@ class ConfigConstructor:
             each representing a part of the configuration structure.
     """
 
-    def __init__(self, ignore: List[str] = None):
+    def __init__(self, ignore: List[str] = None, array_threshold: int = None):
         """
         Initializes a new `ConfigConstructor` instance.
+
+        Args:
+            ignore (List[str], optional): flat keys to leave out. Defaults to None.
+            array_threshold (int, optional): homogeneous int or float lists with at
+                least this many elements become `array.array` fields. Defaults to None,
+                which keeps all lists.
         """
         self.configs: List[ConfigAbstraction] = []
         self.ignore = [] if ignore is None else ignore
+        self.array_threshold = array_threshold
+        # nested classes by structure, by class name and by id of their source dict
+        self._classes_by_shape: Dict[Tuple, ConfigAbstraction] = {}
+        self._classes_by_name: Dict[str, ConfigAbstraction] = {}
+        self._classes_by_id: Dict[int, ConfigAbstraction] = {}
 
-    def construct(self, config: Dict[str, Any]):
+    def construct(self, config: Dict[str, Any], profiler: Profiler = None):
         """
         Parses the given configuration dictionary and constructs `ConfigAbstraction` instances
         to represent the configuration structure.
 
         Args:
             config (Dict[str, Any]): The configuration dictionary.
+            profiler (Profiler, optional): records the "filter_ignore" and "construct" phases. Defaults to None.
         """
-        config = self._filter_ignore(config)
+        profiler = NULL_PROFILER if profiler is None else profiler
+        with profiler.phase("filter_ignore"):
+            config = self._filter_ignore(config)
 
         if len(config.keys()) == 0:
             return
@@ -43,57 +63,240 @@ class ConfigConstructor:
             name = "Config"
             content = config
 
-        self.configs = []
-        config_abstraction = self._construct_config_class(name, content)
-        self.configs.append(config_abstraction)
+        with profiler.phase("construct"):
+            self.configs = []
+            self._classes_by_shape = {}
+            self._classes_by_name = {}
+            self._classes_by_id = {}
+            config_abstraction = self._construct_config_class(name, content)
+            self.configs.append(config_abstraction)
 
-    def write(self, out_path: str, init_none: bool = False):
+    def write(
+        self,
+        out_path: str,
+        init_none: bool = False,
+        slots: bool = False,
+        validators: bool = False,
+    ):
         """
         Writes the generated Python code to a file.
 
         Args:
-            out_path (str): The path to the output file.
+            out_path (str): The path to the output file. "-" writes to stdout.
             init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
+            slots (bool, optional): Emit `@dataclass(slots=True)` classes without a per-instance `__dict__`. Defaults to False
+            validators (bool, optional): Emit `_validate` methods which check the field types when a config is loaded. Defaults to False
 
         """
-        code = ["from dataclasses import dataclass\n"]
-        code.append("from types import NoneType\n")
-        code.append("from config2class.api.base import StructuredConfig\n\n\n")
-
-        for abstraction in self.configs:
-            code.extend(abstraction.write_code(init_none))
-            code.append("\n\n")
-
-        code.pop(-1)
+        if str(out_path) == "-":
+            try:
+                self.write_to(sys.stdout, init_none, slots, validators)
+                sys.stdout.flush()
+            except BrokenPipeError:
+                # the consumer stopped reading, e.g. `head`. Send the rest of the output
+                # to devnull, so the flush at interpreter exit does not fail again.
+                devnull = os.open(os.devnull, os.O_WRONLY)
+                os.dup2(devnull, sys.stdout.fileno())
+                sys.exit(1)
+            return
         out_path: Path = Path(out_path)
-        if not out_path.exists():
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.touch(exist_ok=True)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
         with open(out_path, "w", encoding="utf-8") as file:
-            file.writelines([])  # clear file first
-            file.writelines(code)
+            self.write_to(file, init_none, slots, validators)
 
-    def _construct_config_class(self, name: str, content: Dict[str, Any]):
+    def write_to(
+        self,
+        stream: TextIO,
+        init_none: bool = False,
+        slots: bool = False,
+        validators: bool = False,
+    ):
+        """
+        Streams the generated Python code class by class into a text stream, so only the
+        code of one class is held in memory at a time.
+
+        Args:
+            stream (TextIO): writable text stream, e.g. an open file or `sys.stdout`
+            init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
+            slots (bool, optional): Emit `@dataclass(slots=True)` classes without a per-instance `__dict__`. Defaults to False
+            validators (bool, optional): Emit `_validate` methods which check the field types when a config is loaded. Defaults to False
+        """
+        stream.write("from dataclasses import dataclass\n")
+        if any(
+            isinstance(value, ArrayAbstraction)
+            for abstraction in self.configs
+            for value in abstraction.fields.values()
+        ):
+            stream.write("from array import array\n")
+        stream.write("from types import NoneType\n")
+        stream.write("from config2class.api.base import StructuredConfig\n")
+        if validators:
+            stream.write(
+                "from config2class.api.validation import "
+                "coerce_float, coerce_int, raise_type_error\n"
+            )
+        stream.write("\n\n")
+
+        for index, abstraction in enumerate(self.configs):
+            if index > 0:
+                stream.write("\n\n")
+            stream.writelines(abstraction.write_code(init_none, slots, validators))
+
+    def _construct_config_class(
+        self, name: str, content: Dict[str, Any], path: Tuple[str, ...] = ()
+    ):
         """
         Recursively constructs `ConfigAbstraction` instances for nested configurations.
 
         Args:
             name (str): The name of the configuration class.
             content (Dict[str, Any]): The configuration dictionary for this level.
+            path (Tuple[str, ...], optional): keys leading to this level. Defaults to ().
+
+        Returns:
+            ConfigAbstraction: The constructed `ConfigAbstraction` instance.
+        """
+        return self._construct_merged_class(name, [content], path)
+
+    def _construct_merged_class(
+        self,
+        name: str,
+        contents: List[Dict[str, Any]],
+        path: Tuple[str, ...],
+        partial: bool = False,
+    ) -> ConfigAbstraction:
+        """
+        Constructs one `ConfigAbstraction` for several dicts, e.g. the elements of a list.
+        The class has the union of all keys. Keys which are missing in some dicts are
+        optional. The type of a field is taken from its values which are not None. Ints
+        and floats are merged to float, other disagreeing types give an `object` field.
+
+        Args:
+            name (str): The name of the configuration class.
+            contents (List[Dict[str, Any]]): dicts described by the class
+            path (Tuple[str, ...]): keys leading to this level
+            partial (bool, optional): `contents` is only a sample, so every key is
+                optional. Defaults to False.
 
         Returns:
             ConfigAbstraction: The constructed `ConfigAbstraction` instance.
         """
         config_abstraction = ConfigAbstraction(name, {})
-        for key, value in content.items():
-            if isinstance(value, dict) and len(value) > 0:
-                sub_config = self._construct_config_class(name="_" + key, content=value)
-                self.configs.append(sub_config)
+        keys = dict.fromkeys(key for content in contents for key in content)
+        for key in keys:
+            values = [content[key] for content in contents if key in content]
+            if partial or len(values) < len(contents):
+                config_abstraction.optional.add(key)
+            given = [value for value in values if value is not None]
+            value = given[0] if len(given) > 0 else None
+            if isinstance(value, dict) and all(
+                isinstance(item, dict) and len(item) > 0 for item in given
+            ):
+                sub_config = self._get_sub_config(key, given, (*path, key), partial)
                 config_abstraction.add_field(key, sub_config)
-            elif isinstance(value, (str, bool, float, list, tuple, int, NoneType)):
-                config_abstraction.add_field(key, value)
+                continue
+            if isinstance(value, list) and all(isinstance(item, list) for item in given):
+                if len(given) == 1:
+                    elements = value
+                else:
+                    elements = [element for items in given for element in items]
+                # long lists are only inspected at evenly spaced positions
+                sample = _sample(elements)
+                if len(sample) > 0 and all(
+                    isinstance(element, dict) and len(element) > 0 for element in sample
+                ):
+                    partial_sample = len(sample) < len(elements)
+                    if partial_sample:
+                        sample = _add_unseen_keys(sample, elements)
+                    element = self._get_sub_config(
+                        key, sample, (*path, key), partial_sample
+                    )
+                    config_abstraction.add_field(key, ListAbstraction(element))
+                    continue
+            if (
+                isinstance(value, list)
+                and self.array_threshold is not None
+                and all(isinstance(item, list) for item in given)
+            ):
+                typecode = _merged_array_typecode(given, self.array_threshold)
+                if typecode is not None:
+                    config_abstraction.add_field(key, ArrayAbstraction(typecode))
+                    continue
+            config_abstraction.add_field(key, _merged_value(given))
         return config_abstraction
 
+    def _get_sub_config(
+        self,
+        key: str,
+        contents: List[Dict[str, Any]],
+        path: Tuple[str, ...],
+        partial: bool = False,
+    ) -> ConfigAbstraction:
+        """
+        Returns the class of a nested config. Nested configs with the same keys and
+        value types share one class, and so does a dict which appears several times,
+        e.g. through YAML anchors and aliases.
+
+        Args:
+            key (str): key of the nested config
+            contents (List[Dict[str, Any]]): all dicts described by the class, e.g. the
+                elements of a list
+            path (Tuple[str, ...]): keys leading to the nested config including `key`
+            partial (bool, optional): `contents` is only a sample. Defaults to False.
+
+        Returns:
+            ConfigAbstraction: new or shared class
+        """
+        single = len(contents) == 1
+        if single:
+            shared = self._classes_by_id.get(id(contents[0]))
+            if shared is not None:
+                return shared
+
+        sub_config = self._construct_merged_class("_" + key, contents, path, partial)
+        # nested classes are already shared, so their identity describes their shape
+        shape = tuple(
+            (field, _field_shape(value), field in sub_config.optional)
+            for field, value in sub_config.fields.items()
+        )
+        shared = self._classes_by_shape.get(shape)
+        if shared is None:
+            sub_config.name = self._unique_name(sub_config.name, path)
+            self._classes_by_shape[shape] = sub_config
+            self._classes_by_name[sub_config.name] = sub_config
+            self.configs.append(sub_config)
+            shared = sub_config
+        if single:
+            self._classes_by_id[id(contents[0])] = shared
+        return shared
+
+    def _unique_name(self, name: str, path: Tuple[str, ...]) -> str:
+        """
+        Disambiguates the class name of a nested config with a different shape than an
+        existing class of the same name. The name is prefixed with the keys of the
+        parent levels, e.g. `_Model` becomes `_EncoderModel`, and a counter is appended
+        if the path is used up.
+
+        Args:
+            name (str): class name derived from the key
+            path (Tuple[str, ...]): keys leading to the nested config
+
+        Returns:
+            str: name which is not taken yet
+        """
+        candidate = name
+        for depth in range(2, len(path) + 1):
+            if candidate not in self._classes_by_name:
+                return candidate
+            parents = "".join(key[:1].upper() + key[1:] for key in path[-depth:-1])
+            candidate = "_" + parents + name[1:]
+        base = candidate
+        counter = 2
+        while candidate in self._classes_by_name:
+            candidate = f"{base}{counter}"
+            counter += 1
+        return candidate
+
     def _filter_ignore(self, config: Dict[str, Any]) -> Dict[str, Any]:
         """remove all keys which are specified in self.ignore
 
@@ -103,7 +306,9 @@ class ConfigConstructor:
         Returns:
             Dict[str, Any]: filtered config
         """
-        flattened_config = flatten(config, "dot")
+        if len(self.ignore) == 0:
+            return config
+        flattened_config = flatten_dict(config)
         # check on ignore keys if they are apparent in flattened config
         unaffected_ignores = ""
         filtered_config = {}
@@ -114,10 +319,116 @@ class ConfigConstructor:
                 flattened_config.pop(key)
 
         if len(unaffected_ignores) > 0:
+            import pyaml
+
             yaml_str = pyaml.dump(flattened_config, indent=2)
             yaml_str = " \n\t".join(yaml_str.split("\n"))
 
             logging.info(
                 f"Given the flatted config:\n\t{yaml_str}\n the following keys had no affect:\n{unaffected_ignores}"
             )
-        return unflatten(flattened_config, "dot")
+        return unflatten(flattened_config)
+
+
+# number of list elements which are inspected to infer the element class of a list
+LIST_SAMPLE_SIZE = 64
+
+
+def _sample(items: List[Any]) -> List[Any]:
+    """evenly spaced elements of a long list including the first and the last one"""
+    if len(items) <= LIST_SAMPLE_SIZE:
+        return items
+    step = (len(items) - 1) / (LIST_SAMPLE_SIZE - 1)
+    return [items[round(index * step)] for index in range(LIST_SAMPLE_SIZE)]
+
+
+# sample value of fields which can hold any value, annotated as `object`
+ANY_VALUE = object()
+
+
+def _merged_value(given: List[Any]) -> Any:
+    """
+    Args:
+        given (List[Any]): values of one key which are not None
+
+    Returns:
+        Any: sample value whose type is the type of the field
+    """
+    if len(given) == 0:
+        return None
+    types = {type(value) for value in given}
+    if len(types) > 1 and types <= {int, float}:
+        return float(given[0])
+    if len(types) > 1 or not isinstance(
+        given[0], (str, bool, float, list, tuple, int, dict)
+    ):
+        return ANY_VALUE
+    return given[0]
+
+
+def _add_unseen_keys(sample: List[Any], elements: List[Any]) -> List[Any]:
+    """
+    Extends a sample of dicts by the first element with each key which is missing in the
+    sample, so the generated `_from_dict` does not reject rare keys. Comparing the keys
+    is much cheaper than inspecting all values.
+    """
+    sample = list(sample)
+    seen = set().union(*sample)
+    for element in elements:
+        if isinstance(element, dict) and not element.keys() <= seen:
+            sample.append(element)
+            seen.update(element)
+    return sample
+
+
+def _field_shape(value: Any) -> Any:
+    if isinstance(value, ConfigAbstraction):
+        return value
+    if isinstance(value, ListAbstraction):
+        return ("list", value.element)
+    if isinstance(value, ArrayAbstraction):
+        return ("array", value.typecode)
+    return type(value).__name__
+
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+def _array_typecode(values: List[Any], threshold: int) -> str | None:
+    """
+    Args:
+        values (List[Any]): list value of the config
+        threshold (int): minimum number of elements
+
+    Returns:
+        str | None: "q" for a list of 64 bit ints, "d" for a list of floats (and ints) or
+            None if the list is too short or not numeric
+    """
+    if len(values) < threshold or len(values) == 0:
+        return None
+    # bool is a subclass of int but has to stay a list of bools
+    types = {type(value) for value in values}
+    if types == {int}:
+        if _INT64_MIN <= min(values) and max(values) <= _INT64_MAX:
+            return "q"
+        return None
+    if types <= {int, float}:
+        return "d"
+    return None
+
+
+def _merged_array_typecode(lists: List[List[Any]], threshold: int) -> str | None:
+    """
+    Args:
+        lists (List[List[Any]]): values of one field, e.g. in all elements of a list
+        threshold (int): minimum number of elements
+
+    Returns:
+        str | None: "q" if all lists are int lists, "d" if all are numeric and one holds
+            a float or None if any list is too short or not numeric
+    """
+    typecodes = {_array_typecode(values, threshold) for values in lists}
+    if None in typecodes:
+        return None
+    return "q" if typecodes == {"q"} else "d"
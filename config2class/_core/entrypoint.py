@@ -1,18 +1,7 @@
-from pathlib import Path
-from typing import Any, Callable, Dict, List
-from omegaconf import OmegaConf
-from config2class._service.api_funcs import (
-    dir2code,
-    hydra2code,
-    file2code,
-    start_service,
-    stop_process,
-)
-from config2class._service.pid_coordination import read_pid_file
-import config2class.utils.filesystem as fs_utils
-from config2class._core.constructor import ConfigConstructor
 from glob import glob
 import os
+import sys
+from typing import List
 
 from config2class.utils.logging import set_log_level_debug
 
@@ -23,6 +12,9 @@ class Config2Code:
 
     This class facilitates automatic generation of dataclasses from configuration
     files. It currently supports YAML and JSON file formats.
+
+    Every command imports its backend on demand, so the CLI only pays for the
+    dependencies (hydra, omegaconf, watchdog, ...) of the command which actually runs.
     """
 
     def __init__(self):
@@ -39,6 +31,11 @@ class Config2Code:
         resolve: bool = False,
         ignore: List[str] = None,
         verbose: bool = False,
+        slots: bool = False,
+        array_threshold: int = None,
+        profile: bool = False,
+        profile_output: str = None,
+        validators: bool = False,
     ):
         """
         Converts a configuration file to a Python dataclass and writes the code to a file.
@@ -46,17 +43,36 @@ class Config2Code:
         Args:
             input (str): The path to the configuration file (YAML or JSON).
             output (str, optional): The path to the output file where the generated
-                dataclass code will be written. Defaults to "config.py".
+                dataclass code will be written. "-" writes the code to stdout. Defaults to "config.py".
             init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
             resolve: (bool, optional): Set this flag to resolve expressions in the loaded config. Defaults to False
             ignore: (List[str], optional): ignore element from config. To point to certain element in the config you would use point notation. Defaults to None.
             verbose: (bool, optional): Set log level to logging.DEBUG. Defaults to False
+            slots (bool, optional): Emit `@dataclass(slots=True)` classes. Instances have no per-instance `__dict__` which saves memory if many of them are alive. Defaults to False
+            array_threshold (int, optional): Store homogeneous int or float lists with at least this many elements as `array.array` instead of a list of boxed numbers. `to_container` and `to_file` turn them back into lists. Defaults to None
+            profile (bool, optional): Print wall time and peak allocated memory (tracemalloc) of every conversion phase. Defaults to False
+            profile_output (str, optional): Also write the profile as JSON to this file. Implies profile. Defaults to None
+            validators (bool, optional): Emit a `_validate` method per class which checks the field types in straight-line code, coerces numbers where no information is lost and recurses into nested configs. It runs whenever a config is loaded unless switched off with `config2class.api.validation.set_validation(False)`. Defaults to False
         Raises:
             NotImplementedError: If the input file format is not YAML or JSON or TOML.
         """
+        from config2class._service.api_funcs import file2code
+
         if verbose:
             set_log_level_debug()
-        file2code(input, output, init_none, resolve, ignore)
+        profiler = self._profiler(input, profile, profile_output)
+        file2code(
+            input,
+            output,
+            init_none,
+            resolve,
+            ignore,
+            slots,
+            array_threshold,
+            profiler,
+            validators,
+        )
+        self._report_profiles(profiler, profile_output, output == "-")
 
     def dir2code(
         self,
@@ -68,6 +84,13 @@ class Config2Code:
         verbose: bool = False,
         prefix: str = "",
         suffix: str = "_config",
+        incremental: bool = False,
+        jobs: int = 1,
+        slots: bool = False,
+        array_threshold: int = None,
+        profile: bool = False,
+        profile_output: str = None,
+        validators: bool = False,
     ):
         """Convert all config files in a directory into a structured config.
 
@@ -82,10 +105,20 @@ class Config2Code:
             verbose: (bool, optional): Set log level to logging.DEBUG. Defaults to False
             prefix (str, optional): prefix for output file name. Defaults to "".
             suffix (str, optional): prefix for output file name. Defaults to "_config".
+            incremental (bool, optional): Only regenerate outputs whose inputs or options changed since the last run and delete outputs of removed inputs. State is kept in a manifest inside the output directory. Defaults to False.
+            jobs (int, optional): Number of worker processes to convert files in parallel. A failing file is reported and does not abort the other conversions. The command exits with status 1 if any file failed. Defaults to 1.
+            slots (bool, optional): Emit `@dataclass(slots=True)` classes. Instances have no per-instance `__dict__` which saves memory if many of them are alive. Defaults to False
+            array_threshold (int, optional): Store homogeneous int or float lists with at least this many elements as `array.array` instead of a list of boxed numbers. `to_container` and `to_file` turn them back into lists. Defaults to None
+            profile (bool, optional): Print wall time and peak allocated memory (tracemalloc) of every conversion phase summed over all files and list the slowest inputs. Defaults to False
+            profile_output (str, optional): Also write the per file profiles as JSON to this file. Implies profile. Defaults to None
+            validators (bool, optional): Emit a `_validate` method per class which checks the field types in straight-line code, coerces numbers where no information is lost and recurses into nested configs. It runs whenever a config is loaded unless switched off with `config2class.api.validation.set_validation(False)`. Defaults to False
         """
+        from config2class._service.api_funcs import dir2code
+
         if verbose:
             set_log_level_debug()
-        dir2code(
+        profiles = [] if profile or profile_output is not None else None
+        failures = dir2code(
             input,
             output,
             recursive,
@@ -93,29 +126,89 @@ class Config2Code:
             resolve,
             prefix,
             suffix,
+            incremental,
+            jobs,
+            slots,
+            array_threshold,
+            profiles,
+            validators,
         )
+        self._report_profiles(profiles, profile_output)
+        if len(failures) > 0:
+            # the failed files were already reported by dir2code
+            sys.exit(1)
 
     def hydra2code(
         self,
-        input: str,
+        input: str | List[str],
         output: str = "config.py",
         init_none: bool = False,
         resolve: bool = False,
         verbose: bool = False,
+        slots: bool = False,
+        array_threshold: int = None,
+        profile: bool = False,
+        profile_output: str = None,
+        overrides: List[List[str]] = None,
+        cache_dir: str = None,
+        validators: bool = False,
     ):
         """converts a hydra config into a structured config
 
         Args:
-            input (str): The path to the configuration file (YAML or JSON).
+            input (str | List[str]): The path to the primary hydra config file or several of them. All configs of one directory are composed in a single hydra context.
             output (str, optional): The path to the output file where the generated
-                dataclass code will be written. Defaults to "config.py".
+                dataclass code will be written. "-" writes the code to stdout. If several configs are composed, a directory (not ending with ".py") which gets one `<config name>.py` (or `<config name>_<i>.py` per override set) each. Defaults to "config.py".
             init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
             resolve: (bool, optional): Set this flag to resolve expressions in the loaded config. Defaults to False
             verbose: (bool, optional): Set log level to logging.DEBUG. Defaults to False
+            slots (bool, optional): Emit `@dataclass(slots=True)` classes. Instances have no per-instance `__dict__` which saves memory if many of them are alive. Defaults to False
+            array_threshold (int, optional): Store homogeneous int or float lists with at least this many elements as `array.array` instead of a list of boxed numbers. `to_container` and `to_file` turn them back into lists. Defaults to None
+            profile (bool, optional): Print wall time and peak allocated memory (tracemalloc) of every conversion phase. Defaults to False
+            profile_output (str, optional): Also write the profile as JSON to this file. Implies profile. Defaults to None
+            overrides (List[List[str]], optional): Sets of hydra overrides like ["db.port=1"]. Every input is composed once per set. Defaults to None
+            cache_dir (str, optional): Cache composed configs in this directory. An entry is reused until a file of its defaults list is modified, so hydra is not even imported for unchanged configs. Defaults to None
+            validators (bool, optional): Emit a `_validate` method per class which checks the field types in straight-line code, coerces numbers where no information is lost and recurses into nested configs. It runs whenever a config is loaded unless switched off with `config2class.api.validation.set_validation(False)`. Defaults to False
         """
+        from config2class._service.api_funcs import hydra2code
+
         if verbose:
             set_log_level_debug()
-        hydra2code(input, output, init_none, resolve)
+        label = input if isinstance(input, str) else ", ".join(input)
+        profiler = self._profiler(label, profile, profile_output)
+        hydra2code(
+            input,
+            output,
+            init_none,
+            resolve,
+            slots,
+            array_threshold,
+            profiler,
+            overrides,
+            cache_dir,
+            validators,
+        )
+        self._report_profiles(profiler, profile_output, output == "-")
+
+    @staticmethod
+    def _profiler(input: str, profile: bool, profile_output: str):
+        if not profile and profile_output is None:
+            return None
+        from config2class.utils.profiling import Profiler
+
+        return Profiler(input)
+
+    @staticmethod
+    def _report_profiles(profiles, profile_output: str, to_stderr: bool = False):
+        if profiles is None:
+            return
+        from config2class.utils.profiling import Profiler, report_profiles
+
+        if isinstance(profiles, Profiler):
+            profiles = [profiles.to_dict()]
+        # keep stdout clean if the generated code is written there
+        stream = sys.stderr if to_stderr else sys.stdout
+        report_profiles(profiles, profile_output, stream)
 
     def start_service(
         self,
@@ -123,6 +216,8 @@ class Config2Code:
         output: str = "config.py",
         verbose: bool = False,
         init_none: bool = False,
+        daemon: bool = False,
+        debounce: float = 0.2,
     ):
         """start an observer to create the config automatically.
 
@@ -131,28 +226,85 @@ class Config2Code:
             output (str, optional): python file to write the dataclasses in. Defaults to "config.py".
             verbose (bool, optional): if you want to print logs to terminal
             init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
+            daemon (bool, optional): add the watch to a single background daemon which observes all files instead of starting one process per file. Defaults to False
+            debounce (float, optional): seconds without further file events before the output is regenerated. The output is only rewritten if keys or value types changed. Defaults to 0.2
         """
-        start_service(input, output, verbose, init_none)
+        from config2class._service.api_funcs import start_service
 
-    def stop_service(self, pid: int):
+        start_service(input, output, verbose, init_none, daemon, debounce)
+
+    def stop_service(self, pid: int = None, input: str = None, output: str = None):
         """stop a particular service
 
         Args:
-            pid (int): process id
+            pid (int, optional): process id of a service or of the watch daemon. Defaults to None.
+            input (str, optional): stop the daemon watches of this input file. Defaults to None.
+            output (str, optional): only stop the daemon watch of input which writes to this file. Defaults to None.
         """
-        stop_process(pid)
+        from config2class._service.api_funcs import stop_process, stop_watch
+
+        if pid is not None:
+            stop_process(pid)
+        if input is not None:
+            stop_watch(input, output)
 
     def stop_all(self):
         """stop all services"""
+        from config2class._service.api_funcs import stop_daemon
+        from config2class._service.pid_coordination import read_pid_file
+
         for pid in read_pid_file():
             self.stop_service(pid)
+        stop_daemon()
 
     def list_services(self):
         """print currently running processes"""
+        from config2class._service.api_funcs import list_daemon_watches
+        from config2class._service.pid_coordination import read_pid_file
+
         for pid, (input_file, output_file) in read_pid_file().items():
             print(f"{pid}: {input_file} -> {output_file}")
+        daemon_pid, watches = list_daemon_watches()
+        for input_file, output_file in watches:
+            print(f"{daemon_pid} (daemon): {input_file} -> {output_file}")
 
     def clear_logs(self):
         """delete all log files"""
         for file_name in glob("data/*.logs"):
             os.remove(file_name)
+
+    def bench(
+        self,
+        output: str = None,
+        baseline: str = None,
+        threshold: float = 0.2,
+        save_baseline: bool = False,
+        repeat: int = 5,
+        depth: int = 3,
+        width: int = 8,
+        list_size: int = 4,
+        token_density: float = 0.1,
+    ):
+        """run the benchmark suite on a synthetic config
+
+        Args:
+            output (str, optional): json file to write the results to. Defaults to None.
+            baseline (str, optional): json results of a previous run to compare against. Defaults to None.
+            threshold (float, optional): allowed relative slowdown against the baseline before a case counts as regression. Defaults to 0.2.
+            save_baseline (bool, optional): store the results as new baseline instead of comparing against it. Requires baseline. Defaults to False.
+            repeat (int, optional): number of timed runs per case. Defaults to 5.
+            depth (int, optional): number of nested section levels of the synthetic config. Defaults to 3.
+            width (int, optional): number of values per section of the synthetic config. Defaults to 8.
+            list_size (int, optional): number of elements of list values. Defaults to 4.
+            token_density (float, optional): fraction of string values which reference another value. Defaults to 0.1.
+        """
+        from config2class._bench.suite import run_bench
+
+        params = {
+            "depth": depth,
+            "width": width,
+            "list_size": list_size,
+            "token_density": token_density,
+        }
+        if not run_bench(output, baseline, threshold, save_baseline, repeat, params):
+            sys.exit(1)
@@ -1,24 +1,25 @@
 from glob import glob
+import logging
 import os
 import re
 import signal
 import subprocess
 import sys
 from pathlib import Path
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Tuple
 
 from config2class._core.constructor import ConfigConstructor
-from config2class._service.backend import start_observer
-from config2class._service.config import PID_FILE
+import config2class._service.manifest as manifest_utils
 from config2class._service.pid_coordination import (
     add_pid,
     check_for_process,
     remove_pid,
 )
-from omegaconf import OmegaConf
 import config2class.utils.filesystem as fs_utils
-from hydra import compose, initialize
-from hydra.errors import HydraException
+from config2class.utils.profiling import NULL_PROFILER, Profiler
+
+# omegaconf, hydra, watchdog and multiprocessing are imported inside the functions
+# which need them to keep the startup of the CLI fast.
 
 
 def file2code(
@@ -27,18 +28,28 @@ def file2code(
     init_none: bool = False,
     resolve: bool = False,
     ignore: List[str] = None,
+    slots: bool = False,
+    array_threshold: int = None,
+    profiler: Profiler = None,
+    validators: bool = False,
 ):
-    load_func = fs_utils.get_load_func(in_file_path)
-    content = load_func(in_file_path)
+    profiler = NULL_PROFILER if profiler is None else profiler
+    with profiler.phase("load"):
+        load_func = fs_utils.get_load_func(in_file_path)
+        content = load_func(in_file_path)
 
     if resolve:
-        # resolve expressions in config
-        content = OmegaConf.create(content)
-        content = OmegaConf.to_container(content, resolve=True)
+        with profiler.phase("resolve"):
+            from omegaconf import OmegaConf
+
+            # resolve expressions in config
+            content = OmegaConf.create(content)
+            content = OmegaConf.to_container(content, resolve=True)
 
-    constructor = ConfigConstructor(ignore=ignore)
-    constructor.construct(content)
-    constructor.write(out_file_path, init_none)
+    constructor = ConfigConstructor(ignore=ignore, array_threshold=array_threshold)
+    constructor.construct(content, profiler)
+    with profiler.phase("write"):
+        constructor.write(out_file_path, init_none, slots, validators)
 
 
 def dir2code(
@@ -49,18 +60,21 @@ def dir2code(
     resolve: bool = False,
     prefix: str = "",
     suffix: str = "",
-):
+    incremental: bool = False,
+    jobs: int = 1,
+    slots: bool = False,
+    array_threshold: int = None,
+    profiles: List[Dict[str, Any]] = None,
+    validators: bool = False,
+) -> Dict[str, str]:
     input_dir: Path = Path.cwd().joinpath(input_dir)
     output_dir: Path = Path.cwd().joinpath(output_dir)
     assert input_dir.is_dir(), "given input path has to be a directory"
     assert output_dir.is_dir(), "given input path has to be a directory"
 
-    # get available load types
-    load_funcs = fs_utils.get_available_load_funcs()
-    file_type_map = {k.split("_")[-1]: v for k, v in load_funcs.items()}
-
-    # list files
-    pattern = bytes(".*(" + "|".join(file_type_map.keys()) + ")$", encoding="utf-8")
+    # list files of all registered types
+    suffixes = fs_utils.supported_suffixes()
+    pattern = bytes(".*(" + "|".join(suffixes) + ")$", encoding="utf-8")
     pattern = re.compile(pattern)
     if recursive:
         files = [
@@ -75,54 +89,294 @@ def dir2code(
             if pattern.match(bytes(str(f), encoding="utf-8"))
         ]
 
-    # construct config files
-    for file in files:
+    # map input files to output file names
+    tasks = {}
+    for file in sorted(files):
         input_file = str(input_dir.joinpath(file))
-        output_file = prefix + file.stem + suffix + ".py"
-        output_file = str(output_dir.joinpath(output_file))
-        print(input_file, " --> ", output_file)
-        file2code(input_file, output_file, init_none, resolve)
+        output_name = prefix + file.stem + suffix + ".py"
+        tasks[str(file.relative_to(input_dir))] = (input_file, output_name)
+
+    file2code_kwargs = {
+        "init_none": init_none,
+        "resolve": resolve,
+        "slots": slots,
+        "array_threshold": array_threshold,
+        "validators": validators,
+    }
+    if not incremental:
+        return _run_file2code_tasks(
+            tasks, output_dir, jobs, profiles=profiles, **file2code_kwargs
+        )
+
+    options = {**file2code_kwargs, "prefix": prefix, "suffix": suffix}
+    old_manifest = manifest_utils.load_manifest(output_dir)
+    rebuild, stale, manifest = manifest_utils.plan_incremental(
+        old_manifest, tasks, output_dir, options
+    )
+    for output_file in stale:
+        if output_file.exists():
+            print("remove stale", output_file)
+            output_file.unlink()
+
+    logging.info(f"{len(tasks) - len(rebuild)} of {len(tasks)} files are up to date")
+    rebuild_tasks = {key: tasks[key] for key in rebuild}
+
+    def on_success(key: str):
+        manifest_utils.record(manifest, key, rebuild[key], tasks[key][1])
+
+    try:
+        return _run_file2code_tasks(
+            rebuild_tasks, output_dir, jobs, on_success, profiles, **file2code_kwargs
+        )
+    finally:
+        # keep progress of successfully generated files
+        manifest_utils.write_manifest(output_dir, manifest)
+
+
+def _file2code_task(
+    input_file: str,
+    output_file: str,
+    file2code_kwargs: Dict[str, Any],
+    profile: bool = False,
+) -> Tuple[str | None, Dict[str, Any] | None]:
+    """
+    Runs `file2code` and captures a failure as a message, so one broken file does not
+    abort a batch. Defined on module level to be usable in worker processes.
+
+    Returns:
+        Tuple[str | None, Dict[str, Any] | None]: error message or None on success and
+            the profile of the conversion if `profile` is set
+    """
+    profiler = Profiler(input_file) if profile else None
+    try:
+        file2code(input_file, output_file, **file2code_kwargs, profiler=profiler)
+    except Exception as error:  # pylint: disable=W0718
+        return f"{type(error).__name__}: {error}", None
+    return None, None if profiler is None else profiler.to_dict()
+
+
+def _run_file2code_tasks(
+    tasks: Dict[str, Tuple[str, str]],
+    output_dir: Path,
+    jobs: int = 1,
+    on_success: Callable[[str], None] = None,
+    profiles: List[Dict[str, Any]] = None,
+    **file2code_kwargs,
+) -> Dict[str, str]:
+    """
+    Converts all given files, either in this process or distributed over a process pool.
+    Results are reported in the order of `tasks` independent of the completion order.
+
+    Args:
+        tasks (Dict[str, Tuple[str, str]]): mapping from task key to (input file,
+            output file name relative to `output_dir`)
+        output_dir (Path): directory to write the generated files in
+        jobs (int, optional): number of worker processes. Defaults to 1.
+        on_success (Callable[[str], None], optional): called with the task key of every
+            successfully converted file. Defaults to None.
+        profiles (List[Dict[str, Any]], optional): if given, every conversion is
+            profiled and the profiles of successful ones are appended. Defaults to None.
+        **file2code_kwargs: options passed on to `file2code`
+
+    Returns:
+        Dict[str, str]: mapping from failed input file to error message
+    """
+    keys = list(tasks.keys())
+    input_files = [tasks[key][0] for key in keys]
+    output_files = [str(output_dir.joinpath(tasks[key][1])) for key in keys]
+    n = len(keys)
+    profile = [profiles is not None] * n
+
+    if jobs > 1 and n > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=min(jobs, n))
+        chunksize = max(1, n // (4 * jobs))
+        results = executor.map(
+            _file2code_task,
+            input_files,
+            output_files,
+            [file2code_kwargs] * n,
+            profile,
+            chunksize=chunksize,
+        )
+    else:
+        executor = None
+        results = map(
+            _file2code_task, input_files, output_files, [file2code_kwargs] * n, profile
+        )
+
+    failures = {}
+    try:
+        for key, input_file, output_file, (error, file_profile) in zip(
+            keys, input_files, output_files, results
+        ):
+            print(input_file, " --> ", output_file)
+            if error is not None:
+                logging.error(f"Failed to convert {input_file}: {error}")
+                failures[input_file] = error
+                continue
+            if file_profile is not None:
+                profiles.append(file_profile)
+            if on_success is not None:
+                on_success(key)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if len(failures) > 0:
+        report = "\n".join(f"\t- {k}: {v}" for k, v in failures.items())
+        print(f"{len(failures)} of {n} files could not be converted:\n{report}")
+    return failures
 
 
 def hydra2code(
-    in_file_path: str,
-    out_file_path: str = "config.py",
+    in_file_path: str | List[str],
+    out_file_path: str | List[str] = "config.py",
     init_none: bool = False,
     resolve: bool = False,
+    slots: bool = False,
+    array_threshold: int = None,
+    profiler: Profiler = None,
+    overrides: List[str] | List[List[str]] = None,
+    cache_dir: str = None,
+    validators: bool = False,
 ):
-    """_summary_
+    """
+    Composes hydra configs and writes a structured config for each of them. Every input
+    is composed with every set of overrides. All compositions from one config directory
+    share a single initialized hydra context.
 
     Args:
-        in_file_path (str): _description_
-        out_file_path (str, optional): _description_. Defaults to "config.py".
-        init_none (bool, optional): _description_. Defaults to False.
-        resolve (bool, optional): _description_. Defaults to False.
+        in_file_path (str | List[str]): primary config file or several of them
+        out_file_path (str | List[str], optional): output file for a single composition.
+            For several compositions either one output file per composition or a
+            directory not ending with ".py", which gets `<config name>.py` or `<config name>_<i>.py` per set of
+            overrides. Defaults to "config.py".
+        init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False.
+        resolve (bool, optional): resolve interpolations of the composed config. Defaults to False.
+        slots (bool, optional): emit dataclasses with `slots=True`. Defaults to False.
+        array_threshold (int, optional): numeric lists with at least this many elements become `array.array` fields. Defaults to None.
+        profiler (Profiler, optional): records wall time and peak memory per phase. Defaults to None.
+        overrides (List[str] | List[List[str]], optional): one set of hydra overrides like ["db.port=1"] or several sets. Defaults to None.
+        cache_dir (str, optional): cache composed configs in this directory. An entry is reused until one of the files of its defaults list is modified. Defaults to None.
+        validators (bool, optional): emit `_validate` methods which check the field types on load. Defaults to False.
 
     """
-    in_file_path: Path = Path(in_file_path)
-    if in_file_path.is_absolute():
-        call_dir = Path()
-        # change to relative path from system root
-        in_file_path = Path(str(in_file_path)[1:])
+    profiler = NULL_PROFILER if profiler is None else profiler
+    jobs = _hydra_jobs(in_file_path, out_file_path, overrides)
+    contents = _compose_hydra_configs(
+        [job[:3] for job in jobs], resolve, cache_dir, profiler
+    )
+    for (_, _, _, out_file), content in zip(jobs, contents):
+        constructor = ConfigConstructor(array_threshold=array_threshold)
+        constructor.construct(content, profiler)
+        with profiler.phase("write"):
+            constructor.write(out_file, init_none, slots, validators)
+
+
+def _hydra_jobs(
+    in_file_path: str | List[str],
+    out_file_path: str | List[str],
+    overrides: List[str] | List[List[str]] | None,
+) -> List[Tuple[str, str, List[str], str]]:
+    """
+    Returns:
+        List[Tuple[str, str, List[str], str]]: config directory, config name, overrides
+            and output file of every composition
+    """
+    inputs = [in_file_path] if isinstance(in_file_path, (str, Path)) else in_file_path
+    if overrides is None or len(overrides) == 0:
+        override_sets = [[]]
+    elif all(isinstance(override, str) for override in overrides):
+        override_sets = [list(overrides)]
     else:
-        # change to relative path from system root
-        call_dir = Path(str(Path.cwd())[1:])
+        override_sets = [list(override) for override in overrides]
+
+    jobs = []
+    # output names if `out_file_path` is a directory
+    names = []
+    for input_file in inputs:
+        # hydra accepts an absolute config directory, no need to go through cwd
+        input_file = Path(input_file).absolute()
+        for i, override in enumerate(override_sets):
+            jobs.append((str(input_file.parent), input_file.stem, override))
+            suffix = "" if len(override_sets) == 1 else f"_{i}"
+            names.append(input_file.stem + suffix + ".py")
+
+    if out_file_path == "-":
+        outputs = ["-"] * len(jobs)
+    elif not isinstance(out_file_path, (str, Path)):
+        outputs = [str(path) for path in out_file_path]
+        if len(outputs) != len(jobs):
+            raise ValueError(
+                f"Got {len(outputs)} output files for {len(jobs)} compositions"
+            )
+    elif len(jobs) == 1:
+        outputs = [str(out_file_path)]
+    elif Path(out_file_path).suffix == ".py":
+        # e.g. the default "config.py", which is meant as a file and not as a directory
+        raise ValueError(
+            f"Got the output file {out_file_path} for {len(jobs)} compositions, pass an "
+            "output directory or one output file per composition"
+        )
+    else:
+        outputs = [str(Path(out_file_path).joinpath(name)) for name in names]
+        if len(set(outputs)) != len(outputs):
+            raise ValueError("Several inputs share a config name, pass one output each")
+    return [job + (output,) for job, output in zip(jobs, outputs)]
+
 
-    # move relative from from file dire to system root to call dir to specified input file
-    file_dir = Path(__file__).parent
-    cd_path = Path().joinpath(*[".." for _ in file_dir.parents])
+def _compose_hydra_configs(
+    requests: List[Tuple[str, str, List[str]]],
+    resolve: bool,
+    cache_dir: str | None,
+    profiler: Profiler,
+) -> List[Dict[str, Any]]:
+    """
+    Composes (config directory, config name, overrides) requests. Cached compositions
+    are loaded without importing hydra. All others are composed in one initialized
+    context per config directory.
 
-    in_file_path = cd_path.joinpath(call_dir).joinpath(in_file_path)
+    Returns:
+        List[Dict[str, Any]]: config containers in the order of `requests`
+    """
+    import config2class._service.hydra_cache as hydra_cache
 
-    config_path = str(in_file_path.parent)
-    config_name = str(in_file_path.stem)
-    with initialize(version_base=None, config_path=config_path, job_name=None):
-        cfg = compose(config_name=config_name)
+    contents: List[Dict[str, Any] | None] = [None] * len(requests)
+    keys = [None] * len(requests)
+    misses: Dict[str, List[int]] = {}
+    for index, (config_dir, config_name, overrides) in enumerate(requests):
+        if cache_dir is not None:
+            with profiler.phase("cache"):
+                keys[index] = hydra_cache.cache_key(
+                    config_dir, config_name, overrides, resolve
+                )
+                contents[index] = hydra_cache.load(cache_dir, keys[index])
+        if contents[index] is None:
+            misses.setdefault(config_dir, []).append(index)
+    if len(misses) == 0:
+        return contents
 
-    content = OmegaConf.to_container(cfg, resolve=resolve)
-    constructor = ConfigConstructor()
-    constructor.construct(content)
-    constructor.write(out_file_path, init_none)
+    with profiler.phase("import"):
+        from hydra import compose, initialize_config_dir
+        from omegaconf import OmegaConf
+
+    for config_dir, indices in misses.items():
+        with initialize_config_dir(
+            version_base=None, config_dir=config_dir, job_name="config2class"
+        ):
+            for index in indices:
+                _, config_name, overrides = requests[index]
+                with profiler.phase("compose"):
+                    cfg = compose(config_name=config_name, overrides=overrides)
+                with profiler.phase("resolve" if resolve else "to_container"):
+                    contents[index] = OmegaConf.to_container(cfg, resolve=resolve)
+                if cache_dir is not None:
+                    with profiler.phase("cache"):
+                        files = hydra_cache.defaults_files(config_name, overrides)
+                        hydra_cache.store(cache_dir, keys[index], files, contents[index])
+    return contents
 
 
 def start_service(
@@ -130,6 +384,8 @@ def start_service(
     output_file: str = "config.py",
     verbose: bool = False,
     init_none: bool = False,
+    daemon: bool = False,
+    debounce: float = 0.2,
 ):
     """
     Starts a new background thread to observe changes to the input file and update the output configuration file.
@@ -140,13 +396,11 @@ def start_service(
         output_file (str): Path to the configuration output file.
         verbose (bool, optional): if you want to print logs to terminal
         init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
+        daemon (bool, optional): Register the watch in the shared watch daemon (started on demand) instead of starting a new process. Defaults to False
+        debounce (float, optional): Seconds without further file events before the output is regenerated. Defaults to 0.2
     Returns:
         threading.Thread: The started thread running the observer service.
     """
-    if not os.path.exists(PID_FILE):
-        path = Path(PID_FILE)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.touch(exist_ok=True)
     if not os.path.exists(input_file):
         print(f"Input file does not exist: {input_file}")
         return
@@ -155,19 +409,34 @@ def start_service(
 
     print(__file__)
     if verbose:
-        start_observer(input_file, output_file)
+        from config2class._service.backend import start_observer
+
+        start_observer(input_file, output_file, init_none, debounce)
         return None
 
+    if daemon:
+        return _add_daemon_watch(input_file, output_file, init_none, debounce)
+
     check_for_process(input_file, output_file)
     # Start a new Python process that runs this script with an internal flag for `background_task`
     backend_file = Path(__file__).parent.joinpath("backend.py")
     process = subprocess.Popen(
-        [sys.executable, backend_file, input_file, output_file],
+        [
+            sys.executable,
+            backend_file,
+            input_file,
+            output_file,
+            "1" if init_none else "0",
+            str(debounce),
+        ],
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
         start_new_session=True,
     )  # Detach from the terminal
-    add_pid(process.pid, input_file, output_file)
+    if not add_pid(process.pid, input_file, output_file):
+        # another call started a service for the same files in the meantime
+        process.terminate()
+        return None
 
     print(f"Background process started with PID {process.pid}")
     return process.pid
@@ -184,6 +453,12 @@ def stop_process(pid: int):
     Logs:
         Warnings if the PID is not found, and informational messages during shutdown.
     """
+    from config2class._service.control import daemon_pid
+
+    if pid == daemon_pid():
+        stop_daemon()
+        return
+
     # Check if the PID file exists
     remove_pid(pid)
 
@@ -193,3 +468,74 @@ def stop_process(pid: int):
         print(f"Background process with PID {pid} stopped.")
     except ProcessLookupError:
         print(f"No process with PID {pid} found.")
+
+
+def _add_daemon_watch(
+    input_file: str, output_file: str, init_none: bool, debounce: float
+) -> int | None:
+    from config2class._service.control import ensure_daemon, send_request
+
+    pid = ensure_daemon()
+    response = send_request(
+        {
+            "command": "add",
+            "input": os.path.abspath(input_file),
+            "output": os.path.abspath(output_file),
+            "init_none": init_none,
+            "debounce": debounce,
+        }
+    )
+    if not response["ok"]:
+        print(f"Could not add watch: {response['error']}")
+        return None
+    print(f"Watch added to daemon with PID {pid}")
+    return pid
+
+
+def stop_watch(input_file: str, output_file: str = None):
+    """
+    Removes the watches of an input file from the watch daemon.
+
+    Args:
+        input_file (str): observed config file
+        output_file (str, optional): only remove the watch which writes to this file. Defaults to None.
+    """
+    from config2class._service.control import DaemonNotRunning, send_request
+
+    request = {"command": "remove", "input": os.path.abspath(input_file)}
+    if output_file is not None:
+        request["output"] = os.path.abspath(output_file)
+    try:
+        removed = send_request(request)["removed"]
+    except DaemonNotRunning:
+        removed = []
+    if len(removed) == 0:
+        print(f"No watch for {input_file} found.")
+    for watched_input, watched_output in removed:
+        print(f"Stopped watching {watched_input} -> {watched_output}")
+
+
+def list_daemon_watches() -> Tuple[int | None, List[Tuple[str, str]]]:
+    """
+    Returns:
+        Tuple[int | None, List[Tuple[str, str]]]: pid of the watch daemon and all
+            watched (input, output) pairs. (None, []) if the daemon is not running.
+    """
+    from config2class._service.control import DaemonNotRunning, send_request
+
+    try:
+        response = send_request({"command": "list"})
+    except DaemonNotRunning:
+        return None, []
+    return response["pid"], [tuple(watch) for watch in response["watches"]]
+
+
+def stop_daemon():
+    """stop the watch daemon together with all of its watches"""
+    from config2class._service.control import DaemonNotRunning, send_request
+
+    try:
+        send_request({"command": "shutdown"})
+        print("Watch daemon stopped.")
+    except DaemonNotRunning:
+        pass
@@ -1,31 +1,42 @@
+import os
 import sys
+import threading
 import time
 from config2class._core.constructor import ConfigConstructor
 import config2class.utils.filesystem as fs_utils
-from watchdog.events import FileSystemEventHandler, FileModifiedEvent
+from config2class.utils.dict_operations import structural_signature
+from watchdog.events import (
+    FileCreatedEvent,
+    FileModifiedEvent,
+    FileMovedEvent,
+    FileSystemEventHandler,
+)
 from watchdog.observers import Observer
 import logging
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Tuple
 
 
 class ConfigHandler(FileSystemEventHandler):
     def __init__(
-        self, input_file: str, output_file: str = "config", init_none: bool = False
+        self,
+        input_file: str,
+        output_file: str = "config",
+        init_none: bool = False,
+        debounce: float = 0.2,
     ):
         super().__init__()
 
         self.input_file = input_file
         self.output_file = output_file
         self.init_none = init_none
+        self.debounce = debounce
         self.config_constructor = ConfigConstructor()
-        self._load_func = self._get_load_func(self.input_file)
-        try:
-            ending = self.input_file.split(".")[-1]
-            self._load_func = getattr(fs_utils, "load_" + ending)
-        except AttributeError as error:
-            raise NotImplementedError(
-                f"Files with ending {ending} are not supported yet. Please use .yaml or .json or .toml."
-            ) from error
+        # structure of the config the output was generated from
+        self._signature = None
+        self._timer: threading.Timer = None
+        self._timer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._load_func = fs_utils.get_load_func(self.input_file)
 
     def on_modified(self, event: FileModifiedEvent):
         """
@@ -38,38 +49,98 @@ class ConfigHandler(FileSystemEventHandler):
         # print("modified: ", type(event), event.src_path)
         if event.src_path == self.input_file:
             logging.info(f"The file '{self.input_file}' has been modified.")
-            self._create_config()
+            self._schedule()
+
+    def on_created(self, event: FileCreatedEvent):
+        """
+        Event handler triggered when the monitored file is created again, e.g. after it
+        was deleted by an editor while saving.
+
+        Args:
+            event (FileCreatedEvent): The event object containing information about the file change.
+        """
+        if event.src_path == self.input_file:
+            logging.info(f"The file '{self.input_file}' has been created.")
+            self._schedule()
+
+    def on_moved(self, event: FileMovedEvent):
+        """
+        Event handler triggered when a file is moved onto the monitored file. Editors
+        which save atomically write a temporary file and rename it.
+
+        Args:
+            event (FileMovedEvent): The event object containing information about the file change.
+        """
+        if event.dest_path == self.input_file:
+            logging.info(f"The file '{self.input_file}' has been replaced.")
+            self._schedule()
 
-    @staticmethod
-    def _get_load_func(input_file: str) -> Callable[[str], Dict[str, Any]]:
-        try:
-            ending = input_file.split(".")[-1]
-            return getattr(fs_utils, "load_" + ending)
-        except AttributeError as error:
-            raise NotImplementedError(
-                f"Files with ending {ending} are not supported yet. Please use .yaml or .json or .toml."
-            ) from error
+    def cancel(self):
+        """drop a pending regeneration"""
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def _schedule(self):
+        """
+        Regenerates the config once no further event arrived within the debounce window.
+        Editors usually fire several events per save, which are coalesced this way.
+        """
+        if self.debounce <= 0:
+            self._create_config()
+            return
+        with self._timer_lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._create_config)
+            self._timer.daemon = True
+            self._timer.start()
 
     def _create_config(self):
         """
         Loads content from the input file, constructs a configuration using
-        `ConfigConstructor`, and writes the result to the output file.
+        `ConfigConstructor`, and writes the result to the output file. The output is
+        only rewritten if the keys or value types of the config changed, because only
+        those end up in the generated code.
 
         Raises:
             NotImplementedError: If the file type is not supported.
         """
-        content = self._load_func(self.input_file)
-        self.config_constructor.construct(content)
-        self.config_constructor.write(self.output_file, self.init_none)
-        logging.info(f"New config written to {self.output_file}")
+        with self._write_lock:
+            try:
+                content = self._load_func(self.input_file)
+            except Exception as error:  # pylint: disable=W0718
+                # e.g. a file which is only partially written
+                logging.warning(f"Could not load {self.input_file}: {error}")
+                return
+            if not isinstance(content, dict):
+                logging.warning(f"{self.input_file} does not contain a mapping")
+                return
+
+            signature = structural_signature(content)
+            if signature == self._signature and os.path.exists(self.output_file):
+                logging.info(f"Structure unchanged. Keep {self.output_file}")
+                return
+
+            self.config_constructor.construct(content)
+            self.config_constructor.write(self.output_file, self.init_none)
+            self._signature = signature
+            logging.info(f"New config written to {self.output_file}")
 
 
 def start_observer(
-    input_file: str, output_file: str = "config.py", init_none: bool = False
+    input_file: str,
+    output_file: str = "config.py",
+    init_none: bool = False,
+    debounce: float = 0.2,
 ):
     # Create an event handler and an observer
     event_handler = ConfigHandler(
-        input_file=input_file, output_file=output_file, init_none=init_none
+        input_file=input_file,
+        output_file=output_file,
+        init_none=init_none,
+        debounce=debounce,
     )
     observer = Observer()
     observer.schedule(event_handler, input_file, recursive=True)
@@ -85,8 +156,33 @@ def start_observer(
         time.sleep(2)
 
 
+def parse_args(argv: List[str]) -> Tuple[str, str, bool, float]:
+    """
+    Parses the arguments which `start_service` passes to a background process.
+
+    Args:
+        argv (List[str]): input file, output file and optionally init_none ("0"/"1")
+            and debounce in seconds
+
+    Raises:
+        ValueError: on a wrong number of arguments
+
+    Returns:
+        Tuple[str, str, bool, float]: input file, output file, init_none and debounce
+    """
+    if len(argv) not in (2, 4):
+        raise ValueError(
+            "Usage: python backend.py <input-file> <output-file> [<init-none> <debounce>]"
+        )
+    if len(argv) == 2:
+        return argv[0], argv[1], False, 0.2
+    return argv[0], argv[1], argv[2] == "1", float(argv[3])
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python backend.py <input-file> <output-file>")
+    try:
+        args = parse_args(sys.argv[1:])
+    except ValueError as error:
+        print(error)
         sys.exit(1)
-    start_observer(*sys.argv[1:])
+    start_observer(*args)
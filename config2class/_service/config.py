@@ -1 +1,15 @@
-PID_FILE = "/".join([*__file__.split("/")[:-2], "data", "pid.yaml"])
+import os
+import tempfile
+
+DATA_DIR = "/".join([*__file__.split("/")[:-2], "data"])
+PID_FILE = "/".join([DATA_DIR, "pid.db"])
+
+# the watch daemon listens on a unix socket. Socket paths are limited to ~100
+# characters, so fall back to a private directory in the temp dir for deep installs.
+DAEMON_SOCKET = "/".join([DATA_DIR, "daemon.sock"])
+if len(DAEMON_SOCKET) > 100:
+    DAEMON_SOCKET = os.path.join(
+        tempfile.gettempdir(), f"config2class-{os.getuid()}", "daemon.sock"
+    )
+DAEMON_LOCK = "/".join([DATA_DIR, "daemon.lock"])
+DAEMON_LOG = "/".join([DATA_DIR, "daemon.logs"])
@@ -0,0 +1,97 @@
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+from multiprocessing.connection import Client
+from pathlib import Path
+from typing import Any, Dict
+
+from config2class._service.config import DAEMON_LOG, DAEMON_SOCKET
+
+
+class DaemonNotRunning(ConnectionError):
+    """raised if there is no watch daemon listening on the control socket"""
+
+
+def send_request(request: Dict[str, Any], timeout: float = 5.0) -> Dict[str, Any]:
+    """
+    Sends one request to the watch daemon and waits for the response. Requests and
+    responses are JSON encoded, so the daemon never unpickles data from a client.
+
+    Args:
+        request (Dict[str, Any]): request with a "command" key
+        timeout (float, optional): seconds to wait for the response. Defaults to 5.0.
+
+    Raises:
+        DaemonNotRunning: if no daemon listens on the control socket
+
+    Returns:
+        Dict[str, Any]: response of the daemon with an "ok" flag
+    """
+    try:
+        connection = Client(DAEMON_SOCKET, family="AF_UNIX")
+    except (FileNotFoundError, ConnectionRefusedError) as error:
+        raise DaemonNotRunning(f"no watch daemon listens on {DAEMON_SOCKET}") from error
+    with connection:
+        connection.send_bytes(json.dumps(request).encode("utf-8"))
+        if not connection.poll(timeout):
+            raise TimeoutError(f"watch daemon did not answer within {timeout}s")
+        return json.loads(connection.recv_bytes().decode("utf-8"))
+
+
+def daemon_pid() -> int | None:
+    """
+    Returns:
+        int | None: pid of the running watch daemon or None if there is none
+    """
+    try:
+        return send_request({"command": "ping"})["pid"]
+    except DaemonNotRunning:
+        return None
+
+
+def ensure_daemon(timeout: float = 10.0) -> int:
+    """
+    Starts the watch daemon in the background if it is not running yet.
+
+    Args:
+        timeout (float, optional): seconds to wait for the daemon to accept requests.
+            Defaults to 10.0.
+
+    Raises:
+        TimeoutError: if the daemon did not come up in time
+
+    Returns:
+        int: pid of the daemon
+    """
+    pid = daemon_pid()
+    if pid is not None:
+        return pid
+
+    Path(DAEMON_LOG).parent.mkdir(parents=True, exist_ok=True)
+    # make this copy of config2class importable for the daemon
+    env = dict(os.environ)
+    package_root = str(Path(__file__).parents[2])
+    env["PYTHONPATH"] = os.pathsep.join(
+        filter(None, [package_root, env.get("PYTHONPATH")])
+    )
+    with open(DAEMON_LOG, "a", encoding="utf-8") as log_file:
+        subprocess.Popen(
+            [sys.executable, "-m", "config2class._service.daemon"],
+            stdin=subprocess.DEVNULL,
+            stdout=log_file,
+            stderr=log_file,
+            env=env,
+            start_new_session=True,
+        )  # Detach from the terminal
+
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pid = daemon_pid()
+        if pid is not None:
+            logging.info(f"Started watch daemon with PID {pid}")
+            return pid
+        time.sleep(0.05)
+    raise TimeoutError(f"watch daemon did not start. See {DAEMON_LOG}")
@@ -0,0 +1,188 @@
+import fcntl
+import json
+import logging
+import os
+import sys
+from multiprocessing.connection import Listener
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from watchdog.observers import Observer
+from watchdog.observers.api import ObservedWatch
+
+from config2class._service.backend import ConfigHandler
+from config2class._service.config import DAEMON_LOCK, DAEMON_SOCKET
+
+
+class WatchRegistry:
+    """
+    Registry of all input -> output pairs the daemon keeps up to date. All pairs share
+    one watchdog observer. Every pair is scheduled on the directory of its input file,
+    and watchdog shares one emitter between all handlers of the same directory.
+    """
+
+    def __init__(self, observer: Observer):
+        """
+        Initializes a new `WatchRegistry` instance.
+
+        Args:
+            observer (Observer): started watchdog observer
+        """
+        self.observer = observer
+        self.watches: Dict[Tuple[str, str], Tuple[ConfigHandler, ObservedWatch]] = {}
+
+    def add(
+        self,
+        input_file: str,
+        output_file: str,
+        init_none: bool = False,
+        debounce: float = 0.2,
+    ):
+        """
+        Starts to keep `output_file` up to date with `input_file`.
+
+        Args:
+            input_file (str): config file to observe
+            output_file (str): python file to write the dataclasses in
+            init_none (bool, optional): Would you like to init all argument with None or just declare members in the class. Defaults to False
+            debounce (float, optional): seconds without further events before the output is regenerated. Defaults to 0.2
+
+        Raises:
+            ValueError: if the pair is already watched
+            FileNotFoundError: if the input file does not exist
+        """
+        key = (input_file, output_file)
+        if key in self.watches:
+            raise ValueError(f"{input_file} -> {output_file} is already watched")
+        if not os.path.exists(input_file):
+            raise FileNotFoundError(f"Input file does not exist: {input_file}")
+        handler = ConfigHandler(input_file, output_file, init_none, debounce)
+        watch = self.observer.schedule(handler, str(Path(input_file).parent))
+        self.watches[key] = (handler, watch)
+        logging.info(f"Watch {input_file} -> {output_file}")
+
+    def remove(self, input_file: str, output_file: str = None) -> List[Tuple[str, str]]:
+        """
+        Stops to watch all pairs with the given input file and optionally output file.
+
+        Args:
+            input_file (str): observed config file
+            output_file (str, optional): python file of the pair. Defaults to all
+                outputs of `input_file`.
+
+        Returns:
+            List[Tuple[str, str]]: removed pairs
+        """
+        keys = [
+            key
+            for key in self.watches
+            if key[0] == input_file and output_file in (None, key[1])
+        ]
+        for key in keys:
+            handler, watch = self.watches.pop(key)
+            self.observer.remove_handler_for_watch(handler, watch)
+            handler.cancel()
+            if not any(other == watch for _, other in self.watches.values()):
+                # last watched file in this directory
+                self.observer.unschedule(watch)
+            logging.info(f"Stopped watching {key[0]} -> {key[1]}")
+        return keys
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Executes one control request.
+
+        Args:
+            request (Dict[str, Any]): request with a "command" key
+
+        Returns:
+            Dict[str, Any]: response with an "ok" flag and an "error" message on failure
+        """
+        command = request.get("command")
+        try:
+            match command:
+                case "ping":
+                    return {"ok": True, "pid": os.getpid()}
+                case "add":
+                    init_none = request.get("init_none", False)
+                    debounce = request.get("debounce", 0.2)
+                    self.add(request["input"], request["output"], init_none, debounce)
+                    return {"ok": True, "pid": os.getpid()}
+                case "remove":
+                    removed = self.remove(request["input"], request.get("output"))
+                    return {"ok": True, "removed": removed}
+                case "list":
+                    return {"ok": True, "pid": os.getpid(), "watches": list(self.watches)}
+                case _:
+                    return {"ok": False, "error": f"unknown command: {command}"}
+        except (ValueError, KeyError, OSError, NotImplementedError) as error:
+            return {"ok": False, "error": str(error)}
+
+
+def _acquire_lock():
+    """
+    Takes an exclusive lock for the lifetime of the daemon. Exits if another daemon
+    already holds it.
+    """
+    Path(DAEMON_LOCK).parent.mkdir(parents=True, exist_ok=True)
+    lock_file = open(DAEMON_LOCK, "w", encoding="utf-8")  # pylint: disable=R1732
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        print("Another watch daemon is already running.")
+        sys.exit(0)
+    return lock_file
+
+
+def serve():
+    """
+    Runs the watch daemon: one watchdog observer for all watched files and a control
+    socket to add, remove and list watches. Runs until a "shutdown" request arrives.
+    """
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s"
+    )
+    lock_file = _acquire_lock()
+
+    # a socket file without a daemon is left over from a crash
+    socket_path = Path(DAEMON_SOCKET)
+    socket_path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+    socket_path.unlink(missing_ok=True)
+
+    observer = Observer()
+    observer.start()
+    registry = WatchRegistry(observer)
+
+    # only the owner may talk to the daemon
+    old_umask = os.umask(0o177)
+    try:
+        listener = Listener(DAEMON_SOCKET, family="AF_UNIX")
+    finally:
+        os.umask(old_umask)
+
+    print(f"Watch daemon with PID {os.getpid()} listens on {DAEMON_SOCKET}", flush=True)
+    try:
+        with listener:
+            running = True
+            while running:
+                with listener.accept() as connection:
+                    try:
+                        request = json.loads(connection.recv_bytes().decode("utf-8"))
+                        if request.get("command") == "shutdown":
+                            response = {"ok": True}
+                            running = False
+                        else:
+                            response = registry.handle(request)
+                        connection.send_bytes(json.dumps(response).encode("utf-8"))
+                    except (EOFError, OSError, ValueError, AttributeError) as error:
+                        logging.warning(f"Dropped malformed control request: {error}")
+    finally:
+        observer.stop()
+        observer.join()
+        socket_path.unlink(missing_ok=True)
+        lock_file.close()
+        print("Watch daemon stopped.", flush=True)
+
+
+if __name__ == "__main__":
+    serve()
@@ -0,0 +1,167 @@
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List
+
+from config2class._service.manifest import get_generator_version
+
+
+@lru_cache(maxsize=None)
+def get_hydra_version() -> str:
+    """
+    Returns:
+        str: installed version of hydra-core or "unknown". Read from the package
+            metadata, so a cache lookup does not import hydra.
+    """
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("hydra-core")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def cache_key(
+    config_dir: str, config_name: str, overrides: List[str], resolve: bool
+) -> Dict[str, Any]:
+    """
+    Args:
+        config_dir (str): absolute path of the hydra config directory
+        config_name (str): name of the primary config without ending
+        overrides (List[str]): hydra overrides
+        resolve (bool): if the composed config is resolved
+
+    Returns:
+        Dict[str, Any]: everything except the config files which determines the
+            composed config
+    """
+    return {
+        "config_dir": config_dir,
+        "config_name": config_name,
+        "overrides": list(overrides),
+        "resolve": resolve,
+        "hydra": get_hydra_version(),
+        "version": _get_generator_version(),
+    }
+
+
+# reading package metadata is slow, look it up once per process
+_get_generator_version = lru_cache(maxsize=None)(get_generator_version)
+
+
+def _entry_path(cache_dir: str | Path, key: Dict[str, Any]) -> Path:
+    digest = hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+    return Path(cache_dir).joinpath(digest + ".json")
+
+
+def _mtimes(files: List[str]) -> Dict[str, int] | None:
+    try:
+        return {file: os.stat(file).st_mtime_ns for file in files}
+    except OSError:
+        return None
+
+
+def load(cache_dir: str | Path, key: Dict[str, Any]) -> Dict[str, Any] | None:
+    """
+    Looks up a composed config. An entry is valid as long as none of the config files in
+    its defaults list was modified, moved or deleted.
+
+    Args:
+        cache_dir (str | Path): directory of the cache entries
+        key (Dict[str, Any]): output of `cache_key`
+
+    Returns:
+        Dict[str, Any] | None: composed config container or None on a miss
+    """
+    path = _entry_path(cache_dir, key)
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            entry = json.load(file)
+    except (json.JSONDecodeError, OSError) as error:
+        logging.warning(f"Could not read hydra cache entry {path}: {error}")
+        return None
+    if entry.get("key") != key or _mtimes(list(entry["files"])) != entry["files"]:
+        return None
+    logging.debug(f"Use cached composition of {key['config_name']} from {path}")
+    return entry["content"]
+
+
+def store(
+    cache_dir: str | Path,
+    key: Dict[str, Any],
+    files: List[str],
+    content: Dict[str, Any],
+):
+    """
+    Writes a composed config into the cache.
+
+    Args:
+        cache_dir (str | Path): directory of the cache entries
+        key (Dict[str, Any]): output of `cache_key`
+        files (List[str]): config files of the defaults list
+        content (Dict[str, Any]): composed config container
+    """
+    mtimes = _mtimes(files)
+    if mtimes is None:
+        return
+    entry = {"key": key, "files": mtimes, "content": content}
+    try:
+        text = json.dumps(entry)
+    except (TypeError, ValueError):
+        return
+    # json turns non string keys into strings, such a config would come back changed
+    if json.loads(text)["content"] != content:
+        return
+    path = _entry_path(cache_dir, key)
+    Path.mkdir(path.parent, parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+    tmp_path.replace(path)
+
+
+def defaults_files(config_name: str, overrides: List[str]) -> List[str]:
+    """
+    Lists the config files a composition reads. Has to be called inside an initialized
+    hydra context. Configs shipped inside packages, e.g. the defaults of hydra itself,
+    are covered by the hydra version in the cache key.
+
+    Args:
+        config_name (str): name of the primary config without ending
+        overrides (List[str]): hydra overrides
+
+    Returns:
+        List[str]: absolute paths of the config files in the defaults list
+    """
+    from hydra.core.global_hydra import GlobalHydra
+    from hydra.types import RunMode
+
+    loader = GlobalHydra.instance().config_loader()
+    defaults = loader.compute_defaults_list(config_name, list(overrides), RunMode.RUN)
+    directories = [
+        Path(source.path)
+        for source in loader.get_sources()
+        if source.scheme() == "file"
+    ]
+    files = []
+    for default in defaults.defaults:
+        if default.config_path is None:
+            continue
+        file = _find_config_file(directories, default.config_path)
+        if file is not None:
+            files.append(str(file))
+    return files
+
+
+def _find_config_file(directories: List[Path], config_path: str) -> Path | None:
+    for directory in directories:
+        for ending in (".yaml", ".yml"):
+            file = directory.joinpath(config_path + ending)
+            if file.exists():
+                return file
+    return None
@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+MANIFEST_FILE = ".config2class_manifest.json"
+
+
+def get_generator_version() -> str:
+    """
+    Returns the installed version of config2class. Generated code depends on it, so a
+    version change invalidates every entry in a manifest.
+
+    Returns:
+        str: version string or "unknown" if the package is not installed
+    """
+    # importlib.metadata is slow to import and only needed for incremental runs
+    from importlib.metadata import PackageNotFoundError, version
+
+    try:
+        return version("config2class")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def hash_file(path: str | Path) -> str:
+    """
+    Computes the sha256 hex digest of a file's content.
+
+    Args:
+        path (str | Path): path to the file
+
+    Returns:
+        str: hex digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(output_dir: str | Path) -> Dict[str, Any]:
+    """
+    Loads the manifest from the output directory. A missing or corrupt manifest
+    results in an empty one, which triggers a full regeneration.
+
+    Args:
+        output_dir (str | Path): directory with the generated files
+
+    Returns:
+        Dict[str, Any]: manifest content
+    """
+    path = Path(output_dir).joinpath(MANIFEST_FILE)
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (json.JSONDecodeError, OSError) as error:
+        logging.warning(f"Could not read manifest {path}: {error}. Regenerate all files.")
+        return {}
+
+
+def write_manifest(output_dir: str | Path, manifest: Dict[str, Any]):
+    """
+    Writes the manifest into the output directory.
+
+    Args:
+        output_dir (str | Path): directory with the generated files
+        manifest (Dict[str, Any]): manifest content
+    """
+    path = Path(output_dir).joinpath(MANIFEST_FILE)
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    tmp_path.replace(path)
+
+
+def new_manifest(options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Creates an empty manifest for the given generation options.
+
+    Args:
+        options (Dict[str, Any]): options which influence the generated code
+
+    Returns:
+        Dict[str, Any]: manifest without file entries
+    """
+    return {"version": get_generator_version(), "options": options, "files": {}}
+
+
+def plan_incremental(
+    manifest: Dict[str, Any],
+    tasks: Dict[str, Tuple[str, str]],
+    output_dir: str | Path,
+    options: Dict[str, Any],
+) -> Tuple[Dict[str, str], List[Path], Dict[str, Any]]:
+    """
+    Compares the current input files against a manifest and decides which outputs have
+    to be regenerated and which outputs are stale.
+
+    Args:
+        manifest (Dict[str, Any]): manifest from the previous run
+        tasks (Dict[str, Tuple[str, str]]): mapping from manifest key (input path
+            relative to the input directory) to (input file, output file name relative
+            to the output directory)
+        output_dir (str | Path): directory with the generated files
+        options (Dict[str, Any]): options which influence the generated code
+
+    Returns:
+        Tuple[Dict[str, str], List[Path], Dict[str, Any]]: content hashes of the tasks
+            to regenerate, output files to delete and the new manifest. The new manifest
+            already contains the entries of all up-to-date files. Entries for
+            regenerated files have to be added with `record` after a successful
+            generation.
+    """
+    output_dir = Path(output_dir)
+    valid = (
+        manifest.get("version") == get_generator_version()
+        and manifest.get("options") == options
+    )
+    old_files = manifest.get("files", {}) if valid else {}
+    updated = new_manifest(options)
+
+    rebuild = {}
+    for key, (input_file, output_name) in tasks.items():
+        digest = hash_file(input_file)
+        entry = old_files.get(key)
+        if (
+            entry is not None
+            and entry["hash"] == digest
+            and entry["output"] == output_name
+            and output_dir.joinpath(output_name).exists()
+        ):
+            updated["files"][key] = entry
+        else:
+            rebuild[key] = digest
+
+    # outputs of vanished inputs or of inputs which map to a new output name
+    current_outputs = {output_name for _, output_name in tasks.values()}
+    stale = [
+        output_dir.joinpath(entry["output"])
+        for entry in manifest.get("files", {}).values()
+        if entry["output"] not in current_outputs
+    ]
+    return rebuild, stale, updated
+
+
+def record(manifest: Dict[str, Any], key: str, digest: str, output_name: str):
+    """
+    Adds an entry for a successfully generated file to the manifest.
+
+    Args:
+        manifest (Dict[str, Any]): manifest returned by `plan_incremental`
+        key (str): manifest key of the input file
+        digest (str): content hash of the input file
+        output_name (str): name of the generated file relative to the output directory
+    """
+    manifest["files"][key] = {"hash": digest, "output": output_name}
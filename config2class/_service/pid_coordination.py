@@ -1,57 +1,149 @@
 import logging
-from pathlib import Path
+import os
+import sqlite3
 import sys
-from typing import Dict, Tuple
-from config2class.utils import filesystem
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Tuple
 from config2class._service.config import PID_FILE
 
+# The registry is a SQLite database. Every update runs in an immediate transaction,
+# so concurrent `c2c start-service` calls are serialized by SQLite's file lock, and
+# the unique index on (input, output) makes lookups by pair cheap.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS services (
+    pid INTEGER PRIMARY KEY,
+    input TEXT NOT NULL,
+    output TEXT NOT NULL,
+    UNIQUE (input, output)
+)
+"""
+
+
+@contextmanager
+def _transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Opens the registry and runs the body in one write transaction.
+
+    Yields:
+        Iterator[sqlite3.Connection]: connection inside the transaction
+    """
+    Path(PID_FILE).parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(PID_FILE, timeout=60, isolation_level=None)
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute(_SCHEMA)
+        yield connection
+        connection.execute("COMMIT")
+    except BaseException:
+        if connection.in_transaction:
+            connection.execute("ROLLBACK")
+        raise
+    finally:
+        connection.close()
+
+
+def is_alive(pid: int) -> bool:
+    """
+    Args:
+        pid (int): process id
+
+    Returns:
+        bool: True if a process with this pid exists
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # the process exists but belongs to someone else
+        return True
+    return True
+
 
 def read_pid_file() -> Dict[int, Tuple[str, str]]:
     """
-    Reads the PID file and returns a list of process IDs.
+    Reads the registry and returns all running services. Entries of processes which
+    are not alive anymore are pruned.
 
     Returns:
         Dict[str, Any]: Mapping from PID to observed files
     """
-    pid_file = Path(PID_FILE)
-    if not pid_file.exists():
-        pid_file.parent.mkdir(parents=True, exist_ok=True)
-        pid_file.touch(exist_ok=True)
+    with _transaction() as connection:
+        rows = connection.execute("SELECT pid, input, output FROM services").fetchall()
+        stale = [(pid,) for pid, _, _ in rows if not is_alive(pid)]
+        connection.executemany("DELETE FROM services WHERE pid = ?", stale)
+    stale = {pid for pid, in stale}
+    return {
+        pid: (input_file, output_file)
+        for pid, input_file, output_file in rows
+        if pid not in stale
+    }
 
-    content = filesystem.get_load_func(PID_FILE)(PID_FILE)
-    if content is None:
-        content = dict()
-    return content
+
+def find_pid(input_file: str, output_file: str) -> int | None:
+    """
+    Looks up the running service which maps from `input_file` to `output_file`.
+
+    Args:
+        input_file (str): input file of the process
+        output_file (str): output file of the process
+
+    Returns:
+        int | None: pid of the service or None if there is no running service
+    """
+    with _transaction() as connection:
+        return _find_alive(connection, input_file, output_file)
+
+
+def _find_alive(
+    connection: sqlite3.Connection, input_file: str, output_file: str
+) -> int | None:
+    row = connection.execute(
+        "SELECT pid FROM services WHERE input = ? AND output = ?",
+        (input_file, output_file),
+    ).fetchone()
+    if row is None:
+        return None
+    if not is_alive(row[0]):
+        connection.execute("DELETE FROM services WHERE pid = ?", row)
+        return None
+    return row[0]
 
 
 def check_for_process(input_file: str, output_file: str):
-    content = read_pid_file()
-    if content is None:
-        return
-    value = [input_file, output_file]
-    if value in content.values():
-        content_rev = {tuple(v): k for k, v in content.items()}
-        msg = f"There is already a process (pid: {content_rev[tuple(value)]}) which maps from {input_file} to {output_file}"
+    pid = find_pid(input_file, output_file)
+    if pid is not None:
+        msg = f"There is already a process (pid: {pid}) which maps from {input_file} to {output_file}"
         logging.error(msg)
         sys.exit()
 
 
-def add_pid(pid: int, input_file: str, output_file: str):
+def add_pid(pid: int, input_file: str, output_file: str) -> bool:
     """
-    Appends a new process ID to the PID file.
+    Registers a new process. The check for an existing service with the same input and
+    output file and the insert happen atomically.
 
     Args:
         pid (int): The process ID to be added.
         input_file (str): input file of the process
         output_file (str): ouput file of the process
+
+    Returns:
+        bool: False if another running process already maps from input to output file
     """
-    content = read_pid_file()
-    if content is None:
-        content = {}
-    check_for_process(input_file, output_file)
-    value = [input_file, output_file]
-    content[pid] = value
-    filesystem.get_write_func(PID_FILE)(PID_FILE, content)
+    with _transaction() as connection:
+        other_pid = _find_alive(connection, input_file, output_file)
+        if other_pid is not None:
+            msg = f"There is already a process (pid: {other_pid}) which maps from {input_file} to {output_file}"
+            logging.error(msg)
+            return False
+        # a recycled pid of a dead service
+        connection.execute(
+            "INSERT OR REPLACE INTO services (pid, input, output) VALUES (?, ?, ?)",
+            (pid, input_file, output_file),
+        )
+    return True
 
 
 def remove_pid(pid: int):
@@ -62,10 +154,8 @@ def remove_pid(pid: int):
     Args:
         pid (int): The process ID to be removed.
     """
-    content = read_pid_file()
-    try:
-        content.pop(pid)
-        filesystem.get_write_func(PID_FILE)(PID_FILE, content)
-    except KeyError:
+    with _transaction() as connection:
+        removed = connection.execute("DELETE FROM services WHERE pid = ?", (pid,))
+    if removed.rowcount == 0:
         msg = f"No logged running process with {pid=} found"
         logging.warning(msg)
@@ -1,51 +1,387 @@
 from abc import ABC
+from array import array
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import as_completed
+from functools import lru_cache
 import os
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from typing import get_args, get_origin, get_type_hints
 
 from omegaconf import DictConfig, OmegaConf
 import yaml
 
-from config2class.utils.deconstruction import deconstruct_config
+from config2class.utils.deconstruction import deconstruct_config, repr_config
+from config2class.utils.omega_conf import contains_interpolation
 import config2class.utils.filesystem as fs_utils
+from config2class.api.cache import file_cache
 from config2class.api.construct import get_content, preprocess_container
 
 
+class ConfigLoadError(Exception):
+    """
+    Some files of `StructuredConfig.from_files` could not be loaded. `errors` maps every
+    failed file to its exception.
+    """
+
+    def __init__(self, errors: Dict[str, Exception], num_files: int):
+        self.errors = errors
+        lines = [f"Failed to load {len(errors)} of {num_files} config files:"]
+        lines.extend(
+            f"  {file}: {type(error).__name__}: {error}" for file, error in errors.items()
+        )
+        super().__init__("\n".join(lines))
+
+
 class StructuredConfig(ABC):
+    # empty slots keep generated `@dataclass(slots=True)` subclasses free of a `__dict__`
+    __slots__ = ()
+    # limits of `__repr__`. Use `display` for the full config.
+    _repr_max_depth = 3
+    _repr_max_width = 8
+    # switched by `config2class.api.validation.set_validation`
+    _validate_on_load = True
+
     @classmethod
-    def from_file(cls, file: str | Path, resolve: bool = True) -> object:
+    def from_file(
+        cls,
+        file: str | Path,
+        resolve: bool = True,
+        cache: bool = False,
+        shared: bool = False,
+        select: str = None,
+    ) -> object:
+        """load a config file into an instance of this class
+
+        Args:
+            file (str | Path): path to the config file
+            resolve (bool, optional): resolve interpolations. Defaults to True.
+            cache (bool, optional): look the file up in `config2class.api.cache.file_cache`
+                first. Entries are keyed by path, modification time, size, `resolve` and
+                `select`. Defaults to False.
+            shared (bool, optional): only with `cache`. Return one frozen instance shared
+                by all callers instead of a fresh copy. Defaults to False.
+            select (str, optional): dotted path of a subtree of the file, e.g.
+                "pipeline.dataset" or "stages.0", counted from the top level of the file.
+                Only this subtree is parsed, which is much cheaper for large json and
+                yaml files. Defaults to None.
+
+        Returns:
+            object: config instance
+        """
         if isinstance(file, str):
             file = Path(file)
 
-        content = get_content(file, resolve=resolve)
-        return cls(**content)
+        if cache:
+            return file_cache.get_instance(
+                cls, file, resolve, get_content, shared, select
+            )
+        content = get_content(file, resolve=resolve, select=select)
+        return cls._load(content)
+
+    @classmethod
+    def from_files(
+        cls,
+        files: Iterable[str | Path],
+        resolve: bool = True,
+        workers: int = None,
+        executor: str = "thread",
+        select: str = None,
+        errors: Dict[str, Exception] = None,
+    ) -> List[object]:
+        """load many config files into instances of this class
+
+        Files are read, parsed and resolved concurrently. The instances are built in the
+        calling process, so the generated class does not have to be importable in worker
+        processes.
+
+        Args:
+            files (Iterable[str | Path]): paths to the config files
+            resolve (bool, optional): resolve interpolations. Defaults to True.
+            workers (int, optional): number of workers. 1 loads the files one after the
+                other in the calling thread. Defaults to None, which lets the executor
+                choose.
+            executor (str, optional): "thread" or "process". Threads suit many small
+                files, processes large files where parsing dominates. Defaults to "thread".
+            select (str, optional): dotted path of the subtree to load from every file,
+                see `from_file`. Defaults to None.
+            errors (Dict[str, Exception], optional): if given, failures are stored here
+                by file and the failed files are None in the result. Otherwise all files
+                are loaded and a ConfigLoadError with every failure is raised at the end.
+                Defaults to None.
+
+        Returns:
+            List[object]: config instances in the order of `files`
+        """
+        files = [str(file) for file in files]
+        instances = [None] * len(files)
+        for index, _, instance in cls._load_files(
+            files, resolve, workers, executor, select, errors
+        ):
+            instances[index] = instance
+        return instances
+
+    @classmethod
+    def iter_from_files(
+        cls,
+        files: Iterable[str | Path],
+        resolve: bool = True,
+        workers: int = None,
+        executor: str = "thread",
+        select: str = None,
+        errors: Dict[str, Exception] = None,
+    ) -> Iterator[Tuple[str, object]]:
+        """like `from_files`, but yields `(file, instance)` as soon as a file is loaded
+
+        Failed files are skipped and either stored in `errors` or raised together as a
+        ConfigLoadError after the last instance.
+
+        Returns:
+            Iterator[Tuple[str, object]]: file and config instance in completion order
+        """
+        files = [str(file) for file in files]
+        for _, file, instance in cls._load_files(
+            files, resolve, workers, executor, select, errors
+        ):
+            yield file, instance
+
+    @classmethod
+    def _load_files(
+        cls,
+        files: List[str],
+        resolve: bool,
+        workers: int,
+        executor: str,
+        select: str,
+        errors: Dict[str, Exception],
+    ) -> Iterator[Tuple[int, str, object]]:
+        if executor not in ("thread", "process"):
+            raise ValueError(f"executor must be 'thread' or 'process', got {executor!r}")
+        # pick the file format backends once instead of racing in the workers
+        for suffix in {Path(file).suffix for file in files}:
+            try:
+                fs_utils.get_load_func(suffix)
+            except NotImplementedError:
+                pass  # reported per file
+
+        failures = {}
+        if workers == 1 or len(files) <= 1:
+            for index, file in enumerate(files):
+                try:
+                    content = get_content(file, resolve=resolve, select=select)
+                    instance = cls._load(content)
+                except Exception as error:  # pylint: disable=W0718
+                    failures[file] = error
+                    continue
+                yield index, file, instance
+        else:
+            pool_cls = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+            with pool_cls(max_workers=workers) as pool:
+                futures: Dict[Future, int] = {
+                    pool.submit(get_content, file, resolve, select): index
+                    for index, file in enumerate(files)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        instance = cls._load(future.result())
+                    except Exception as error:  # pylint: disable=W0718
+                        failures[files[index]] = error
+                        continue
+                    yield index, files[index], instance
+
+        if errors is not None:
+            errors.update(failures)
+        elif len(failures) > 0:
+            raise ConfigLoadError(failures, len(files))
 
     @classmethod
     def from_dict_config(cls, config: DictConfig, resolve: bool = True) -> object:
         container = OmegaConf.to_container(config, resolve=resolve)
         container = preprocess_container(container)
-        return cls(**container)
+        return cls._load(container)
 
     @classmethod
     def from_container(cls, config: Dict[str, Any]) -> object:
         config = preprocess_container(config)
-        return cls(**config)
+        return cls._load(config)
+
+    @classmethod
+    def _from_dict(cls, data: Dict[str, Any]) -> object:
+        # generated classes override this with a specialized constructor
+        return cls(**data)
+
+    @classmethod
+    def _reject_unknown_keys(cls, data: Dict[str, Any]):
+        # called by the generated `_from_dict` if `data` has keys which are no field
+        unknown = [key for key in data if key not in cls.__dataclass_fields__]
+        raise TypeError(
+            f"{cls.__name__} got unexpected keys {', '.join(map(repr, unknown))}"
+        )
+
+    @classmethod
+    def _load(cls, data: Dict[str, Any]) -> object:
+        """build an instance from a loaded container and validate it if enabled"""
+        instance = cls._from_dict(data)
+        if cls._validate_on_load:
+            instance._validate()
+        return instance
+
+    def _validate(self, path: str = "") -> None:
+        # classes generated with validators override this with type checks
+        pass
+
+    def update_from_file(
+        self, file: str | Path, resolve: bool = True, select: str = None
+    ) -> List[str]:
+        """load a config file and apply it in place, see `apply_delta`
+
+        Args:
+            file (str | Path): path to the config file
+            resolve (bool, optional): resolve interpolations. Defaults to True.
+            select (str, optional): dotted path of the subtree to load, see `from_file`.
+                Defaults to None.
+
+        Returns:
+            List[str]: dotted paths of the changed fields
+        """
+        return self.apply_delta(get_content(file, resolve=resolve, select=select))
+
+    def apply_delta(self, delta: Dict[str, Any]) -> List[str]:
+        """update this instance in place so every holder of it sees the new values
+
+        `delta` is compared against the instance and only changed leaves are assigned.
+        Nested configs and lists of configs with unchanged length are updated
+        recursively, other lists are replaced as a whole. Keys missing in `delta` keep
+        their value. All changes are collected before the first assignment, so an unknown
+        key leaves the instance untouched. Afterwards the instance is validated if
+        validation is enabled, and the changes are rolled back if it is invalid.
+
+        Args:
+            delta (Dict[str, Any]): complete or partial config container
+
+        Raises:
+            KeyError: if `delta` contains a key which is no field of the config
+            ConfigValidationError: if validation is enabled and a new value has the
+                wrong type
+
+        Returns:
+            List[str]: dotted paths of the changed fields
+        """
+        changes: List[Tuple[object, str, Any, str]] = []
+        _collect_changes(self, delta, "", changes)
+        previous = [getattr(config_obj, key) for config_obj, key, _, _ in changes]
+        for config_obj, key, value, _ in changes:
+            setattr(config_obj, key, value)
+        if len(changes) > 0 and self._validate_on_load:
+            try:
+                self._validate()
+            except TypeError:
+                for (config_obj, key, _, _), value in zip(changes, previous):
+                    setattr(config_obj, key, value)
+                raise
+        return [path for _, _, _, path in changes]
 
     def to_file(self, file: str | Path, resolve: bool = True):
         if isinstance(file, str):
             file = Path(file)
-        ending = file.suffix.lstrip(".")
         Path.mkdir(file.parent, parents=True, exist_ok=True)
-        write_func = getattr(fs_utils, f"write_{ending}")
-        dict_config = OmegaConf.create(self.to_container())
-        content = OmegaConf.to_container(dict_config, resolve=resolve)
+        write_func = fs_utils.get_write_func(file)
+        content = self.to_container()
+        # only go through OmegaConf if there is something to resolve
+        if resolve and contains_interpolation(content):
+            dict_config = OmegaConf.create(content)
+            content = OmegaConf.to_container(dict_config, resolve=True)
         write_func(file, content)
 
     def to_container(self) -> Dict[str, Any]:
         return deconstruct_config(self)
 
     def display(self):
-        print(repr(self))
+        """print the full config as yaml"""
+        print(yaml.dump(self.to_container(), indent=2))
 
     def __repr__(self):
-        return yaml.dump(self.to_container(), indent=2)
+        return repr_config(self, self._repr_max_depth, self._repr_max_width)
+
+
+def _collect_changes(
+    config_obj: StructuredConfig,
+    delta: Dict[str, Any],
+    prefix: str,
+    changes: List[Tuple[object, str, Any, str]],
+):
+    """appends (config, field, new value, dotted path) for every changed leaf"""
+    fields = config_obj.__dataclass_fields__
+    for key, new in delta.items():
+        if key not in fields:
+            raise KeyError(f"{prefix}{key} is no field of {type(config_obj).__name__}")
+        path = prefix + key
+        current = getattr(config_obj, key)
+        if isinstance(current, StructuredConfig) and isinstance(new, dict):
+            _collect_changes(current, new, path + ".", changes)
+        elif _is_config_list(current) and isinstance(new, list):
+            if len(current) == len(new) and all(isinstance(item, dict) for item in new):
+                for index, (element, item) in enumerate(zip(current, new)):
+                    _collect_changes(element, item, f"{path}.{index}.", changes)
+            else:
+                element_cls = type(current[0])
+                new = [
+                    element_cls._from_dict(item) if isinstance(item, dict) else item
+                    for item in new
+                ]
+                changes.append((config_obj, key, new, path))
+        elif isinstance(current, array) and isinstance(new, list):
+            if current.tolist() != new:
+                changes.append((config_obj, key, array(current.typecode, new), path))
+        elif type(current) is not type(new) or current != new:
+            # e.g. a nested config which was None or an empty list of configs
+            built = _build_field(type(config_obj), key, new)
+            changes.append((config_obj, key, new if built is None else built, path))
+
+
+@lru_cache(maxsize=None)
+def _field_types(cls: type) -> Dict[str, Any]:
+    try:
+        return get_type_hints(cls)
+    except NameError:
+        # annotations which cannot be resolved are left out
+        return {
+            name: field.type
+            for name, field in cls.__dataclass_fields__.items()
+            if not isinstance(field.type, str)
+        }
+
+
+def _is_config_class(typ: Any) -> bool:
+    return isinstance(typ, type) and issubclass(typ, StructuredConfig)
+
+
+def _build_field(cls: type, key: str, value: Any) -> Any:
+    """
+    Builds nested configs for a raw dict or list of dicts from the annotation of the
+    field. Returns None if the field holds no nested config.
+    """
+    typ = _field_types(cls).get(key)
+    if isinstance(value, dict) and _is_config_class(typ):
+        return typ._from_dict(value)
+    if (
+        isinstance(value, list)
+        and get_origin(typ) is list
+        and _is_config_class(get_args(typ)[0])
+        and all(isinstance(item, dict) for item in value)
+    ):
+        element_cls = get_args(typ)[0]
+        if hasattr(element_cls, "_from_list"):
+            return element_cls._from_list(value)
+        return [element_cls._from_dict(item) for item in value]
+    return None
+
+
+def _is_config_list(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and isinstance(value[0], StructuredConfig)
+    )
+
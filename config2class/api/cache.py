@@ -0,0 +1,208 @@
+import copy
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import FrozenInstanceError, fields, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, NamedTuple, Set, Tuple
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class _CacheEntry:
+    __slots__ = ("content", "shared")
+
+    def __init__(self, content: Dict[str, Any]):
+        self.content = content
+        # frozen instance per config class
+        self.shared: Dict[type, object] = {}
+
+
+class FileCache:
+    """
+    Bounded LRU cache for loaded config files. Entries are keyed by the absolute path,
+    modification time, size, the `resolve` flag and the selected subtree, so an edited
+    file is loaded again on the next access. The cache stores the loaded container and
+    hands out either fresh instances built from a deep copy or one frozen instance shared
+    by all callers.
+    """
+
+    def __init__(self, maxsize: int = 128):
+        """
+        Initializes a new `FileCache` instance.
+
+        Args:
+            maxsize (int, optional): maximum number of cached files. Defaults to 128.
+        """
+        self._maxsize = maxsize
+        self._entries: OrderedDict[Tuple, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get_instance(
+        self,
+        cls: type,
+        file: str | Path,
+        resolve: bool,
+        load_func: Callable[[Path, bool, str], Dict[str, Any]],
+        shared: bool = False,
+        select: str = None,
+    ) -> object:
+        """
+        Returns an instance of `cls` for the given file and loads the file only if there
+        is no valid entry in the cache.
+
+        Args:
+            cls (type): structured config class
+            file (str | Path): path to the config file
+            resolve (bool): resolve flag passed on to `load_func`
+            load_func (Callable[[Path, bool, str], Dict[str, Any]]): loads the container
+                of a file, called with path, `resolve` and `select`
+            shared (bool, optional): return a frozen instance shared by all callers
+                instead of a fresh one. Defaults to False.
+            select (str, optional): dotted path of the loaded subtree, passed on to
+                `load_func`. Defaults to None.
+
+        Returns:
+            object: instance of `cls`
+        """
+        path = os.path.abspath(file)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size, resolve, select)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+            else:
+                self._misses += 1
+
+        if entry is None:
+            entry = _CacheEntry(load_func(Path(path), resolve, select))
+            self._put(key, entry)
+
+        if not shared:
+            return cls._load(copy.deepcopy(entry.content))
+
+        instance = entry.shared.get(cls)
+        if instance is None:
+            instance = freeze(cls._load(copy.deepcopy(entry.content)))
+            instance = entry.shared.setdefault(cls, instance)
+        return instance
+
+    def _put(self, key: Tuple, entry: _CacheEntry):
+        with self._lock:
+            if self._maxsize <= 0:
+                return
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+
+    def resize(self, maxsize: int):
+        """
+        Changes the maximum number of cached files and evicts the least recently used
+        entries if necessary.
+
+        Args:
+            maxsize (int): new maximum number of cached files. 0 disables caching.
+        """
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def info(self) -> CacheInfo:
+        """
+        Returns:
+            CacheInfo: hit and miss statistics, maximum and current size
+        """
+        with self._lock:
+            return CacheInfo(self._hits, self._misses, self._maxsize, len(self._entries))
+
+    def clear(self):
+        """drop all entries and reset the statistics"""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+# mapping from config class to its frozen subclass and the set of frozen subclasses
+_frozen_classes: Dict[type, type] = {}
+_frozen_types: Set[type] = set()
+
+
+def _frozen_setattr(self, name: str, value: Any):
+    raise FrozenInstanceError(f"cannot assign to field {name!r} of a shared config")
+
+
+def _frozen_delattr(self, name: str):
+    raise FrozenInstanceError(f"cannot delete field {name!r} of a shared config")
+
+
+def _frozen_eq(self, other: object) -> bool:
+    if not isinstance(other, _frozen_base(type(self))):
+        return NotImplemented
+    return all(
+        getattr(self, field.name) == getattr(other, field.name) for field in fields(self)
+    )
+
+
+def _frozen_base(cls: type) -> type:
+    return cls.__mro__[1] if cls in _frozen_types else cls
+
+
+def _frozen_class(cls: type) -> type:
+    frozen_cls = _frozen_classes.get(cls)
+    if frozen_cls is None:
+        namespace = {
+            "__slots__": (),
+            "__setattr__": _frozen_setattr,
+            "__delattr__": _frozen_delattr,
+            "__eq__": _frozen_eq,
+            "__hash__": None,
+            "__qualname__": cls.__qualname__,
+            "__module__": cls.__module__,
+        }
+        frozen_cls = type(cls.__name__, (cls,), namespace)
+        frozen_cls = _frozen_classes.setdefault(cls, frozen_cls)
+        _frozen_types.add(frozen_cls)
+    return frozen_cls
+
+
+def freeze(config_obj: object) -> object:
+    """
+    Makes a structured config and all nested configs read-only in place by switching
+    their class to a frozen subclass. `isinstance` checks against the original class
+    keep working. Configs inside lists are frozen as well. Lists, dicts and arrays
+    stored in fields are not copied and must not be mutated.
+
+    Args:
+        config_obj (object): dataclass instance
+
+    Returns:
+        object: the same, now frozen, instance
+    """
+    for field in fields(config_obj):
+        value = getattr(config_obj, field.name)
+        if is_dataclass(value) and not isinstance(value, type):
+            freeze(value)
+        elif isinstance(value, list):
+            for item in value:
+                if is_dataclass(item) and not isinstance(item, type):
+                    freeze(item)
+    cls = type(config_obj)
+    if cls not in _frozen_types:
+        object.__setattr__(config_obj, "__class__", _frozen_class(cls))
+    return config_obj
+
+
+file_cache = FileCache()
@@ -1,6 +1,8 @@
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 import config2class.utils.filesystem as fs_utils
+from config2class.utils.omega_conf import contains_interpolation
+from config2class.utils.subtree import load_subtree, select_path, split_select
 from omegaconf import OmegaConf
 
 
@@ -22,20 +24,42 @@ def preprocess_container(content: Dict[str, Any]) -> Dict[str, Any]:
         return content
 
 
-def get_content(file_path: str | Path, resolve: bool = False) -> Dict[str, Any]:
+def get_content(
+    file_path: str | Path, resolve: bool = False, select: str = None
+) -> Dict[str, Any]:
     """build content from file.
 
     Args:
         file_path (str): path to config file
         resolve (bool, optional): if you would like to have the config resolved. Defaults to False.
+        select (str, optional): dotted path of a subtree, e.g. "pipeline.dataset", counted
+            from the top level of the file. Only this subtree is parsed and returned,
+            preprocessed like a file which only contains it. Defaults to None.
 
     Returns:
         Dict[str, Any]: config container
     """
     if isinstance(file_path, str):
         file_path = Path(file_path)
-    ending = file_path.suffix.lstrip(". ")
-    content = getattr(fs_utils, f"load_{ending}")(file_path)
-    content = OmegaConf.create(content)
-    content = OmegaConf.to_container(content, resolve=resolve)
+    if select is not None:
+        content = _get_subtree(file_path, resolve, split_select(select))
+        # the subtree is treated like a file which only contains it
+        if not isinstance(content, dict) or len(content) == 0:
+            return content
+        return preprocess_container(content)
+    content = fs_utils.load(file_path)
+    # only go through OmegaConf if there is something to resolve
+    if resolve and contains_interpolation(content):
+        content = OmegaConf.create(content)
+        content = OmegaConf.to_container(content, resolve=True)
     return preprocess_container(content)
+
+
+def _get_subtree(file_path: Path, resolve: bool, keys: List[str]) -> Dict[str, Any]:
+    content = load_subtree(file_path, keys)
+    if not (resolve and contains_interpolation(content)):
+        return content
+    # interpolations may point outside of the subtree, so resolve the whole file
+    content = OmegaConf.create(fs_utils.load(file_path))
+    content = OmegaConf.to_container(content, resolve=True)
+    return select_path(content, keys)
@@ -0,0 +1,84 @@
+import reprlib
+from typing import Any
+
+from config2class.api.base import StructuredConfig
+
+# Helpers for the `_validate` methods which `file2code --validators` emits. The
+# generated checks only call into this module if a value has the wrong type.
+
+
+class ConfigValidationError(TypeError):
+    """a field of a loaded config holds a value of the wrong type"""
+
+
+def set_validation(enabled: bool = True):
+    """
+    Globally switches the validation of loaded configs on or off. Validation runs in
+    `from_file`, `from_files`, `from_container` and `from_dict_config` for classes which
+    were generated with validators. Disable it in production once the configs are known
+    to be valid.
+
+    Args:
+        enabled (bool, optional): validate loaded configs. Defaults to True.
+    """
+    StructuredConfig._validate_on_load = enabled
+
+
+def validation_enabled() -> bool:
+    """
+    Returns:
+        bool: True if loaded configs are validated
+    """
+    return StructuredConfig._validate_on_load
+
+
+def raise_type_error(path: str, expected: str, value: Any):
+    raise ConfigValidationError(
+        f"{path}: expected {expected}, got {type(value).__name__} {reprlib.repr(value)}"
+    )
+
+
+def coerce_int(value: Any, path: str) -> int:
+    """
+    Args:
+        value (Any): value of an int field which is not an int
+        path (str): dotted path of the field
+
+    Raises:
+        ConfigValidationError: if the value is no integral number
+
+    Returns:
+        int: the value as int
+    """
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int(value)
+    raise_type_error(path, "int", value)
+
+
+def coerce_float(value: Any, path: str) -> float:
+    """
+    Coerces ints and numeric strings, e.g. "1e-3" which YAML 1.1 loads as a string.
+
+    Args:
+        value (Any): value of a float field which is not a float
+        path (str): dotted path of the field
+
+    Raises:
+        ConfigValidationError: if the value is no number
+
+    Returns:
+        float: the value as float
+    """
+    if isinstance(value, (int, float, str)) and not isinstance(value, bool):
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    raise_type_error(path, "float", value)
@@ -1,5 +1,8 @@
+import reprlib
+from itertools import islice
+from array import array
 from typing import Any, Dict
-from dataclasses import is_dataclass
+from dataclasses import fields, is_dataclass
 
 
 def deconstruct_config(config_obj: object) -> Dict[str, Any]:
@@ -12,14 +15,100 @@ def deconstruct_config(config_obj: object) -> Dict[str, Any]:
     Returns:
         Dict[str, Any]: A dictionary representing the deconstructed dataclass.
 
-    This function iterates over the attributes of the input dataclass. For each attribute:
+    This function iterates over the fields of the input dataclass, so it also works on
+    instances without a `__dict__` (`@dataclass(slots=True)`). For each field:
     1. **If the attribute is a dataclass:** Recursively calls itself to deconstruct the nested dataclass.
-    2. **Otherwise:** Directly adds the attribute and its value to the output dictionary.
+    2. **If the attribute is a list of dataclasses:** Deconstructs every element.
+    3. **If the attribute is an `array.array`:** Converts it back into a list.
+    4. **Otherwise:** Directly adds the attribute and its value to the output dictionary.
     """
     config = {}
-    for key, value in config_obj.__dict__.items():
+    for field in fields(config_obj):
+        key = field.name
+        value = getattr(config_obj, key)
         if is_dataclass(value):
             config[key] = deconstruct_config(value)
+        elif isinstance(value, list) and len(value) > 0 and is_dataclass(value[0]):
+            # list of generated element classes
+            config[key] = [deconstruct_config(item) for item in value]
+        elif isinstance(value, array):
+            config[key] = value.tolist()
         else:
             config[key] = value
     return config
+
+
+def repr_config(config_obj: object, max_depth: int = 3, max_width: int = 8) -> str:
+    """
+    Builds a bounded representation of a dataclass object. The cost only depends on the
+    limits and not on the size of the config, so it is cheap enough for log lines,
+    debuggers and tracebacks.
+
+    Args:
+        config_obj (object): The dataclass object to represent.
+        max_depth (int, optional): Number of nested dataclass levels to expand. Deeper
+            levels are shown as `Name(...)`. Defaults to 3.
+        max_width (int, optional): Maximum number of fields per dataclass and of items
+            per list or dict. Defaults to 8.
+
+    Returns:
+        str: representation like `Name(key=value, nested=Nested(...), ...)`
+    """
+    name = type(config_obj).__name__
+    if max_depth <= 0:
+        return f"{name}(...)"
+
+    leaf_repr = reprlib.Repr()
+    leaf_repr.maxlevel = 2
+    leaf_repr.maxlist = leaf_repr.maxtuple = leaf_repr.maxdict = max_width
+    leaf_repr.maxset = leaf_repr.maxarray = max_width
+
+    config_fields = fields(config_obj)
+    parts = []
+    for field in config_fields[:max_width]:
+        value = getattr(config_obj, field.name)
+        value = _repr_value(value, max_depth, max_width, leaf_repr)
+        parts.append(f"{field.name}={value}")
+    if len(config_fields) > max_width:
+        parts.append("...")
+    return f"{name}({', '.join(parts)})"
+
+
+def _is_config(value: Any) -> bool:
+    return is_dataclass(value) and not isinstance(value, type)
+
+
+def _repr_value(
+    value: Any, max_depth: int, max_width: int, leaf_repr: reprlib.Repr
+) -> str:
+    """
+    Represents a field value. Nested configs, also inside lists, tuples and dicts, go
+    through `repr_config`, so reprlib never cuts their representation in the middle.
+    """
+    if _is_config(value):
+        return repr_config(value, max_depth - 1, max_width)
+    if isinstance(value, (list, tuple)) and any(
+        _is_config(item) for item in value[:max_width]
+    ):
+        items = [
+            _repr_value(item, max_depth, max_width, leaf_repr)
+            for item in value[:max_width]
+        ]
+        if len(value) > max_width:
+            items.append("...")
+        if isinstance(value, tuple):
+            return f"({', '.join(items)}{',' if len(items) == 1 else ''})"
+        return f"[{', '.join(items)}]"
+    if isinstance(value, dict):
+        head = list(islice(value.items(), max_width))
+        if any(_is_config(item) for _, item in head):
+            items = [
+                leaf_repr.repr(key)
+                + ": "
+                + _repr_value(item, max_depth, max_width, leaf_repr)
+                for key, item in head
+            ]
+            if len(value) > max_width:
+                items.append("...")
+            return f"{{{', '.join(items)}}}"
+    return leaf_repr.repr(value)
@@ -1,64 +1,214 @@
-from typing import Dict, List
+from typing import Any, Dict, Iterator, List, Tuple
 
 
-def unflatten(d: Dict[str, str]) -> List[List[str]]:
-    # from https://stackoverflow.com/questions/6037503/python-unflatten-dict
-    resultDict = dict()
-    for key, value in d.items():
-        parts = key.split(".")
-        d = resultDict
-        for part in parts[:-1]:
-            if part not in d:
-                d[part] = dict()
-            d = d[part]
-        d[parts[-1]] = value
-    return resultDict
-
-
-def flatten_dict(d: dict):
-    if d is None or len(d) == 0:
-        return {}
-    res = {}
-    for key, value in d.items():
-        if isinstance(value, dict):
-            value = {key + "." + k: v for k, v in value.items()}
-            res = {**res, **value}
-            res = flatten_dict(res)
+def iter_flatten(
+    d: Dict[str, Any], sep: str = ".", list_index: bool = False
+) -> Iterator[Tuple[str, Any]]:
+    """lazily flatten a nested dict into (key, value) pairs in a single pass.
+
+    The traversal is iterative, so neither the nesting depth nor the number of leaves
+    is bounded by the recursion limit, and every leaf is visited exactly once. Empty
+    dicts (and empty lists if `list_index` is set) are yielded as leaves so that
+    `unflatten` restores them.
+
+    Args:
+        d (Dict[str, Any]): nested dict
+        sep (str, optional): separator between the keys of two levels. Defaults to ".".
+        list_index (bool, optional): descend into lists and use the element index as
+            key. Defaults to False.
+
+    Yields:
+        Iterator[Tuple[str, Any]]: flat key and leaf value
+    """
+    if d is None:
+        return
+    stack = [("", iter(d.items()))]
+    while stack:
+        prefix, items = stack[-1]
+        for key, value in items:
+            key = prefix + str(key)
+            if isinstance(value, dict) and len(value) > 0:
+                stack.append((key + sep, iter(value.items())))
+                break
+            if list_index and isinstance(value, list) and len(value) > 0:
+                stack.append((key + sep, enumerate(value)))
+                break
+            yield key, value
         else:
-            res[key] = value
-    return res
-
-
-def find_cycles(graph):
-    def visit(node, path, visited):
-        if node in path:
-            # Cycle detected; collect the cycle
-            cycle_start_index = path.index(node)
-            cycles.append(path[cycle_start_index:])
-            return
-        if node in visited:
-            # Node already processed, skip
-            return
-
-        # Mark this node as visited and part of the current path
-        visited.add(node)
-        path.append(node)
-
-        # Recurse to the next node if it exists
-        if node in graph:
-            next_node = graph[node]
-            if next_node:  # There is an outgoing edge
-                visit(next_node, path, visited)
-
-        # Backtrack: remove the node from the current path
-        path.pop()
+            stack.pop()
+
+
+def flatten_dict(
+    d: Dict[str, Any], sep: str = ".", list_index: bool = False
+) -> Dict[str, Any]:
+    """flatten a nested dict in linear time.
+
+    Args:
+        d (Dict[str, Any]): nested dict
+        sep (str, optional): separator between the keys of two levels. Defaults to ".".
+        list_index (bool, optional): descend into lists and use the element index as
+            key. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: flat dict
+    """
+    return dict(iter_flatten(d, sep, list_index))
+
+
+def unflatten(
+    d: Dict[str, Any] | Iterator[Tuple[str, Any]],
+    sep: str = ".",
+    list_index: bool = False,
+) -> Dict[str, Any]:
+    """rebuild a nested dict from a flat dict or from the pairs of `iter_flatten`.
+
+    Args:
+        d (Dict[str, Any] | Iterator[Tuple[str, Any]]): flat dict or (key, value) pairs
+        sep (str, optional): separator between the keys of two levels. Defaults to ".".
+        list_index (bool, optional): turn every level whose keys are exactly the
+            indices 0..n-1 back into a list. Defaults to False.
+
+    Returns:
+        Dict[str, Any]: nested dict
+    """
+    result = {}
+    containers = []
+    items = d.items() if isinstance(d, dict) else d
+    for key, value in items:
+        parts = key.split(sep)
+        node = result
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = {}
+                node[part] = child
+                if list_index:
+                    containers.append((node, part))
+            node = child
+        node[parts[-1]] = value
+
+    # convert innermost levels first so parents see the final children
+    for parent, key in reversed(containers):
+        child = parent[key]
+        if all(k == str(i) for i, k in enumerate(child)):
+            parent[key] = list(child.values())
+    return result
+
 
+def structural_signature(d: Dict[str, Any]) -> Tuple[Tuple[str, Any], ...]:
+    """signature of the structure of a nested dict: all flat keys in order together with
+    the type names of their values. Lists of dicts additionally contain the signatures
+    of their elements, because they are turned into element classes. Two configs with
+    the same signature result in the same generated code.
+
+    Args:
+        d (Dict[str, Any]): nested dict
+
+    Returns:
+        Tuple[Tuple[str, Any], ...]: (flat key, type signature) for every leaf
+    """
+    return tuple((key, _type_signature(value)) for key, value in iter_flatten(d))
+
+
+def _type_signature(value: Any) -> Any:
+    if isinstance(value, list) and any(isinstance(item, dict) for item in value):
+        return (
+            "list",
+            frozenset(
+                (
+                    structural_signature(item)
+                    if isinstance(item, dict)
+                    else type(item).__name__
+                )
+                for item in value
+            ),
+        )
+    return type(value).__name__
+
+
+def _successors(graph: Dict[str, str | List[str]], node: str) -> List[str]:
+    successors = graph.get(node)
+    if not successors:
+        return []
+    if isinstance(successors, str):
+        return [successors]
+    return successors
+
+
+def find_cycles(graph: Dict[str, str | List[str]]) -> List[List[str]]:
+    """find cycles in a directed graph with an iterative depth first search
+
+    Args:
+        graph (Dict[str, str | List[str]]): mapping from node to its successor or a
+            list of successors
+
+    Returns:
+        List[List[str]]: one path per cycle, starting and ending before the node which
+            closes the cycle
+    """
     visited = set()
     cycles = []
 
-    # Check each node in the graph
-    for node in graph:
-        if node not in visited:
-            visit(node, [], visited)
+    for root in graph:
+        if root in visited:
+            continue
+        visited.add(root)
+        # path and position of each node on the path of the current branch
+        path = [root]
+        on_path = {root: 0}
+        stack = [iter(_successors(graph, root))]
+        while stack:
+            for next_node in stack[-1]:
+                if next_node in on_path:
+                    # Cycle detected; collect the cycle
+                    cycles.append(path[on_path[next_node] :])
+                elif next_node not in visited:
+                    visited.add(next_node)
+                    on_path[next_node] = len(path)
+                    path.append(next_node)
+                    stack.append(iter(_successors(graph, next_node)))
+                    break
+            else:
+                # Backtrack: all successors are processed
+                on_path.pop(path.pop())
+                stack.pop()
 
     return cycles
+
+
+def topological_sort(graph: Dict[str, str | List[str]]) -> List[str]:
+    """order the nodes of a directed acyclic graph such that every node comes after all
+    of its successors
+
+    Args:
+        graph (Dict[str, str | List[str]]): mapping from node to its successor or a
+            list of successors
+
+    Raises:
+        ValueError: if the graph contains a cycle
+
+    Returns:
+        List[str]: all nodes of the graph including nodes without outgoing edges
+    """
+    order = []
+    done = set()
+    for root in graph:
+        if root in done:
+            continue
+        path = {root}
+        stack = [(root, iter(_successors(graph, root)))]
+        while stack:
+            node, successors = stack[-1]
+            for next_node in successors:
+                if next_node in path:
+                    raise ValueError(f"graph contains a cycle through {next_node}")
+                if next_node not in done:
+                    path.add(next_node)
+                    stack.append((next_node, iter(_successors(graph, next_node))))
+                    break
+            else:
+                stack.pop()
+                path.discard(node)
+                done.add(node)
+                order.append(node)
+    return order
@@ -1,93 +1,322 @@
-import json
+import logging
 from pathlib import Path
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List, Tuple
 
-import toml
-import yaml
+# Every file format has a list of backends in order of preference. A backend is a
+# factory which imports its library and returns a load and a write function (either may
+# be None). Factories raise ImportError if their library is not installed. The first
+# usable backend is picked on first use, so reading a json file does not pay for
+# importing yaml or toml.
 
+LoadFunc = Callable[[Path, str], Dict[str, Any]]
+WriteFunc = Callable[[Path, Dict[str, Any], str], Any]
+BackendFactory = Callable[[], Tuple[LoadFunc | None, WriteFunc | None]]
 
-def load_yaml(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
-    with open(path, "r", encoding=encoding) as file:
-        content = yaml.safe_load(file)
-    return content
-
-
-def load_yml(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
-    return load_yaml(path, encoding)
-
+_backends: Dict[str, List[Tuple[str, BackendFactory]]] = {}
+_aliases: Dict[str, str] = {}
+# (kind, format) -> (backend name, function)
+_resolved: Dict[Tuple[str, str], Tuple[str, Callable]] = {}
 
-def load_json(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
-    with open(path, "r", encoding=encoding) as file:
-        content = json.load(file)
-    return content
-
-
-def load_jsn(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
-    return load_json(path, encoding)
 
+def register_backend(
+    suffixes: str | List[str],
+    name: str,
+    factory: BackendFactory,
+    prefer: bool = True,
+):
+    """register a load/write backend for a file format
 
-def load_toml(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
-    with open(path, "r", encoding=encoding) as file:
-        content = toml.load(file)
-    return content
+    Args:
+        suffixes (str | List[str]): file endings without dot. The first one names the
+            format, the others are aliases, e.g. ["yaml", "yml"].
+        name (str): name of the backend reported by `get_backend_name`
+        factory (BackendFactory): imports the library and returns (load, write). load
+            is called as `load(path, encoding)` and write as
+            `write(path, content, encoding)`. Either may be None. Raises ImportError if
+            the library is not installed.
+        prefer (bool, optional): try this backend before the already registered ones.
+            Defaults to True.
+    """
+    if isinstance(suffixes, str):
+        suffixes = [suffixes]
+    suffixes = [suffix.lstrip(".").lower() for suffix in suffixes]
+    fmt = _aliases.get(suffixes[0], suffixes[0])
+    for suffix in suffixes:
+        _aliases[suffix] = fmt
+    backends = _backends.setdefault(fmt, [])
+    if prefer:
+        backends.insert(0, (name, factory))
+    else:
+        backends.append((name, factory))
+    _resolved.pop(("load", fmt), None)
+    _resolved.pop(("write", fmt), None)
 
 
-def get_load_func(path: str | Path) -> Callable[[str, str], Dict[str, Any]]:
+def _get_suffix(path: str | Path) -> str:
     if isinstance(path, str):
         suffix = path.split(".")[-1]
     elif isinstance(path, Path):
         suffix = path.suffix
     else:
         raise ValueError(f"Not recognized type of `path`: {type(path)}")
-    try:
-        load_func = globals()["load_" + suffix]
-    except KeyError as error:
+    return suffix.lstrip(".").lower()
+
+
+def _resolve(kind: str, suffix: str) -> Tuple[str, Callable]:
+    fmt = _aliases.get(suffix)
+    if fmt is None:
+        supported = ", ".join("." + suffix for suffix in supported_suffixes())
         raise NotImplementedError(
-            f"Files with ending {suffix} are not supported yet. Please use .yaml or .json or .toml."
-        ) from error
-    return load_func
+            f"Files with ending {suffix} are not supported yet. Please use {supported}."
+        )
+    resolved = _resolved.get((kind, fmt))
+    if resolved is not None:
+        return resolved
+    for name, factory in _backends[fmt]:
+        try:
+            load_func, write_func = factory()
+        except ImportError:
+            continue
+        func = load_func if kind == "load" else write_func
+        if func is not None:
+            logging.debug(f"Use {name} to {kind} .{fmt} files")
+            _resolved[(kind, fmt)] = (name, func)
+            return name, func
+    raise NotImplementedError(f"No installed backend can {kind} .{fmt} files")
+
+
+def get_backend_name(path: str | Path, kind: str = "load") -> str:
+    """
+    Args:
+        path (str | Path): file path or bare ending, e.g. "yaml"
+        kind (str, optional): "load" or "write". Defaults to "load".
+
+    Returns:
+        str: name of the backend which loads or writes files of this type
+    """
+    suffix = path if isinstance(path, str) and "." not in path else _get_suffix(path)
+    return _resolve(kind, suffix)[0]
+
+
+def backend_info() -> Dict[str, Dict[str, str]]:
+    """
+    Returns:
+        Dict[str, Dict[str, str]]: per format the names of the load and write backends
+    """
+    info = {}
+    for fmt in _backends:
+        info[fmt] = {}
+        for kind in ("load", "write"):
+            try:
+                info[fmt][kind] = _resolve(kind, fmt)[0]
+            except NotImplementedError:
+                info[fmt][kind] = None
+    return info
+
+
+def supported_suffixes() -> List[str]:
+    """
+    Returns:
+        List[str]: all registered file endings including aliases
+    """
+    return list(_aliases.keys())
+
+
+def get_load_func(path: str | Path) -> Callable[[str, str], Dict[str, Any]]:
+    return _resolve("load", _get_suffix(path))[1]
+
+
+def get_write_func(path: str | Path) -> Callable[[str, Dict[str, Any]], None]:
+    return _resolve("write", _get_suffix(path))[1]
 
 
 def get_available_load_funcs() -> Dict[str, Callable[[str, str], Dict[str, Any]]]:
-    load_func_names = filter(lambda x: x.split("_")[0] == "load", globals().keys())
-    return {k: globals()[k] for k in load_func_names}
+    # `load` dispatches on the ending of the path
+    return {"load_" + suffix: load for suffix in supported_suffixes()}
+
+
+def load(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+    """load a config file with the preferred backend of its file type"""
+    return get_load_func(path)(path, encoding)
+
+
+def write(path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"):
+    """write a config file with the preferred backend of its file type"""
+    get_write_func(path)(path, content, encoding)
+
+
+# builtin backends
+
+
+def _pyyaml_libyaml():
+    import yaml
+    from yaml import CSafeDumper, CSafeLoader  # missing if built without libyaml
+
+    def load_func(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+        with open(path, "r", encoding=encoding) as file:
+            return yaml.load(file, Loader=CSafeLoader)
+
+    def write_func(path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"):
+        try:
+            text = yaml.dump(content, Dumper=CSafeDumper)
+        except yaml.representer.RepresenterError:
+            # e.g. tuples, which only the default dumper of `_pyyaml` represents
+            text = yaml.dump(content)
+        with open(path, "w", encoding=encoding) as file:
+            file.write(text)
+
+    return load_func, write_func
+
+
+def _pyyaml():
+    import yaml
+
+    def load_func(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+        with open(path, "r", encoding=encoding) as file:
+            return yaml.safe_load(file)
+
+    def write_func(path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"):
+        with open(path, "w", encoding=encoding) as file:
+            yaml.dump(content, file)
+
+    return load_func, write_func
+
+
+def _orjson():
+    import json
+    import math
+
+    import orjson
+
+    def load_func(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+        if encoding.lower().replace("-", "") != "utf8":
+            return _stdlib_json()[0](path, encoding)
+        with open(path, "rb") as file:
+            data = file.read()
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN, Infinity and ints beyond 64 bit are only read by the stdlib
+            return json.loads(data)
+
+    def write_func(path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"):
+        if encoding.lower().replace("-", "") != "utf8":
+            _stdlib_json()[1](path, content, encoding)
+            return
+        try:
+            # same layout as `_stdlib_json`
+            data = orjson.dumps(
+                content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+            )
+        except TypeError:
+            # ints beyond 64 bit
+            data = None
+        # orjson writes NaN and Infinity as null, only then the content is searched
+        if data is None or (b"null" in data and _has_non_finite(content, math.isfinite)):
+            _stdlib_json()[1](path, content, encoding)
+            return
+        with open(path, "wb") as file:
+            file.write(data)
+
+    return load_func, write_func
+
+
+def _has_non_finite(content: Any, isfinite: Callable[[float], bool]) -> bool:
+    if isinstance(content, float):
+        return not isfinite(content)
+    if isinstance(content, dict):
+        content = content.values()
+    elif not isinstance(content, (list, tuple)):
+        return False
+    return any(_has_non_finite(value, isfinite) for value in content)
+
+
+def _stdlib_json():
+    import json
+
+    def load_func(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+        with open(path, "r", encoding=encoding) as file:
+            return json.load(file)
+
+    def write_func(path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"):
+        with open(path, "w", encoding=encoding) as file:
+            json.dump(content, file, indent=2)
+
+    return load_func, write_func
+
+
+def _tomllib():
+    import tomllib
+
+    def load_func(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+        # toml files are utf-8 by specification
+        with open(path, "rb") as file:
+            return tomllib.load(file)
+
+    return load_func, None
+
+
+def _toml():
+    import toml
+
+    def load_func(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+        with open(path, "r", encoding=encoding) as file:
+            return toml.load(file)
+
+    def write_func(path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"):
+        with open(path, "w", encoding=encoding) as file:
+            toml.dump(content, file)
+
+    return load_func, write_func
+
+
+register_backend(["yaml", "yml"], "pyyaml", _pyyaml)
+register_backend(["yaml", "yml"], "pyyaml-libyaml", _pyyaml_libyaml)
+register_backend(["json", "jsn"], "json", _stdlib_json)
+register_backend(["json", "jsn"], "orjson", _orjson)
+register_backend("toml", "toml", _toml)
+register_backend("toml", "tomllib", _tomllib)
+
+
+# functions per file type, kept for `getattr(fs_utils, "load_" + ending)` lookups
+
+
+def load_yaml(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+    return _resolve("load", "yaml")[1](path, encoding)
+
+
+def load_yml(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+    return load_yaml(path, encoding)
+
+
+def load_json(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+    return _resolve("load", "json")[1](path, encoding)
+
+
+def load_jsn(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+    return load_json(path, encoding)
+
+
+def load_toml(path: str | Path, encoding: str = "utf-8") -> Dict[str, Any]:
+    return _resolve("load", "toml")[1](path, encoding)
 
 
 def write_yaml(
     path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"
 ) -> Dict[str, Any]:
-    with open(path, "w", encoding=encoding) as file:
-        yaml.dump(content, file)
+    _resolve("write", "yaml")[1](path, content, encoding)
     return content
 
 
 def write_json(
     path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"
 ) -> Dict[str, Any]:
-    with open(path, "w", encoding=encoding) as file:
-        json.dump(content, file)
+    _resolve("write", "json")[1](path, content, encoding)
     return content
 
 
 def write_toml(
     path: str | Path, content: Dict[str, Any], encoding: str = "utf-8"
 ) -> Dict[str, Any]:
-    with open(path, "w", encoding=encoding) as file:
-        toml.dump(content, file)
+    _resolve("write", "toml")[1](path, content, encoding)
     return content
-
-
-def get_write_func(path: str | Path) -> Callable[[str, Dict[str, Any]], None]:
-    if isinstance(path, str):
-        suffix = path.split(".")[-1]
-    elif isinstance(path, Path):
-        suffix = path.suffix
-    else:
-        raise ValueError(f"Not recognized type of `path`: {type(path)}")
-    try:
-        load_func = globals()["write_" + suffix]
-    except KeyError as error:
-        raise NotImplementedError(
-            f"Files with ending {suffix} are not supported yet. Please use .yaml or .json or .toml."
-        ) from error
-    return load_func
@@ -0,0 +1,18 @@
+from typing import Any, Dict
+
+from config2class.utils.dict_operations import iter_flatten
+
+
+def contains_interpolation(container: Dict[str, Any]) -> bool:
+    """check if any string in a container holds an OmegaConf interpolation `${...}`
+
+    Args:
+        container (Dict[str, Any]): nested dicts and lists
+
+    Returns:
+        bool: True if OmegaConf has something to resolve
+    """
+    for _, value in iter_flatten(container, list_index=True):
+        if isinstance(value, str) and "${" in value:
+            return True
+    return False
@@ -2,6 +2,81 @@ from argparse import ArgumentParser
 from typing import Tuple, Dict, List
 
 
+def add_bench_args(parser: ArgumentParser) -> ArgumentParser:
+    parser.add_argument(
+        "--output",
+        help="json file to write the results to. Defaults to None.",
+        dest="output",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--baseline",
+        help="json results of a previous run to compare against. Defaults to None.",
+        dest="baseline",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--threshold",
+        help="allowed relative slowdown against the baseline before a case counts as regression. Defaults to 0.2.",
+        dest="threshold",
+        type=float,
+        default=0.2,
+        required=False,
+    )
+    parser.add_argument(
+        "--save-baseline",
+        help="store the results as new baseline instead of comparing against it. Requires --baseline. Defaults to False.",
+        dest="save_baseline",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--repeat",
+        help="number of timed runs per case. Defaults to 5.",
+        dest="repeat",
+        type=int,
+        default=5,
+        required=False,
+    )
+    parser.add_argument(
+        "--depth",
+        help="number of nested section levels of the synthetic config. Defaults to 3.",
+        dest="depth",
+        type=int,
+        default=3,
+        required=False,
+    )
+    parser.add_argument(
+        "--width",
+        help="number of values per section of the synthetic config. Defaults to 8.",
+        dest="width",
+        type=int,
+        default=8,
+        required=False,
+    )
+    parser.add_argument(
+        "--list-size",
+        help="number of elements of list values. Defaults to 4.",
+        dest="list_size",
+        type=int,
+        default=4,
+        required=False,
+    )
+    parser.add_argument(
+        "--token-density",
+        help="fraction of string values which reference another value. Defaults to 0.1.",
+        dest="token_density",
+        type=float,
+        default=0.1,
+        required=False,
+    )
+    return parser
+
+
 def add_clear_logs_args(parser: ArgumentParser) -> ArgumentParser:
     return parser
 
@@ -17,10 +92,27 @@ def add_stop_all_args(parser: ArgumentParser) -> ArgumentParser:
 def add_stop_service_args(parser: ArgumentParser) -> ArgumentParser:
     parser.add_argument(
         "--pid",
-        help="process id",
+        help="process id of a service or of the watch daemon. Defaults to None.",
         dest="pid",
         type=int,
-        required=True,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--input",
+        help="stop the daemon watches of this input file. Defaults to None.",
+        dest="input",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--output",
+        help="only stop the daemon watch of input which writes to this file. Defaults to None.",
+        dest="output",
+        type=str,
+        default=None,
+        required=False,
     )
     return parser
 
@@ -55,20 +147,36 @@ def add_start_service_args(parser: ArgumentParser) -> ArgumentParser:
         action="store_true",
         required=False,
     )
+    parser.add_argument(
+        "--daemon",
+        help="add the watch to a single background daemon which observes all files instead of starting one process per file. Defaults to False",
+        dest="daemon",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--debounce",
+        help="seconds without further file events before the output is regenerated. The output is only rewritten if keys or value types changed. Defaults to 0.2",
+        dest="debounce",
+        type=float,
+        default=0.2,
+        required=False,
+    )
     return parser
 
 
 def add_hydra2code_args(parser: ArgumentParser) -> ArgumentParser:
     parser.add_argument(
         "--input",
-        help="The path to the configuration file (YAML or JSON).",
+        help="The path to the primary hydra config file or several of them. All configs of one directory are composed in a single hydra context.",
         dest="input",
         type=str,
+        nargs="+",
         required=True,
     )
     parser.add_argument(
         "--output",
-        help="The path to the output file where the generated",
+        help='The path to the output file where the generated dataclass code will be written. "-" writes the code to stdout. If several configs are composed, a directory (not ending with ".py") which gets one `<config name>.py` (or `<config name>_<i>.py` per override set) each. Defaults to "config.py".',
         dest="output",
         type=str,
         default="config.py",
@@ -95,6 +203,61 @@ def add_hydra2code_args(parser: ArgumentParser) -> ArgumentParser:
         action="store_true",
         required=False,
     )
+    parser.add_argument(
+        "--slots",
+        help="Emit `@dataclass(slots=True)` classes. Instances have no per-instance `__dict__` which saves memory if many of them are alive. Defaults to False",
+        dest="slots",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--array-threshold",
+        help="Store homogeneous int or float lists with at least this many elements as `array.array` instead of a list of boxed numbers. `to_container` and `to_file` turn them back into lists. Defaults to None",
+        dest="array_threshold",
+        type=int,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--profile",
+        help="Print wall time and peak allocated memory (tracemalloc) of every conversion phase. Defaults to False",
+        dest="profile",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Also write the profile as JSON to this file. Implies profile. Defaults to None",
+        dest="profile_output",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--override",
+        help='Set of hydra overrides like "db.port=1". Repeat the flag for several sets, every input is composed once per set. Defaults to None',
+        dest="overrides",
+        type=str,
+        nargs="+",
+        action="append",
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--cache-dir",
+        help="Cache composed configs in this directory. An entry is reused until a file of its defaults list is modified, so hydra is not even imported for unchanged configs. Defaults to None",
+        dest="cache_dir",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--validators",
+        help="Emit a `_validate` method per class which checks the field types in straight-line code, coerces numbers where no information is lost and recurses into nested configs. It runs whenever a config is loaded unless switched off with `config2class.api.validation.set_validation(False)`. Defaults to False",
+        dest="validators",
+        action="store_true",
+        required=False,
+    )
     return parser
 
 
@@ -158,9 +321,54 @@ def add_dir2code_args(parser: ArgumentParser) -> ArgumentParser:
         required=False,
     )
     parser.add_argument(
-        "--flatten",
-        help="--no-documentation-exists--",
-        dest="flatten",
+        "--incremental",
+        help="Only regenerate outputs whose inputs or options changed since the last run and delete outputs of removed inputs. State is kept in a manifest inside the output directory. Defaults to False.",
+        dest="incremental",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--jobs",
+        help="Number of worker processes to convert files in parallel. A failing file is reported and does not abort the other conversions. The command exits with status 1 if any file failed. Defaults to 1.",
+        dest="jobs",
+        type=int,
+        default=1,
+        required=False,
+    )
+    parser.add_argument(
+        "--slots",
+        help="Emit `@dataclass(slots=True)` classes. Instances have no per-instance `__dict__` which saves memory if many of them are alive. Defaults to False",
+        dest="slots",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--array-threshold",
+        help="Store homogeneous int or float lists with at least this many elements as `array.array` instead of a list of boxed numbers. `to_container` and `to_file` turn them back into lists. Defaults to None",
+        dest="array_threshold",
+        type=int,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--profile",
+        help="Print wall time and peak allocated memory (tracemalloc) of every conversion phase summed over all files and list the slowest inputs. Defaults to False",
+        dest="profile",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Also write the per file profiles as JSON to this file. Implies profile. Defaults to None",
+        dest="profile_output",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--validators",
+        help="Emit a `_validate` method per class which checks the field types in straight-line code, coerces numbers where no information is lost and recurses into nested configs. It runs whenever a config is loaded unless switched off with `config2class.api.validation.set_validation(False)`. Defaults to False",
+        dest="validators",
         action="store_true",
         required=False,
     )
@@ -177,7 +385,7 @@ def add_file2code_args(parser: ArgumentParser) -> ArgumentParser:
     )
     parser.add_argument(
         "--output",
-        help="The path to the output file where the generated",
+        help='The path to the output file where the generated dataclass code will be written. "-" writes the code to stdout. Defaults to "config.py".',
         dest="output",
         type=str,
         default="config.py",
@@ -213,6 +421,43 @@ def add_file2code_args(parser: ArgumentParser) -> ArgumentParser:
         action="store_true",
         required=False,
     )
+    parser.add_argument(
+        "--slots",
+        help="Emit `@dataclass(slots=True)` classes. Instances have no per-instance `__dict__` which saves memory if many of them are alive. Defaults to False",
+        dest="slots",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--array-threshold",
+        help="Store homogeneous int or float lists with at least this many elements as `array.array` instead of a list of boxed numbers. `to_container` and `to_file` turn them back into lists. Defaults to None",
+        dest="array_threshold",
+        type=int,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--profile",
+        help="Print wall time and peak allocated memory (tracemalloc) of every conversion phase. Defaults to False",
+        dest="profile",
+        action="store_true",
+        required=False,
+    )
+    parser.add_argument(
+        "--profile-output",
+        help="Also write the profile as JSON to this file. Implies profile. Defaults to None",
+        dest="profile_output",
+        type=str,
+        default=None,
+        required=False,
+    )
+    parser.add_argument(
+        "--validators",
+        help="Emit a `_validate` method per class which checks the field types in straight-line code, coerces numbers where no information is lost and recurses into nested configs. It runs whenever a config is loaded unless switched off with `config2class.api.validation.set_validation(False)`. Defaults to False",
+        dest="validators",
+        action="store_true",
+        required=False,
+    )
     return parser
 
 
@@ -258,6 +503,11 @@ def setup_config2code_parser(
     clear_logs = command_subparser.add_parser("clear-logs", help="delete all log files")
     clear_logs = add_clear_logs_args(clear_logs)
     subparser["clear_logs"] = clear_logs
+    bench = command_subparser.add_parser(
+        "bench", help="run the benchmark suite on a synthetic config"
+    )
+    bench = add_bench_args(bench)
+    subparser["bench"] = bench
     return parser, subparser
 
 
@@ -0,0 +1,142 @@
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, TextIO
+
+
+class Profiler:
+    """
+    Records wall time and peak allocated memory of consecutive phases of a conversion.
+    Memory is traced with `tracemalloc` only while a phase runs. Tracing slows down
+    allocation heavy code, so wall times are higher than without profiling.
+    """
+
+    def __init__(self, label: str = ""):
+        """
+        Initializes a new `Profiler` instance.
+
+        Args:
+            label (str, optional): name of the profiled input. Defaults to "".
+        """
+        self.label = label
+        self.phases: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Measures the body as one phase.
+
+        Args:
+            name (str): name of the phase, e.g. "load" or "write"
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall_ms = (time.perf_counter() - start) * 1000
+            _, peak = tracemalloc.get_traced_memory()
+            if started:
+                tracemalloc.stop()
+            self.phases.append(
+                {
+                    "phase": name,
+                    "wall_ms": round(wall_ms, 3),
+                    "peak_kib": round((peak - current) / 1024, 1),
+                }
+            )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            Dict[str, Any]: label, phases, total wall time and highest peak memory
+        """
+        return {
+            "label": self.label,
+            "phases": self.phases,
+            "wall_ms": round(sum(phase["wall_ms"] for phase in self.phases), 3),
+            "peak_kib": max((phase["peak_kib"] for phase in self.phases), default=0.0),
+        }
+
+
+class NullProfiler:
+    """stand-in for `Profiler` which measures nothing"""
+
+    def phase(self, name: str):  # pylint: disable=W0613
+        return nullcontext()
+
+
+NULL_PROFILER = NullProfiler()
+
+
+def aggregate_profiles(profiles: List[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Args:
+        profiles (List[Dict[str, Any]]): outputs of `Profiler.to_dict`
+
+    Returns:
+        Dict[str, Dict[str, float]]: per phase the summed wall time and the highest
+            peak memory over all profiles
+    """
+    phases = {}
+    for profile in profiles:
+        for phase in profile["phases"]:
+            total = phases.setdefault(phase["phase"], {"wall_ms": 0.0, "peak_kib": 0.0})
+            total["wall_ms"] = round(total["wall_ms"] + phase["wall_ms"], 3)
+            total["peak_kib"] = max(total["peak_kib"], phase["peak_kib"])
+    return phases
+
+
+def format_profiles(profiles: List[Dict[str, Any]], slowest: int = 10) -> str:
+    """
+    Formats one profile as a phase table. Several profiles are summed up per phase
+    followed by a list of the slowest inputs.
+
+    Args:
+        profiles (List[Dict[str, Any]]): outputs of `Profiler.to_dict`
+        slowest (int, optional): number of slowest inputs to list. Defaults to 10.
+
+    Returns:
+        str: table
+    """
+    phases = aggregate_profiles(profiles)
+    lines = [f"{'phase':<16} {'wall [ms]':>10} {'peak [KiB]':>11}"]
+    for name, phase in phases.items():
+        lines.append(f"{name:<16} {phase['wall_ms']:>10.2f} {phase['peak_kib']:>11.1f}")
+    wall_ms = sum(phase["wall_ms"] for phase in phases.values())
+    peak_kib = max((phase["peak_kib"] for phase in phases.values()), default=0.0)
+    lines.append(f"{'total':<16} {wall_ms:>10.2f} {peak_kib:>11.1f}")
+
+    if len(profiles) > 1:
+        ranking = sorted(profiles, key=lambda profile: profile["wall_ms"], reverse=True)
+        lines.append("")
+        lines.append(f"slowest {min(slowest, len(ranking))} of {len(profiles)} inputs:")
+        for profile in ranking[:slowest]:
+            lines.append(
+                f"{profile['wall_ms']:>10.2f} ms {profile['peak_kib']:>10.1f} KiB  "
+                f"{profile['label']}"
+            )
+    return "\n".join(lines)
+
+
+def report_profiles(
+    profiles: List[Dict[str, Any]], json_file: str = None, stream: TextIO = None
+):
+    """
+    Prints the profile table and optionally writes all profiles as JSON.
+
+    Args:
+        profiles (List[Dict[str, Any]]): outputs of `Profiler.to_dict`
+        json_file (str, optional): file to write the profiles to. Defaults to None.
+        stream (TextIO, optional): stream to print the table to. Defaults to stdout.
+    """
+    print(format_profiles(profiles), file=stream)
+    if json_file is not None:
+        content = {"phases": aggregate_profiles(profiles), "inputs": profiles}
+        with open(json_file, "w", encoding="utf-8") as file:
+            json.dump(content, file, indent=2)
@@ -1,16 +1,39 @@
+import re
 from typing import Any, Dict
 
-from config2class.utils.dict_operations import find_cycles, flatten_dict, unflatten
+from config2class.utils.dict_operations import (
+    find_cycles,
+    flatten_dict,
+    topological_sort,
+    unflatten,
+)
 from config2class.utils.token_operations import (
-    build_dependency_graph,
+    TOKEN_PATTERN,
+    collect_dependencies,
     get_token_content,
     is_token,
-    token_in,
 )
 
 
 def replace_tokens(d: Dict[str, Any]) -> Dict[str, Any]:
-    pattern = r"\{\{.*?\}\}"
+    """replace all `{{<path>}}` tokens with the value the path points to.
+
+    A string which consists of exactly one token takes over the value (and type) of
+    the referenced key. Tokens embedded into a longer string are substituted with the
+    string representation of the referenced value. Every key is resolved exactly once
+    in topological order of the dependency graph.
+
+    Args:
+        d (Dict[str, Any]): nested config
+
+    Raises:
+        ValueError: if a token is malformed, points to an unknown key or if the tokens
+            form one or more cycles
+
+    Returns:
+        Dict[str, Any]: config without tokens
+    """
+    pattern = TOKEN_PATTERN
 
     if len(d) == 0:
         return d
@@ -21,41 +44,51 @@ def replace_tokens(d: Dict[str, Any]) -> Dict[str, Any]:
         d = {prefix: d}
     d_flatten = flatten_dict(d)
 
-    # check incoming dict
-    res = {}
-    for key, value in d_flatten.items():
-        if not is_token(value, pattern):
-            res[key] = value
-            continue
-
-        token_value = get_token_content(value)
-        split = token_value.split(".")
+    def normalize(match: re.Match) -> str:
+        token = match.group(0)
+        split = get_token_content(token).split(".")
         split = [ele.strip() for ele in split]
         if nested and len(split[0]) == 0 and len(split) > 1:
             split[0] = prefix
         if "" in split or [" "] == split:
-            raise ValueError(f"token={value} is not valid")
+            raise ValueError(f"token={token} is not valid")
+        return "{{" + ".".join(split) + "}}"
+
+    # normalize tokens in incoming dict
+    for key, value in d_flatten.items():
+        if is_token(value, pattern):
+            d_flatten[key] = re.sub(pattern, normalize, value)
 
-        value = "{{" + ".".join(split) + "}}"
-        res[key] = value
-    d_flatten = res
+    dependencies = collect_dependencies(d_flatten, pattern)
+    for key, references in dependencies.items():
+        for reference in references:
+            if reference not in d_flatten:
+                raise ValueError(
+                    f"token={{{{{reference}}}}} in {key} is not valid. Key does not exist."
+                )
 
-    dependencies = build_dependency_graph(d)
-    cycles = len(find_cycles(dependencies)) > 0
-    if cycles:
+    cycles = find_cycles(dependencies)
+    if len(cycles) > 0:
+        cycles = "\n".join(
+            "\t- " + " -> ".join([*cycle, cycle[0]]) for cycle in cycles
+        )
         raise ValueError(
-            f"The config file contains cycles is therefor not valid to parse. Cycle: {cycles}"
+            f"The config file contains cycles is therefor not valid to parse. Cycles:\n{cycles}"
         )
 
-    while token_in(d_flatten):
-        for key, value in d_flatten.items():
-            if not is_token(value, pattern):
-                continue
-            # strip from token
-            try:
-                d_flatten[key] = d_flatten[value.strip("{}")]
-            except KeyError as error:
-                raise ValueError(f"token={value} is not valid") from error
+    def substitute(match: re.Match) -> str:
+        return str(d_flatten[get_token_content(match.group(0))])
+
+    # dependencies are resolved before the keys which refer to them
+    for key in topological_sort(dependencies):
+        if key not in dependencies:
+            continue
+        value = d_flatten[key]
+        if re.fullmatch(pattern, value) and len(dependencies[key]) == 1:
+            d_flatten[key] = d_flatten[dependencies[key][0]]
+        else:
+            d_flatten[key] = re.sub(pattern, substitute, value)
+
     res = unflatten(d_flatten)
     if nested:
         _, res = res.popitem()
@@ -0,0 +1,287 @@
+import json
+import mmap
+import re
+from pathlib import Path
+from typing import Any, Iterator, List
+
+import config2class.utils.filesystem as fs_utils
+
+# Loads one subtree of a config file without building the rest of the document. JSON
+# files are scanned on the raw bytes and only the selected value is decoded. YAML files
+# are walked on the parser event level and only the events of the selected node are
+# composed. All other formats are loaded completely.
+
+
+def split_select(select: str) -> List[str]:
+    """
+    Args:
+        select (str): dotted path like "pipeline.dataset" or "stages.0.name"
+
+    Raises:
+        ValueError: if the path contains an empty key
+
+    Returns:
+        List[str]: keys of the path
+    """
+    keys = select.split(".")
+    if "" in keys:
+        raise ValueError(f"select={select!r} is not a valid dotted path")
+    return keys
+
+
+def select_path(content: Any, keys: List[str]) -> Any:
+    """
+    Args:
+        content (Any): loaded config
+        keys (List[str]): keys of mappings or indices of lists
+
+    Raises:
+        KeyError: if the path does not exist
+
+    Returns:
+        Any: the value at the path
+    """
+    for depth, key in enumerate(keys):
+        if isinstance(content, dict) and key in content:
+            content = content[key]
+        elif isinstance(content, list) and key.isdigit() and int(key) < len(content):
+            content = content[int(key)]
+        else:
+            raise KeyError(_missing(keys, depth))
+    return content
+
+
+def _missing(keys: List[str], depth: int) -> str:
+    return f"{'.'.join(keys[: depth + 1])} does not exist"
+
+
+def load_subtree(path: str | Path, keys: List[str], encoding: str = "utf-8") -> Any:
+    """
+    Loads the value at `keys` from a config file.
+
+    Args:
+        path (str | Path): config file
+        keys (List[str]): keys of mappings or indices of lists
+        encoding (str, optional): encoding of the file. Defaults to "utf-8".
+
+    Raises:
+        KeyError: if the path does not exist
+
+    Returns:
+        Any: the value at the path
+    """
+    suffix = Path(path).suffix.lstrip(".").lower()
+    if suffix in ("json", "jsn") and encoding.lower().replace("-", "") == "utf8":
+        return _load_json_subtree(path, keys)
+    if suffix in ("yaml", "yml"):
+        return _load_yaml_subtree(path, keys, encoding)
+    return select_path(fs_utils.load(path, encoding), keys)
+
+
+# json
+
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+# next character which opens or closes a container or starts a string
+_STRUCTURE = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb"[,}\]\s]")
+
+
+def _skip_whitespace(buffer, pos: int) -> int:
+    return _WHITESPACE.match(buffer, pos).end()
+
+
+def _skip_string(buffer, pos: int) -> int:
+    """returns the position after the json string which starts at `pos`"""
+    match = _STRING.match(buffer, pos)
+    if match is None:
+        raise ValueError(f"malformed json: expected a string at byte {pos}")
+    return match.end()
+
+
+def _skip_value(buffer, pos: int) -> int:
+    """returns the position after the json value which starts at `pos`"""
+    char = buffer[pos : pos + 1]
+    if char == b'"':
+        return _skip_string(buffer, pos)
+    if char not in (b"{", b"["):
+        match = _SCALAR_END.search(buffer, pos)
+        return len(buffer) if match is None else match.start()
+    depth = 0
+    search = _STRUCTURE.search
+    while True:
+        match = search(buffer, pos)
+        if match is None:
+            raise ValueError("unexpected end of json document")
+        pos = match.start()
+        char = buffer[pos]
+        if char == 0x22:  # '"'
+            pos = _skip_string(buffer, pos)
+            continue
+        pos += 1
+        depth += 1 if char in (0x7B, 0x5B) else -1  # '{' or '['
+        if depth == 0:
+            return pos
+
+
+def _find_json_value(buffer, keys: List[str]) -> int:
+    """returns the start position of the value at `keys`"""
+    pos = _skip_whitespace(buffer, 0)
+    for depth, key in enumerate(keys):
+        char = buffer[pos : pos + 1]
+        if char == b"{":
+            pos = _find_in_object(buffer, pos, key)
+        elif char == b"[" and key.isdigit():
+            pos = _find_in_array(buffer, pos, int(key))
+        else:
+            pos = None
+        if pos is None:
+            raise KeyError(_missing(keys, depth))
+    return pos
+
+
+def _find_in_object(buffer, pos: int, key: str) -> int | None:
+    raw_key = json.dumps(key, ensure_ascii=False).encode()
+    pos = _skip_whitespace(buffer, pos + 1)
+    while buffer[pos : pos + 1] != b"}":
+        end = _skip_string(buffer, pos)
+        raw = buffer[pos:end]
+        # only keys with escapes have to be decoded before comparing
+        found = raw == raw_key or (b"\\" in raw and json.loads(raw) == key)
+        pos = _skip_whitespace(buffer, end)
+        if buffer[pos : pos + 1] != b":":
+            raise ValueError(f"malformed json: expected ':' at byte {pos}")
+        pos = _skip_whitespace(buffer, pos + 1)
+        if found:
+            return pos
+        pos = _skip_whitespace(buffer, _skip_value(buffer, pos))
+        if buffer[pos : pos + 1] == b",":
+            pos = _skip_whitespace(buffer, pos + 1)
+    return None
+
+
+def _find_in_array(buffer, pos: int, index: int) -> int | None:
+    pos = _skip_whitespace(buffer, pos + 1)
+    current = 0
+    while buffer[pos : pos + 1] != b"]":
+        if current == index:
+            return pos
+        pos = _skip_whitespace(buffer, _skip_value(buffer, pos))
+        if buffer[pos : pos + 1] == b",":
+            pos = _skip_whitespace(buffer, pos + 1)
+        current += 1
+    return None
+
+
+def _load_json_subtree(path: str | Path, keys: List[str]) -> Any:
+    with open(path, "rb") as file:
+        if Path(path).stat().st_size == 0:
+            raise ValueError(f"{path} is empty")
+        # the regular expressions run on the mapped file, so it is never copied
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            start = _find_json_value(buffer, keys)
+            end = _skip_value(buffer, start)
+            return json.loads(buffer[start:end])
+
+
+# yaml
+
+
+def _load_yaml_subtree(path: str | Path, keys: List[str], encoding: str) -> Any:
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path, "r", encoding=encoding) as file:
+        events = yaml.parse(file, Loader=loader)
+        # skip stream and document start
+        next(events)
+        next(events)
+        try:
+            node = _find_yaml_node(events, keys)
+        except _AliasOnPath:
+            return select_path(fs_utils.load(path, encoding), keys)
+        subtree = list(_collect_node(events, node))
+
+    anchors = {
+        event.anchor
+        for event in subtree
+        if isinstance(event, (yaml.ScalarEvent, yaml.CollectionStartEvent))
+    }
+    for event in subtree:
+        if isinstance(event, yaml.AliasEvent) and event.anchor not in anchors:
+            # the anchor is defined outside of the subtree
+            return select_path(fs_utils.load(path, encoding), keys)
+    document = [
+        yaml.StreamStartEvent(),
+        yaml.DocumentStartEvent(explicit=False),
+        *subtree,
+        yaml.DocumentEndEvent(explicit=False),
+        yaml.StreamEndEvent(),
+    ]
+    return yaml.load(yaml.emit(document), Loader=loader)
+
+
+class _AliasOnPath(Exception):
+    """the path leads through an alias or merge key, which the events cannot resolve"""
+
+
+def _find_yaml_node(events: Iterator, keys: List[str]):
+    """returns the start event of the node at `keys`"""
+    import yaml
+
+    node = next(events)
+    for depth, key in enumerate(keys):
+        found = None
+        if isinstance(node, yaml.AliasEvent):
+            raise _AliasOnPath()
+        if isinstance(node, yaml.MappingStartEvent):
+            merged = False
+            for event in events:
+                if isinstance(event, yaml.MappingEndEvent):
+                    break
+                value = next(events)
+                if isinstance(event, yaml.ScalarEvent) and event.value == key:
+                    found = value
+                    break
+                # a plain "<<" is a merge key, explicit keys take precedence over it
+                if isinstance(event, yaml.ScalarEvent) and event.value == "<<":
+                    merged = merged or event.implicit[0]
+                _skip_node(events, event)
+                _skip_node(events, value)
+            if found is None and merged:
+                raise _AliasOnPath()
+        elif isinstance(node, yaml.SequenceStartEvent) and key.isdigit():
+            for index, event in enumerate(events):
+                if isinstance(event, yaml.SequenceEndEvent):
+                    break
+                if index == int(key):
+                    found = event
+                    break
+                _skip_node(events, event)
+        if found is None:
+            raise KeyError(_missing(keys, depth))
+        node = found
+    return node
+
+
+def _skip_node(events: Iterator, start):
+    for _ in _collect_node(events, start):
+        pass
+
+
+def _collect_node(events: Iterator, start) -> Iterator:
+    """yields `start` and all events up to the end of its node"""
+    import yaml
+
+    yield start
+    if not isinstance(start, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+        return
+    depth = 1
+    for event in events:
+        yield event
+        if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+            depth += 1
+        elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+            depth -= 1
+            if depth == 0:
+                return
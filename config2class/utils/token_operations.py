@@ -1,7 +1,9 @@
 import re
-from typing import Any, Dict
+from typing import Any, Dict, List
 from config2class.utils.dict_operations import flatten_dict
 
+TOKEN_PATTERN = r"\{\{.*?\}\}"
+
 
 def get_token_content(value: str) -> str:
     return value.strip("{}")
@@ -11,17 +13,44 @@ def is_token(value, pattern):
     return isinstance(value, str) and re.search(pattern, str(value))
 
 
-def build_dependency_graph(d: dict, pattern: str = r"\{\{.*?\}\}"):
-    d_flatten = flatten_dict(d)
+def find_tokens(value: str, pattern: str = TOKEN_PATTERN) -> List[str]:
+    """find the content of all tokens inside a string value
+
+    Args:
+        value (str): string which may contain tokens
+        pattern (str, optional): regex for a token. Defaults to TOKEN_PATTERN.
+
+    Returns:
+        List[str]: stripped content of every token in order of appearance
+    """
+    return [get_token_content(match) for match in re.findall(pattern, value)]
+
+
+def collect_dependencies(
+    d_flatten: Dict[str, Any], pattern: str = TOKEN_PATTERN
+) -> Dict[str, List[str]]:
+    """map every key of a flat dict which holds tokens to all keys it refers to
+
+    Args:
+        d_flatten (Dict[str, Any]): flattened dict
+        pattern (str, optional): regex for a token. Defaults to TOKEN_PATTERN.
+
+    Returns:
+        Dict[str, List[str]]: dependency graph with one edge per token
+    """
     dependencies = {}
     for key, value in d_flatten.items():
         if not is_token(value, pattern):
             continue
-        dependencies[key] = value.strip("{}")
+        dependencies[key] = find_tokens(value, pattern)
     return dependencies
 
 
-def token_in(d: Dict[str, Any], pattern: str = r"\{\{.*?\}\}") -> bool:
+def build_dependency_graph(d: dict, pattern: str = TOKEN_PATTERN):
+    return collect_dependencies(flatten_dict(d), pattern)
+
+
+def token_in(d: Dict[str, Any], pattern: str = TOKEN_PATTERN) -> bool:
     for value in d.values():
         if is_token(value, pattern):
             return True
@@ -3,6 +3,7 @@ import importlib.util
 import os
 import shutil
 import subprocess
+import sys
 import time
 from test import CONFIG_FILES, OUT_PATH
 from test.fixture import cleanup
@@ -11,9 +12,10 @@ from test.utils import _check_created_config
 import pytest
 
 import config2class._service.api_funcs as api_funcs
+from config2class._bench.suite import load_module
 from config2class._core.entrypoint import Config2Code
 from config2class._service.api_funcs import start_service, stop_process
-from config2class.utils import deconstruct_config, filesystem
+from config2class.utils import deconstruct_config, dict_operations, filesystem
 from config2class.utils.replacement import replace_tokens
 
 
@@ -31,6 +33,284 @@ def test_class_construction(cleanup, file_name: str):
     _check_created_config(input_file)
 
 
+@pytest.mark.parametrize(
+    "file_name",
+    CONFIG_FILES,
+)
+def test_slots_construction(cleanup, file_name: str):
+    process = Config2Code()
+    input_file = "example/" + file_name
+    process.file2code(input_file, OUT_PATH, slots=True)
+
+    config = _check_created_config(input_file)
+    assert not hasattr(config, "__dict__")
+    assert "__slots__" in vars(type(config))
+
+
+@pytest.mark.parametrize("init_none", [False, True])
+def test_from_dict_matches_init(cleanup, init_none: bool):
+    process = Config2Code()
+    input_file = "example/example.yaml"
+    process.file2code(input_file, OUT_PATH, init_none=init_none)
+
+    config = _check_created_config(input_file)
+    container = config.to_container()
+    config_cls = type(config)
+    assert config_cls._from_dict(container) == config_cls(**container)
+    assert config_cls.from_container(container) == config
+
+
+def test_write_to_stream(cleanup, capsys):
+    import io
+
+    from config2class._core.constructor import ConfigConstructor
+
+    content = filesystem.load_yaml("example/example.yaml")
+    constructor = ConfigConstructor()
+    constructor.construct(content)
+    constructor.write(OUT_PATH)
+    stream = io.StringIO()
+    constructor.write_to(stream)
+    with open(OUT_PATH, "r", encoding="utf-8") as file:
+        assert stream.getvalue() == file.read()
+
+    constructor.write("-")
+    assert capsys.readouterr().out == stream.getvalue()
+
+
+def test_write_to_closed_pipe():
+    # the reading end is closed before the first write, like `c2c ... | head -0`
+    read_fd, write_fd = os.pipe()
+    os.close(read_fd)
+    command = ["file2code", "--input", "example/example.yaml", "--output", "-"]
+    process = subprocess.run(
+        [sys.executable, "-m", "config2class", *command],
+        stdout=write_fd,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+    os.close(write_fd)
+    assert process.returncode == 1
+    assert b"Traceback" not in process.stderr and b"BrokenPipe" not in process.stderr
+
+
+def test_structural_dedup():
+    import yaml
+
+    from config2class._core.constructor import ConfigConstructor
+
+    content = yaml.safe_load(
+        """
+config:
+  base: &enc {layers: 2, dim: 8}
+  encoder_0: *enc
+  encoder_1: {layers: 3, dim: 16}
+  model: {name: a}
+  decoder:
+    model: {name: b, size: 3}
+    head:
+      model: {size: 1}
+"""
+    )
+    constructor = ConfigConstructor()
+    constructor.construct(content)
+    classes = {config.name: config for config in constructor.configs}
+    assert sorted(classes) == [
+        "Config",
+        "_Base",
+        "_Decoder",
+        "_DecoderModel",
+        "_Head",
+        "_HeadModel",
+        "_Model",
+    ]
+    fields = classes["Config"].fields
+    assert fields["base"] is fields["encoder_0"] is fields["encoder_1"]
+    assert classes["_Decoder"].fields["model"] is classes["_DecoderModel"]
+
+
+def test_list_element_schema(tmp_path):
+    from config2class._core.constructor import ConfigConstructor
+
+    steps = [{"op": "x", "arg": i} for i in range(1000)]
+    steps[500] = {"op": "y", "arg": 1, "rare": True}
+    content = {
+        "config": {
+            "layers": [{"dim": 64, "act": "relu"}, {"dim": 32, "dropout": 0.1}],
+            "steps": steps,
+            "numbers": [1, 2, 3],
+            "blocks": [
+                {"dim": 64, "opts": {"a": 1}, "tag": "x"},
+                {"dim": 0.5, "opts": {}, "tag": 3},
+            ],
+        }
+    }
+    constructor = ConfigConstructor()
+    constructor.construct(content)
+    out_path = tmp_path / "list_config.py"
+    constructor.write(out_path)
+    with open(out_path, "r", encoding="utf-8") as file:
+        code = file.read()
+    assert "layers: list[_Layers]" in code
+    assert "steps: list[_Steps]" in code
+    assert "numbers: list\n" in code
+    # disagreeing values of a key are merged instead of dropped
+    assert "dim: float" in code and "opts: dict" in code and "tag: object" in code
+
+    module = load_module(out_path, "list_config")
+    config = module.Config.from_container(content)
+    assert config.layers[0].dim == 64 and config.layers[0].dropout is None
+    assert config.layers[1].act is None
+    assert len(config.steps) == 1000 and config.steps[999].arg == 999
+    assert config.steps[500].rare is True and config.steps[1].rare is None
+    assert deconstruct_config(config)["steps"][1] == {"op": "x", "arg": 1, "rare": None}
+    # the items passed to __init__ are converted as well
+    assert config.blocks[1].opts == {} and config.blocks[1].tag == 3
+    layers = module.Config(
+        layers=[{"dim": 1, "act": "a"}], steps=[], numbers=[], blocks=[]
+    ).layers
+    assert isinstance(layers[0], module._Layers)
+
+
+def test_array_fields(tmp_path):
+    from array import array
+
+    content = {
+        "config": {
+            "weights": [0.5, 1, 2.5],
+            "bins": [1, 2, 3],
+            "flags": [True, False, True],
+            "short": [1.0, 2.0],
+        }
+    }
+    input_file = tmp_path / "arrays.json"
+    filesystem.write_json(input_file, content)
+    out_path = tmp_path / "array_config.py"
+    api_funcs.file2code(str(input_file), str(out_path), array_threshold=3)
+
+    module = load_module(out_path, "array_config")
+    config = module.Config.from_file(input_file)
+    assert config.weights == array("d", [0.5, 1.0, 2.5])
+    assert config.bins == array("q", [1, 2, 3])
+    assert config.flags == [True, False, True]
+    assert config.short == [1.0, 2.0]
+
+    config.to_file(tmp_path / "out.json")
+    loaded = filesystem.load_json(tmp_path / "out.json")
+    assert loaded == {**content["config"], "weights": [0.5, 1.0, 2.5]}
+
+    # the typecode covers the field in all list elements
+    runs = [{"w": [1, 2, 3], "v": [1, 2, 3]}, {"w": [0.5, 2, 3], "v": [1]}]
+    content = {"config": {"runs": runs}}
+    input_file = tmp_path / "runs.json"
+    filesystem.write_json(input_file, content)
+    out_path = tmp_path / "runs_config.py"
+    api_funcs.file2code(str(input_file), str(out_path), array_threshold=3)
+    module = load_module(out_path, "runs_config")
+    config = module.Config.from_file(input_file)
+    assert config.runs[0].w == array("d", [1.0, 2.0, 3.0])
+    assert config.runs[1].v == [1]
+
+
+def test_validators(tmp_path):
+    from config2class.api.validation import ConfigValidationError, set_validation
+
+    config_file = tmp_path / "train.yaml"
+    config_file.write_text(
+        "run:\n  lr: 0.1\n  epochs: 10\n  name: exp\n"
+        "  layers:\n    - {size: 64}\n    - {size: 32}\n  model:\n    depth: 2\n"
+    )
+    out_file = tmp_path / "train_config.py"
+    api_funcs.file2code(str(config_file), str(out_file), validators=True)
+    module = load_module(out_file, "validated_config")
+
+    run = module.Run.from_file(config_file)
+    assert run.layers[1].size == 32
+
+    # numbers are coerced without losing information
+    content = {
+        "lr": 1,
+        "epochs": 3.0,
+        "name": "a",
+        "layers": [{"size": "8"}],
+        "model": {"depth": 1},
+    }
+    run = module.Run.from_container(content)
+    assert type(run.lr) is float and type(run.epochs) is int
+    assert type(run.layers[0].size) is int
+
+    content["layers"] = [{"size": 1.5}]
+    with pytest.raises(ConfigValidationError, match="layers.0.size"):
+        module.Run.from_container(dict(content))
+    set_validation(False)
+    try:
+        assert module.Run.from_container(dict(content)).layers[0].size == 1.5
+    finally:
+        set_validation(True)
+
+
+def test_filesystem_backends(tmp_path, monkeypatch):
+    # keep the test formats out of the global registry
+    for name in ("_backends", "_aliases", "_resolved"):
+        monkeypatch.setattr(filesystem, name, dict(getattr(filesystem, name)))
+    content = {"config": {"name": "x", "values": [1, 2.5], "nested": {"flag": True}}}
+    for ending in ("yaml", "json", "toml"):
+        path = tmp_path / f"config.{ending}"
+        filesystem.write(path, content)
+        assert filesystem.load(path) == content
+        assert filesystem.get_load_func(str(path)) is filesystem.get_load_func(path)
+    assert filesystem.get_backend_name("yml") == filesystem.get_backend_name("a.yaml")
+
+    # values which only the stdlib json handles survive every json backend
+    path = tmp_path / "special.json"
+    special = {"nan": float("nan"), "inf": float("-inf"), "big": 2**70, "n": None}
+    filesystem.write(path, special)
+    loaded = filesystem.load(path)
+    assert loaded["nan"] != loaded["nan"] and loaded["inf"] == float("-inf")
+    assert loaded["big"] == 2**70 and loaded["n"] is None
+    path.write_text('{"a": NaN, "b": 123456789012345678901234567890}')
+    assert filesystem.load(path)["b"] == 123456789012345678901234567890
+
+    # switching the backend does not change the written files
+    for ending, backends in (
+        ("json", (filesystem._stdlib_json, filesystem._orjson)),
+        ("yaml", (filesystem._pyyaml, filesystem._pyyaml_libyaml)),
+    ):
+        texts = []
+        for backend in backends:
+            try:
+                write_func = backend()[1]
+            except ImportError:
+                continue
+            path = tmp_path / f"layout.{ending}"
+            write_func(path, content)
+            texts.append(path.read_text(encoding="utf-8"))
+        assert len(set(texts)) == 1
+        if ending == "json":
+            assert texts[0].startswith('{\n  "config": {\n    "name": "x",')
+    # the libyaml dumper cannot represent tuples
+    filesystem.write(tmp_path / "tuple.yaml", {"pair": (1, 2)})
+
+    def broken_backend():
+        raise ImportError("not installed")
+
+    def lines_backend():
+        def load(path, encoding="utf-8"):
+            with open(path, "r", encoding=encoding) as file:
+                return {"config": {"lines": file.read().splitlines()}}
+
+        return load, None
+
+    filesystem.register_backend("lines", "lines-reader", lines_backend)
+    filesystem.register_backend("lines", "broken", broken_backend)
+    with open(tmp_path / "a.lines", "w", encoding="utf-8") as file:
+        file.write("a\nb\n")
+    assert filesystem.load(tmp_path / "a.lines") == {"config": {"lines": ["a", "b"]}}
+    assert filesystem.backend_info()["lines"] == {"load": "lines-reader", "write": None}
+    with pytest.raises(NotImplementedError):
+        filesystem.write(tmp_path / "b.lines", {})
+
+
 def test_unknown_file(cleanup):
     try:
         process = Config2Code()
@@ -76,4 +356,576 @@ def _test_service(cleanup, file_name):
     stop_process(pid)
     
     _check_created_config(input_file)
-    assert False
\ No newline at end of file
+    assert False
+
+def test_dir2code_incremental(tmp_path):
+    input_dir = tmp_path / "configs"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    shutil.copyfile("example/example.yaml", input_dir / "a.yaml")
+    shutil.copyfile("example/example_flat.json", input_dir / "b.json")
+
+    process = Config2Code()
+    process.dir2code(str(input_dir), str(output_dir), incremental=True)
+    assert sorted(os.listdir(output_dir)) == sorted(
+        [".config2class_manifest.json", "a_config.py", "b_config.py"]
+    )
+
+    # unchanged inputs are not regenerated
+    mtime = os.stat(output_dir / "a_config.py").st_mtime_ns
+    with open(output_dir / "b_config.py", "w", encoding="utf-8") as file:
+        file.write("# touched\n")
+    process.dir2code(str(input_dir), str(output_dir), incremental=True)
+    assert os.stat(output_dir / "a_config.py").st_mtime_ns == mtime
+    with open(output_dir / "b_config.py", "r", encoding="utf-8") as file:
+        assert file.read() == "# touched\n"
+
+    # changed options trigger a full regeneration and removed inputs are deleted
+    os.remove(input_dir / "b.json")
+    process.dir2code(str(input_dir), str(output_dir), init_none=True, incremental=True)
+    assert not (output_dir / "b_config.py").exists()
+    with open(output_dir / "a_config.py", "r", encoding="utf-8") as file:
+        assert "= None" in file.read()
+
+
+def test_dir2code_jobs(tmp_path):
+    input_dir = tmp_path / "configs"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    file_names = ["example.yaml", "example_flat.json", "example_token.yaml"]
+    for file_name in file_names:
+        shutil.copyfile(f"example/{file_name}", input_dir / file_name)
+    with open(input_dir / "broken.yaml", "w", encoding="utf-8") as file:
+        file.write("a: [1, 2\n")
+
+    failures = api_funcs.dir2code(str(input_dir), str(output_dir), jobs=2)
+    assert list(failures.keys()) == [str(input_dir / "broken.yaml")]
+    for file_name in file_names:
+        assert (output_dir / (file_name.split(".")[0] + ".py")).exists()
+
+    # the CLI reports the failure with a non-zero exit status
+    with pytest.raises(SystemExit) as exit_info:
+        Config2Code().dir2code(str(input_dir), str(output_dir), suffix="")
+    assert exit_info.value.code == 1
+
+
+def test_profile(tmp_path):
+    from config2class.utils.profiling import Profiler, format_profiles
+
+    profiler = Profiler("example.yaml")
+    api_funcs.file2code(
+        "example/example.yaml",
+        str(tmp_path / "config.py"),
+        resolve=True,
+        profiler=profiler,
+    )
+    phases = [phase["phase"] for phase in profiler.phases]
+    assert phases == ["load", "resolve", "filter_ignore", "construct", "write"]
+    assert all(phase["wall_ms"] >= 0 for phase in profiler.phases)
+
+    input_dir = tmp_path / "configs"
+    output_dir = tmp_path / "out"
+    input_dir.mkdir()
+    output_dir.mkdir()
+    shutil.copyfile("example/example.yaml", input_dir / "a.yaml")
+    shutil.copyfile("example/example_flat.json", input_dir / "b.json")
+    profiles = []
+    api_funcs.dir2code(str(input_dir), str(output_dir), profiles=profiles)
+    assert sorted(profile["label"] for profile in profiles) == [
+        str(input_dir / "a.yaml"),
+        str(input_dir / "b.json"),
+    ]
+    assert "slowest 2 of 2 inputs" in format_profiles(profiles)
+
+
+def test_hydra2code_batch_cache(tmp_path):
+    from config2class.utils.profiling import Profiler
+
+    config_dir = tmp_path / "hydra"
+    shutil.copytree("example/hydra", config_dir)
+    config_file = str(config_dir / "training.yaml")
+    cache_dir = str(tmp_path / "cache")
+    out_dir = tmp_path / "out"
+    overrides = [["training.Dyna.gamma=0.5"], ["training.Dyna.gamma=0.25"]]
+
+    api_funcs.hydra2code(
+        config_file, str(out_dir), overrides=overrides, cache_dir=cache_dir
+    )
+    assert sorted(os.listdir(out_dir)) == ["training_0.py", "training_1.py"]
+    assert len(os.listdir(cache_dir)) == 2
+    # the default output file is no directory for several compositions
+    with pytest.raises(ValueError, match="output directory"):
+        api_funcs.hydra2code(config_file, overrides=overrides, cache_dir=cache_dir)
+
+    # a hit does not compose again, a modified file of the defaults list does
+    profiler = Profiler()
+    api_funcs.hydra2code(
+        config_file,
+        str(out_dir),
+        profiler=profiler,
+        overrides=overrides,
+        cache_dir=cache_dir,
+    )
+    assert "compose" not in [phase["phase"] for phase in profiler.phases]
+    train_dyna = config_dir / "training" / "train_dyna.yaml"
+    train_dyna.write_text(train_dyna.read_text() + "  new_field: 1\n")
+    mtime = train_dyna.stat().st_mtime_ns + 10**9
+    os.utime(train_dyna, ns=(mtime, mtime))
+    out_file = out_dir / "training_0.py"
+    api_funcs.hydra2code(
+        config_file, str(out_file), overrides=overrides[0], cache_dir=cache_dir
+    )
+    assert "new_field: int" in out_file.read_text()
+
+
+def test_replace_tokens():
+    config = {
+        "a": {"x": 1, "y": "{{.a.x}}", "z": "{{.a.y}}-{{ .a.x }}"},
+        "b": {"w": "{{.a.z}}"},
+    }
+    assert replace_tokens(config) == {
+        "a": {"x": 1, "y": 1, "z": "1-1"},
+        "b": {"w": "1-1"},
+    }
+
+    with pytest.raises(ValueError, match=r"a\.x -> a\.y -> a\.x(.|\n)*a\.z -> a\.z"):
+        replace_tokens({"a": {"x": "{{a.y}}", "y": "{{a.x}}", "z": "{{a.z}}"}})
+    with pytest.raises(ValueError):
+        replace_tokens({"a": {"x": "{{a.missing}}"}})
+
+
+def test_flatten_unflatten():
+    nested = {"a": {"b": 1, "c": {"d": [1, {"x": 2}], "e": {}}}, "f": []}
+    flat = dict_operations.flatten_dict(nested)
+    assert flat == {"a.b": 1, "a.c.d": [1, {"x": 2}], "a.c.e": {}, "f": []}
+    assert dict_operations.unflatten(flat) == nested
+
+    flat = dict_operations.flatten_dict(nested, sep="/", list_index=True)
+    assert flat == {"a/b": 1, "a/c/d/0": 1, "a/c/d/1/x": 2, "a/c/e": {}, "f": []}
+    assert dict_operations.unflatten(flat, sep="/", list_index=True) == nested
+    assert dict_operations.unflatten(dict_operations.iter_flatten(nested)) == nested
+
+
+def test_from_file_cache(tmp_path):
+    from dataclasses import FrozenInstanceError
+    from config2class.api.cache import file_cache
+    from usage_examples.config import App_config
+
+    config_file = tmp_path / "example.yaml"
+    shutil.copyfile("example/example.yaml", config_file)
+    file_cache.clear()
+
+    first = App_config.from_file(config_file, cache=True)
+    second = App_config.from_file(config_file, cache=True)
+    assert first == second and first is not second
+    assert file_cache.info().hits == 1 and file_cache.info().misses == 1
+
+    shared = App_config.from_file(config_file, cache=True, shared=True)
+    assert shared is App_config.from_file(config_file, cache=True, shared=True)
+    assert shared == first and isinstance(shared, App_config)
+    with pytest.raises(FrozenInstanceError):
+        shared.database.port = 1
+
+    # a modified file is loaded again
+    with open(config_file, "r", encoding="utf-8") as file:
+        content = file.read()
+    with open(config_file, "w", encoding="utf-8") as file:
+        file.write(content.replace("localhost", "remote-host"))
+    assert App_config.from_file(config_file, cache=True).database.host == "remote-host"
+    assert file_cache.info().misses == 2
+
+    file_cache.resize(0)
+    assert file_cache.info().currsize == 0
+    file_cache.resize(128)
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_from_files(tmp_path, executor: str):
+    from config2class.api.base import ConfigLoadError
+    from usage_examples.config import App_config
+
+    files = []
+    for i in range(4):
+        files.append(tmp_path / f"config_{i}.yaml")
+        shutil.copyfile("example/example.yaml", files[-1])
+    broken = tmp_path / "broken.json"
+    broken.write_text("{")
+    files.insert(2, broken)
+
+    errors = {}
+    configs = App_config.from_files(files, workers=2, executor=executor, errors=errors)
+    assert configs[2] is None and list(errors) == [str(broken)]
+    expected = App_config.from_file(files[0])
+    assert all(config == expected for i, config in enumerate(configs) if i != 2)
+
+    with pytest.raises(ConfigLoadError, match="broken") as error:
+        App_config.from_files(files, workers=1)
+    assert list(error.value.errors) == [str(broken)]
+
+    loaded = dict(App_config.iter_from_files(files[:2], workers=2))
+    assert loaded == {str(files[0]): expected, str(files[1]): expected}
+
+
+@pytest.mark.parametrize("ending", ["yaml", "json", "toml"])
+def test_from_file_select(ending: str):
+    from config2class.api.construct import get_content
+    from usage_examples.config import App_config, _Caching, _Database
+
+    file = f"example/example.{ending}"
+    database = _Database.from_file(file, select="app_config.database")
+    assert database == App_config.from_file(file).database
+    caching = _Caching.from_file(file, select="app_config.features.caching")
+    assert caching.cache_size in (256, 5432)
+    assert get_content(file, select="app_config.version") == "1.0.0"
+    with pytest.raises(KeyError):
+        get_content(file, select="app_config.missing")
+
+
+def test_select_subtree_parsers(tmp_path):
+    from config2class.utils.subtree import load_subtree, select_path
+
+    content = {
+        "a": {"x": [1, 2, {"q": 's"}]{'}], "b": {"c": {"d": 1.5, "e": None, "f": True}}},
+        "z": [{"k": 1}, {"k": 2}],
+    }
+    filesystem.write_json(tmp_path / "c.json", content)
+    filesystem.write_yaml(tmp_path / "c.yaml", content)
+    for file in (tmp_path / "c.json", tmp_path / "c.yaml"):
+        for select in ("a", "a.b", "a.b.c.d", "a.x.2.q", "z.1"):
+            keys = select.split(".")
+            assert load_subtree(file, keys) == select_path(content, keys)
+
+    # aliases to anchors outside of the subtree and interpolations need the full file
+    file = tmp_path / "anchor.yaml"
+    file.write_text("base: &b {lr: 1}\nmodel:\n  opt: *b\n  name: ${other}\nother: x\n")
+    assert load_subtree(file, ["model"]) == {"opt": {"lr": 1}, "name": "${other}"}
+    from config2class.api.construct import get_content
+
+    assert get_content(file, resolve=True, select="model")["name"] == "x"
+
+    # a selected subtree is preprocessed like a file which only contains it
+    from config2class.api.construct import get_content
+
+    filesystem.write_json(tmp_path / "outer.json", {"outer": {"inner": {"x": 1}}})
+    filesystem.write_json(tmp_path / "inner.json", {"inner": {"x": 1}})
+    expected = get_content(tmp_path / "inner.json")
+    assert get_content(tmp_path / "outer.json", select="outer") == expected == {"x": 1}
+
+    # malformed json raises a parse error
+    for text in ('{"a": 1, b: 2}', '{"a" 1, "b": 2}'):
+        (tmp_path / "bad.json").write_text(text)
+        with pytest.raises(ValueError, match="malformed json"):
+            load_subtree(tmp_path / "bad.json", ["b"])
+
+    # merge keys and aliases on the path
+    file = tmp_path / "merge.yaml"
+    file.write_text(
+        "base: &b {opt: {lr: 1}, name: a}\n"
+        "model:\n  <<: *b\n  name: b\n"
+        "alias: *b\n"
+    )
+    full = filesystem.load_yaml(file)
+    for select in ("model.opt", "model.opt.lr", "model.name", "alias.opt"):
+        keys = select.split(".")
+        assert load_subtree(file, keys) == select_path(full, keys)
+
+
+def test_unknown_keys(tmp_path):
+    from usage_examples.config import App_config, _Database
+
+    content = {"host": "localhost", "port": 1, "credentials": {"username": "a"}}
+    content["credentials"]["password"] = "b"
+    content["credentials"]["token"] = "c"
+    with pytest.raises(TypeError, match="'token'"):
+        _Database.from_container(content)
+
+    content = filesystem.load_yaml("example/example.yaml")["app_config"]
+    content["features"]["unknown"] = 1
+    with pytest.raises(TypeError, match="_Features got unexpected keys 'unknown'"):
+        App_config.from_container(content)
+
+    # list elements are built by `_from_list`
+    config_file = tmp_path / "train.yaml"
+    config_file.write_text("train:\n  layers:\n    - dim: 1\n")
+    out_file = tmp_path / "train_config.py"
+    api_funcs.file2code(str(config_file), str(out_file))
+    module = load_module(out_file, "strict_config")
+    with pytest.raises(TypeError, match="'act'"):
+        module.Train.from_container({"layers": [{"dim": 1}, {"dim": 2, "act": "relu"}]})
+
+
+def test_apply_delta(tmp_path):
+    from usage_examples.config import App_config
+
+    config = App_config.from_file("example/example.yaml")
+    database = config.database
+    assert config.apply_delta(config.to_container()) == []
+
+    changed = config.apply_delta(
+        {"version": "2.0.0", "database": {"port": 1, "credentials": {"username": "x"}}}
+    )
+    assert changed == ["version", "database.port", "database.credentials.username"]
+    assert config.database is database and database.port == 1
+    assert config.database.credentials.password == "secret"
+
+    with pytest.raises(KeyError):
+        config.apply_delta({"name": "other", "database": {"missing": 1}})
+    assert config.name == "MyApp"
+
+    config_file = tmp_path / "example.yaml"
+    text = open("example/example.yaml", encoding="utf-8").read()
+    config_file.write_text(text.replace("localhost", "remote-host"))
+    changed = config.update_from_file(config_file)
+    assert "database.host" in changed and "database.port" in changed
+    assert database.host == "remote-host" and database.port == 5432
+
+
+def test_apply_delta_builds_nested_configs(tmp_path):
+    config_file = tmp_path / "train.yaml"
+    config_file.write_text("train:\n  opt:\n    lr: 1\n  layers:\n    - dim: 1\n")
+    out_file = tmp_path / "train_config.py"
+    api_funcs.file2code(str(config_file), str(out_file), init_none=True)
+    module = load_module(out_file, "delta_config")
+
+    config = module.Train.from_container({"opt": None, "layers": []})
+    changed = config.apply_delta({"opt": {"lr": 3}, "layers": [{"dim": 2}]})
+    assert changed == ["opt", "layers"]
+    assert isinstance(config.opt, module._Opt) and config.opt.lr == 3
+    assert isinstance(config.layers[0], module._Layers) and config.layers[0].dim == 2
+
+
+@pytest.mark.parametrize("ending", ["yaml", "json", "toml"])
+@pytest.mark.parametrize("resolve", [False, True])
+def test_to_file(tmp_path, ending: str, resolve: bool):
+    from usage_examples.config import App_config
+
+    config = App_config.from_file("example/example.yaml", resolve=False)
+    config.features.caching.cache_size = "${database.port}"
+    out_file = tmp_path / f"out.{ending}"
+    config.to_file(out_file, resolve=resolve)
+
+    loaded = App_config.from_file(out_file, resolve=False)
+    cache_size = loaded.features.caching.cache_size
+    if resolve:
+        assert cache_size == 5432
+    else:
+        assert cache_size == "${database.port}"
+        assert loaded == config
+
+
+def test_bounded_repr(tmp_path):
+    from config2class.utils.deconstruction import repr_config
+    from usage_examples.config import App_config
+
+    config = App_config.from_file("example/example.yaml")
+    config.name = list(range(100_000))
+    representation = repr(config)
+    assert len(representation) < 400
+    assert representation.startswith("App_config(name=[0, 1, 2,")
+    assert "credentials=_Credentials(username='admin'" in representation
+    assert "database=_Database(...)" in repr_config(config, max_depth=1)
+
+    # configs inside lists are represented as configs and not cut by reprlib
+    config_file = tmp_path / "train.yaml"
+    layers = "".join(f"    - {{dim: {i}, act: relu, drop: 0.1}}\n" for i in range(10))
+    config_file.write_text("train:\n  layers:\n" + layers)
+    out_file = tmp_path / "train_config.py"
+    api_funcs.file2code(str(config_file), str(out_file))
+    train = load_module(out_file, "repr_config").Train.from_file(config_file)
+    representation = repr(train)
+    assert representation.startswith(
+        "Train(layers=[_Layers(dim=0, act='relu', drop=0.1), _Layers(dim=1,"
+    )
+    assert representation.endswith("_Layers(dim=7, act='relu', drop=0.1), ...])")
+    layers = "_Layers(...), " * 8
+    assert repr_config(train, max_depth=1) == f"Train(layers=[{layers}...])"
+
+
+def test_start_service_passes_options(tmp_path, monkeypatch):
+    from config2class._service.backend import parse_args
+
+    calls = []
+
+    class FakeProcess:
+        pid = 123
+
+        def __init__(self, argv, **kwargs):
+            calls.append([str(arg) for arg in argv])
+
+    monkeypatch.setattr(subprocess, "Popen", FakeProcess)
+    monkeypatch.setattr(api_funcs, "check_for_process", lambda *args: None)
+    monkeypatch.setattr(api_funcs, "add_pid", lambda *args: True)
+    input_file = tmp_path / "example.yaml"
+    shutil.copyfile("example/example.yaml", input_file)
+    output_file = str(tmp_path / "config.py")
+
+    start_service(str(input_file), output_file, init_none=True, debounce=2.0)
+    assert parse_args(calls[0][2:]) == (str(input_file), output_file, True, 2.0)
+    assert parse_args([str(input_file), output_file])[2:] == (False, 0.2)
+    with pytest.raises(ValueError):
+        parse_args([str(input_file)])
+
+
+def test_config_handler_debounce(tmp_path):
+    from watchdog.events import FileModifiedEvent
+    from config2class._service.backend import ConfigHandler
+
+    input_file = str(tmp_path / "config.json")
+    output_file = str(tmp_path / "config.py")
+    shutil.copyfile("example/example_flat.json", input_file)
+    handler = ConfigHandler(input_file, output_file, debounce=0.05)
+    writes = []
+    write = handler.config_constructor.write
+    handler.config_constructor.write = lambda *args: writes.append(write(*args))
+
+    # a burst of events results in one regeneration
+    for _ in range(5):
+        handler.on_modified(FileModifiedEvent(input_file))
+    time.sleep(0.3)
+    assert len(writes) == 1 and os.path.exists(output_file)
+
+    # only values changed: the generated code stays the same
+    content = filesystem.load_json(input_file)
+    content["name"] = content["name"] + "_v2"
+    filesystem.write_json(input_file, content)
+    handler.on_modified(FileModifiedEvent(input_file))
+    time.sleep(0.3)
+    assert len(writes) == 1
+
+    content["new_key"] = 1
+    filesystem.write_json(input_file, content)
+    handler.on_modified(FileModifiedEvent(input_file))
+    time.sleep(0.3)
+    assert len(writes) == 2
+
+
+def test_pid_registry_concurrent(tmp_path, monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+    import config2class._service.pid_coordination as pid_coordination
+
+    monkeypatch.setattr(pid_coordination, "PID_FILE", str(tmp_path / "pid.db"))
+    monkeypatch.setattr(pid_coordination, "is_alive", lambda pid: pid < 1000)
+
+    def add(i: int) -> bool:
+        return pid_coordination.add_pid(i, f"in_{i % 150}.yaml", f"out_{i % 150}.py")
+
+    with ThreadPoolExecutor(16) as executor:
+        added = list(executor.map(add, range(300)))
+    # every pair is registered exactly once
+    assert sum(added) == 150
+    services = pid_coordination.read_pid_file()
+    assert sorted(services.values()) == sorted(
+        (f"in_{i}.yaml", f"out_{i}.py") for i in range(150)
+    )
+    pid = pid_coordination.find_pid("in_3.yaml", "out_3.py")
+    assert services[pid] == ("in_3.yaml", "out_3.py")
+
+    # dead processes are pruned and free their pair
+    assert pid_coordination.add_pid(5000, "dead.yaml", "dead.py")
+    assert pid_coordination.add_pid(6000, "dead.yaml", "dead.py")
+    assert 5000 not in pid_coordination.read_pid_file()
+    pid_coordination.remove_pid(pid)
+    assert pid_coordination.find_pid("in_3.yaml", "out_3.py") is None
+
+
+def test_watch_registry(tmp_path):
+    from watchdog.observers import Observer
+    from config2class._service.daemon import WatchRegistry
+
+    for name in ("a.yaml", "b.yaml"):
+        shutil.copyfile("example/example.yaml", tmp_path / name)
+    file_a, file_b = str(tmp_path / "a.yaml"), str(tmp_path / "b.yaml")
+    observer = Observer()
+    observer.start()
+    registry = WatchRegistry(observer)
+    try:
+        def add(input_file: str, output_file: str, **options) -> dict:
+            request = {"command": "add", "input": input_file, "output": output_file}
+            return registry.handle({**request, **options})
+
+        assert add(file_a, "a.py", debounce=1.0)["ok"]
+        assert registry.watches[(file_a, "a.py")][0].debounce == 1.0
+        response = add(file_a, "a.py")
+        assert not response["ok"] and "already watched" in response["error"]
+        assert not add(str(tmp_path / "missing.yaml"), "m.py")["ok"]
+        assert add(file_a, "a_2.py")["ok"] and add(file_a, "a_3.py")["ok"]
+        assert add(file_b, "b.py")["ok"]
+        watches = registry.handle({"command": "list"})["watches"]
+        assert len(watches) == 4 and (file_b, "b.py") in watches
+        # all files of one directory share one watch
+        assert len(observer.emitters) == 1
+
+        request = {"command": "remove", "input": file_a, "output": "a.py"}
+        assert registry.handle(request)["removed"] == [(file_a, "a.py")]
+        response = registry.handle({"command": "remove", "input": file_a})
+        assert sorted(response["removed"]) == [(file_a, "a_2.py"), (file_a, "a_3.py")]
+        # the directory stays watched for b.yaml
+        assert len(observer.emitters) == 1
+        registry.handle({"command": "remove", "input": file_b})
+        assert len(observer.emitters) == 0 and len(registry.watches) == 0
+
+        assert not registry.handle({"command": "unknown"})["ok"]
+        assert not registry.handle({"command": "remove"})["ok"]
+    finally:
+        observer.stop()
+        observer.join()
+
+
+def test_daemon_round_trip(tmp_path, monkeypatch):
+    import threading
+    import config2class._service.control as control
+    import config2class._service.daemon as daemon
+
+    socket_path = str(tmp_path / "daemon.sock")
+    monkeypatch.setattr(daemon, "DAEMON_SOCKET", socket_path)
+    monkeypatch.setattr(daemon, "DAEMON_LOCK", str(tmp_path / "daemon.lock"))
+    monkeypatch.setattr(control, "DAEMON_SOCKET", socket_path)
+    with pytest.raises(control.DaemonNotRunning):
+        control.send_request({"command": "ping"})
+
+    thread = threading.Thread(target=daemon.serve, daemon=True)
+    thread.start()
+    try:
+        deadline = time.monotonic() + 5
+        while control.daemon_pid() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert control.daemon_pid() == os.getpid()
+
+        input_file = str(tmp_path / "example.yaml")
+        shutil.copyfile("example/example.yaml", input_file)
+        request = {"command": "add", "input": input_file, "output": "config.py"}
+        assert control.send_request(request)["ok"]
+        watches = control.send_request({"command": "list"})["watches"]
+        assert watches == [[input_file, "config.py"]]
+        response = control.send_request({"command": "remove", "input": input_file})
+        assert response["removed"] == [[input_file, "config.py"]]
+    finally:
+        assert control.send_request({"command": "shutdown"})["ok"]
+        thread.join(timeout=5)
+    assert not thread.is_alive() and not os.path.exists(socket_path)
+
+
+def test_bench_suite():
+    from config2class._bench.suite import compare_results, run_bench, run_suite
+
+    with pytest.raises(ValueError, match="baseline file"):
+        run_bench(save_baseline=True)
+
+    params = {"depth": 2, "width": 5, "list_size": 2, "token_density": 0.5}
+    results = run_suite(params, repeat=1)
+    assert results["num_leaves"] == 5 + 2 * 5
+    assert "replace_tokens" in results["results"]
+    assert "StructuredConfig.from_file" in results["results"]
+
+    baseline = {
+        "results": {
+            name: {**result, "min_ms": result["min_ms"] / 2}
+            for name, result in results["results"].items()
+        }
+    }
+    comparison = compare_results(results, baseline, threshold=0.5)
+    assert len(comparison) == len(results["results"])
+    assert all(entry["regression"] for entry in comparison)
+    assert not any(entry["regression"] for entry in compare_results(results, results))
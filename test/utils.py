@@ -1,14 +1,12 @@
     
-import importlib
+from config2class._bench.suite import load_module
 from config2class.utils import filesystem
 from config2class.utils.deconstruction import deconstruct_config
 from config2class.utils.replacement import replace_tokens
 from test import OUT_PATH
 
 def _check_created_config(input_file: str):
-    spec = importlib.util.spec_from_file_location("tmp", OUT_PATH)
-    generated_module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(generated_module)
+    generated_module = load_module(OUT_PATH, "tmp")
     
     with open(OUT_PATH, "r", encoding="utf-8") as f:
         content = f.readlines()
@@ -32,3 +30,4 @@ def _check_created_config(input_file: str):
     print(config.to_container())
     print(config_file)
     assert config.to_container() == config_file, f" {config.to_container()=}\n{config_file=}"
+    return config
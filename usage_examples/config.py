@@ -3,44 +3,96 @@ from dataclasses import dataclass
 from config2class.api.base import StructuredConfig
 
 
-@dataclass
+@dataclass(repr=False)
 class _Credentials(StructuredConfig):
     username: str
     password: str
 
+    @classmethod
+    def _from_dict(cls, data: dict) -> "_Credentials":
+        if not data.keys() <= cls.__dataclass_fields__.keys():
+            cls._reject_unknown_keys(data)
+        instance = object.__new__(cls)
+        instance.username = data["username"]
+        instance.password = data["password"]
+        return instance
 
-@dataclass
+
+@dataclass(repr=False)
 class _Database(StructuredConfig):
     host: str
     port: int
     credentials: _Credentials
 
+    @classmethod
+    def _from_dict(cls, data: dict) -> "_Database":
+        if not data.keys() <= cls.__dataclass_fields__.keys():
+            cls._reject_unknown_keys(data)
+        instance = object.__new__(cls)
+        instance.host = data["host"]
+        instance.port = data["port"]
+        instance.credentials = _Credentials._from_dict(data["credentials"])
+        return instance
+
     def __post_init__(self):
-        self.credentials = _Credentials(**self.credentials)  # pylint: disable=E1134
+        if isinstance(self.credentials, dict):
+            self.credentials = _Credentials._from_dict(self.credentials)
 
 
-@dataclass
+@dataclass(repr=False)
 class _Caching(StructuredConfig):
     enabled: bool
     cache_size: int
 
+    @classmethod
+    def _from_dict(cls, data: dict) -> "_Caching":
+        if not data.keys() <= cls.__dataclass_fields__.keys():
+            cls._reject_unknown_keys(data)
+        instance = object.__new__(cls)
+        instance.enabled = data["enabled"]
+        instance.cache_size = data["cache_size"]
+        return instance
+
 
-@dataclass
+@dataclass(repr=False)
 class _Features(StructuredConfig):
     authentication: bool
     caching: _Caching
 
+    @classmethod
+    def _from_dict(cls, data: dict) -> "_Features":
+        if not data.keys() <= cls.__dataclass_fields__.keys():
+            cls._reject_unknown_keys(data)
+        instance = object.__new__(cls)
+        instance.authentication = data["authentication"]
+        instance.caching = _Caching._from_dict(data["caching"])
+        return instance
+
     def __post_init__(self):
-        self.caching = _Caching(**self.caching)  # pylint: disable=E1134
+        if isinstance(self.caching, dict):
+            self.caching = _Caching._from_dict(self.caching)
 
 
-@dataclass
+@dataclass(repr=False)
 class App_config(StructuredConfig):
     name: str
     version: str
     database: _Database
     features: _Features
 
+    @classmethod
+    def _from_dict(cls, data: dict) -> "App_config":
+        if not data.keys() <= cls.__dataclass_fields__.keys():
+            cls._reject_unknown_keys(data)
+        instance = object.__new__(cls)
+        instance.name = data["name"]
+        instance.version = data["version"]
+        instance.database = _Database._from_dict(data["database"])
+        instance.features = _Features._from_dict(data["features"])
+        return instance
+
     def __post_init__(self):
-        self.database = _Database(**self.database)  # pylint: disable=E1134
-        self.features = _Features(**self.features)  # pylint: disable=E1134
+        if isinstance(self.database, dict):
+            self.database = _Database._from_dict(self.database)
+        if isinstance(self.features, dict):
+            self.features = _Features._from_dict(self.features)